@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Session start benchmark for the wrapper's warm pool (--pool / --connect).
+
+Uses benchmarks/stub_mcp_child.py with --startup-delay standing in for Blender's cold
+start, and measures the time from launching the client-side command to the first
+JSON-RPC reply, for sequential sessions:
+
+    cold     blender_mcp_wrapper.py launching a fresh child per session
+    pooled   blender_mcp_wrapper.py --connect to a running --pool
+
+Example:
+    python benchmarks/bench_pool.py --sessions 10 --startup-delay 2
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from bench_wrapper import STUB_CHILD, WRAPPER, command_line
+
+
+def session_start(command):
+    """Seconds from launch to the first reply, then close the session."""
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, bufsize=0)
+    process.stdin.write(b'{"jsonrpc":"2.0","id":0,"method":"initialize"}\n')
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("session closed before replying")
+        if line.startswith(b"{"):
+            break
+    elapsed = time.perf_counter() - started
+    process.stdin.close()
+    process.wait()
+    return elapsed
+
+
+def wait_for_pool(address, timeout=10.0):
+    sys.path.insert(0, os.path.dirname(WRAPPER))
+    from blender_mcp_wrapper import connect
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connect(address).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    print(f"{label:<10}{timings[0] * 1000:>10.1f}{timings[len(timings) // 2] * 1000:>10.1f}"
+          f"{timings[-1] * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--startup-delay", type=float, default=1.0, help="Simulated cold start in seconds")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=None,
+                        help="Pause between pooled sessions (default: startup delay, so the pool refills)")
+    parser.add_argument("--address", default="127.0.0.1:8799")
+    args = parser.parse_args()
+
+    child = command_line([sys.executable, STUB_CHILD, "--echo", "--startup-delay", str(args.startup_delay)])
+    interval = args.startup_delay if args.interval is None else args.interval
+
+    print(f"{args.sessions} sessions, simulated startup {args.startup_delay}s, pool of {args.pool_size}")
+    print(f"{'mode':<10}{'min ms':>10}{'p50 ms':>10}{'max ms':>10}")
+
+    cold = [session_start([sys.executable, WRAPPER, "--fast", "--child-cmd", child])
+            for _ in range(args.sessions)]
+    report("cold", cold)
+
+    pool = subprocess.Popen([sys.executable, WRAPPER, "--pool", str(args.pool_size),
+                             "--pool-address", args.address, "--child-cmd", child],
+                            stderr=subprocess.DEVNULL)
+    try:
+        wait_for_pool(args.address)
+        time.sleep(args.startup_delay)
+        pooled = []
+        for _ in range(args.sessions):
+            pooled.append(session_start([sys.executable, WRAPPER, "--connect",
+                                         "--pool-address", args.address, "--child-cmd", child]))
+            time.sleep(interval)
+        report("pooled", pooled)
+    finally:
+        pool.terminate()
+        pool.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark for blender_mcp_server.py.
+
+Starts the server over stdio with benchmarks/standin on PYTHONPATH (the in-process bpy
+stand-in, so no Blender is needed), seeds the scene, then sends tools/call requests drawn
+from a weighted tool mix, keeping up to --concurrency requests in flight. Reports
+throughput and p50/p99 latency per tool, measured from sending a request to its reply.
+
+Tool mixes are comma-separated name=weight pairs; tools without a built-in argument
+generator (see TOOL_ARGUMENTS) cannot be used.
+
+Example:
+    python benchmarks/bench_server.py --requests 2000 --concurrency 8 \\
+        --mix create_cube=2,move_object=4,list_objects=2,find_nearest_objects=4
+"""
+
+import argparse
+import collections
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+SERVER = os.path.join(REPO_DIR, "blender_mcp_server.py")
+STANDIN_DIR = os.path.join(BENCH_DIR, "standin")
+
+DEFAULT_MIX = ("create_cube=2,move_object=4,set_material=1,list_objects=1,get_transforms=2,"
+               "find_nearest_objects=4,find_objects_in_radius=2")
+
+
+def _point(rng, extent=50.0):
+    return [round(rng.uniform(-extent, extent), 3) for _ in range(3)]
+
+
+def _seed_name(rng, seed_objects):
+    return f"Seed.{rng.randrange(seed_objects)}"
+
+
+# tool -> function(rng, seed_objects) returning the call's arguments
+TOOL_ARGUMENTS = {
+    "create_cube": lambda rng, n: {"location": _point(rng)},
+    "create_sphere": lambda rng, n: {"location": _point(rng), "radius": 0.5},
+    "create_objects_batch": lambda rng, n: {"objects": [{"type": "cube", "location": _point(rng)}
+                                                        for _ in range(10)]},
+    "delete_object": lambda rng, n: {"name": _seed_name(rng, n)},
+    "move_object": lambda rng, n: {"name": _seed_name(rng, n), "location": _point(rng)},
+    "set_transforms": lambda rng, n: {"names": [_seed_name(rng, n) for _ in range(10)],
+                                      "location": [v for _ in range(10) for v in _point(rng)]},
+    "insert_keyframes": lambda rng, n: {"channels": [{"object": _seed_name(rng, n), "frames": [1, 12, 24],
+                                                      "values": _point(rng) + _point(rng) + _point(rng)}]},
+    "set_material": lambda rng, n: {"object_name": _seed_name(rng, n),
+                                    "material_name": f"Bench.{rng.randrange(8)}",
+                                    "color": [rng.randrange(8) / 8, 0.5, 0.5, 1.0]},
+    "list_objects": lambda rng, n: rng.choice([
+        {},
+        {"fields": ["location", "dimensions", "collections"], "limit": 100},
+        {"pattern": "Seed.1*", "type": ["MESH"], "fields": ["visible"]},
+        {"since_revision": 1, "fields": ["location"]},
+    ]),
+    "get_transforms": lambda rng, n: {"pattern": "Seed.1*"},
+    "find_nearest_objects": lambda rng, n: {"point": _point(rng), "k": 5},
+    "find_objects_in_radius": lambda rng, n: {"point": _point(rng), "radius": 10.0},
+    "find_objects_in_box": lambda rng, n: {"min": _point(rng), "max": [60.0, 60.0, 60.0]},
+    "raycast_objects": lambda rng, n: {"origin": [*_point(rng)[:2], 100.0], "direction": [0, 0, -1]},
+    "render_scene": lambda rng, n: {"filepath": os.path.join("/tmp", "bench_render.png"),
+                                    "resolution_x": 64, "resolution_y": 64, "wait": True,
+                                    "use_cache": False},
+    "execute_python": lambda rng, n: {"code": "result = len(bpy.data.objects)"},
+    "get_server_stats": lambda rng, n: {},
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in TOOL_ARGUMENTS:
+            raise SystemExit(f"unknown tool in --mix: {name!r} (known: {', '.join(sorted(TOOL_ARGUMENTS))})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Client:
+    """stdio JSON-RPC client that lets several requests be in flight at once."""
+
+    def __init__(self, command, env):
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, env=env, bufsize=0)
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            if not line.startswith(b"{"):
+                continue
+            message = json.loads(line)
+            with self.lock:
+                waiter = self.pending.pop(message.get("id"), None)
+            if waiter is not None:
+                waiter[1] = message
+                waiter[0].set()
+        with self.lock:
+            for waiter in self.pending.values():
+                waiter[0].set()
+
+    def send(self, method, params=None, notify=False):
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        waiter = None
+        if not notify:
+            waiter = [threading.Event(), None]
+            with self.lock:
+                self.next_id += 1
+                message["id"] = self.next_id
+                self.pending[self.next_id] = waiter
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+        return waiter
+
+    def call(self, method, params=None):
+        waiter = self.send(method, params)
+        waiter[0].wait()
+        if waiter[1] is None:
+            raise RuntimeError(f"server closed during {method}")
+        return waiter[1]
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def run_load(client, mix, requests, concurrency, seed_objects, rng):
+    """Send requests drawn from mix with up to concurrency in flight; returns per-tool results."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = collections.defaultdict(list)
+    errors = collections.Counter()
+    lock = threading.Lock()
+    slots = threading.Semaphore(concurrency)
+    done = threading.Event()
+    remaining = [requests]
+
+    def finish(tool, started, waiter):
+        waiter[0].wait()
+        elapsed = time.perf_counter() - started
+        reply = waiter[1] or {}
+        result = reply.get("result", {})
+        failed = "error" in reply or result.get("isError") or any(
+            item.get("text", "").startswith("Error") for item in result.get("content", []))
+        with lock:
+            latencies[tool].append(elapsed)
+            if failed:
+                errors[tool] += 1
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+        slots.release()
+
+    started_all = time.perf_counter()
+    for _ in range(requests):
+        tool = rng.choices(names, weights)[0]
+        arguments = TOOL_ARGUMENTS[tool](rng, seed_objects)
+        slots.acquire()
+        started = time.perf_counter()
+        waiter = client.send("tools/call", {"name": tool, "arguments": arguments})
+        threading.Thread(target=finish, args=(tool, started, waiter), daemon=True).start()
+    done.wait()
+    return time.perf_counter() - started_all, latencies, errors
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def report(elapsed, latencies, errors):
+    print(f"{'tool':<26}{'calls':>8}{'errors':>8}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    everything = []
+    for tool in sorted(latencies):
+        timings = sorted(latencies[tool])
+        everything.extend(timings)
+        print(f"{tool:<26}{len(timings):>8}{errors[tool]:>8}{len(timings) / elapsed:>10.1f}"
+              f"{percentile(timings, 0.5) * 1000:>10.2f}{percentile(timings, 0.99) * 1000:>10.2f}")
+    everything.sort()
+    print(f"{'total':<26}{len(everything):>8}{sum(errors.values()):>8}{len(everything) / elapsed:>10.1f}"
+          f"{percentile(everything, 0.5) * 1000:>10.2f}{percentile(everything, 0.99) * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma-separated tool=weight pairs")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--seed-objects", type=int, default=500,
+                        help="Objects named Seed.<i> created before the run for tools to act on")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the request sequence")
+    parser.add_argument("--render-seconds", type=float, default=0.05,
+                        help="Time the stand-in spends per render (BLENDER_MCP_STANDIN_RENDER_SECONDS)")
+    parser.add_argument("--server-arg", action="append", default=[],
+                        help="Extra argument for blender_mcp_server.py (repeatable)")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    env = dict(os.environ, BLENDER_MCP_STANDIN_RENDER_SECONDS=str(args.render_seconds))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [STANDIN_DIR, env.get("PYTHONPATH")]))
+
+    started = time.perf_counter()
+    client = Client([sys.executable, SERVER, *args.server_arg], env)
+    try:
+        client.call("initialize", {"protocolVersion": "2024-11-05", "capabilities": {},
+                                   "clientInfo": {"name": "bench_server", "version": "1"}})
+        client.send("notifications/initialized", notify=True)
+        startup = time.perf_counter() - started
+
+        seeded = client.call("tools/call", {"name": "create_objects_batch", "arguments": {"objects": [
+            {"type": "cube", "name": f"Seed.{i}", "location": _point(random.Random(i))}
+            for i in range(args.seed_objects)]}})
+        if "error" in seeded:
+            raise SystemExit(f"seeding failed: {seeded['error']}")
+
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {args.seed_objects} seed objects, "
+              f"startup {startup * 1000:.0f} ms")
+        elapsed, latencies, errors = run_load(client, mix, args.requests, args.concurrency,
+                                              args.seed_objects, random.Random(args.seed))
+        report(elapsed, latencies, errors)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for blender_mcp_server.py.
+
+Starts the server --runs times with the bpy stand-in (benchmarks/standin) and
+BLENDER_MCP_STARTUP_TIMING=1, sends initialize and waits for the reply. Reports the
+median of each startup phase the server logs on stderr, plus the time the client saw
+from launching the process to the initialize reply (which also covers interpreter
+start and compiling the script, before the server's own clock starts).
+
+Example:
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_server import SERVER, STANDIN_DIR
+
+PHASE_LINE = re.compile(r"^startup: (.+?)\s+([\d.]+) ms\s+([\d.]+) ms$")
+
+
+def cold_start(command, env):
+    """(client-side seconds to the initialize reply, {phase: (ms, ms since start)})."""
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, env=env, bufsize=0)
+    process.stdin.write(b'{"jsonrpc":"2.0","id":0,"method":"initialize","params":{"protocolVersion":'
+                        b'"2024-11-05","capabilities":{},"clientInfo":{"name":"bench","version":"1"}}}\n')
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("server closed before replying: " + process.stderr.read().decode()[-2000:])
+        if line.startswith(b"{"):
+            break
+    elapsed = time.perf_counter() - started
+    # Let the deferred setup finish and log before closing stdin
+    time.sleep(0.5)
+    _, stderr = process.communicate()
+    phases = {}
+    for text in stderr.decode(errors="replace").splitlines():
+        match = PHASE_LINE.match(text)
+        if match:
+            phases[match.group(1)] = (float(match.group(2)), float(match.group(3)))
+    return elapsed, phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--server", default=SERVER, help="Server script to start")
+    args = parser.parse_args()
+
+    env = dict(os.environ, BLENDER_MCP_STARTUP_TIMING="1")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [STANDIN_DIR, env.get("PYTHONPATH")]))
+
+    totals, runs = [], []
+    for _ in range(args.runs):
+        elapsed, phases = cold_start([sys.executable, args.server], env)
+        totals.append(elapsed)
+        runs.append(phases)
+
+    print(f"{args.runs} cold starts, medians")
+    print(f"{'phase':<24}{'ms':>10}{'at ms':>10}")
+    for phase in runs[0]:
+        durations = [run[phase][0] for run in runs if phase in run]
+        offsets = [run[phase][1] for run in runs if phase in run]
+        print(f"{phase:<24}{statistics.median(durations):>10.1f}{statistics.median(offsets):>10.1f}")
+    print(f"{'client: initialize reply':<24}{'':>10}{statistics.median(totals) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency benchmark for blender_mcp_wrapper.py.
+
+Drives the wrapper with benchmarks/stub_mcp_child.py as the child process and measures,
+for each forwarding mode, compared with talking to the stand-in child directly:
+
+    stdout  frames/s and MB/s from the child to the client
+    stdin   MB/s of large requests from the client to the child (each one acknowledged)
+    rtt     round-trip latency of small sequential requests
+
+Example:
+    python benchmarks/bench_wrapper.py --direction all --frame-size 65536
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+WRAPPER = os.path.join(REPO_DIR, "blender_mcp_wrapper.py")
+STUB_CHILD = os.path.join(BENCH_DIR, "stub_mcp_child.py")
+
+
+def command_line(parts):
+    """Join arguments into one --child-cmd string the wrapper can split again."""
+    if sys.platform == "win32":
+        return subprocess.list2cmdline(parts)
+    import shlex
+    return " ".join(shlex.quote(p) for p in parts)
+
+
+def wrapped(child, *flags):
+    return [sys.executable, WRAPPER, *flags, "--child-cmd", command_line(child)]
+
+
+def modes_for(child, include_compat=True):
+    modes = {"direct": child}
+    if include_compat:
+        modes["wrapper"] = wrapped(child)
+    modes["wrapper --fast"] = wrapped(child, "--fast")
+    if sys.platform != "win32":
+        modes["wrapper --event-loop"] = wrapped(child, "--event-loop")
+    return modes
+
+
+def bench_stdout(command, frames):
+    """Run command to completion, counting JSON frames and bytes on its stdout."""
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    received = 0
+    total = 0
+    for line in process.stdout:
+        total += len(line)
+        if line.startswith(b"{"):
+            received += 1
+    process.wait()
+    elapsed = time.perf_counter() - started
+
+    if received != frames:
+        raise RuntimeError(f"expected {frames} frames, got {received}")
+    return elapsed, total
+
+
+def bench_stdin(command, requests, size):
+    """Stream large requests into command's stdin and wait for every acknowledgement."""
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    payload = b'{"id":%d,"data":"' + b"x" * size + b'"}\n'
+
+    def write_requests():
+        for i in range(requests):
+            process.stdin.write(payload % i)
+        process.stdin.close()
+
+    started = time.perf_counter()
+    writer = threading.Thread(target=write_requests, daemon=True)
+    writer.start()
+    acks = sum(1 for line in process.stdout if line.startswith(b"{"))
+    elapsed = time.perf_counter() - started
+    process.wait()
+
+    if acks != requests:
+        raise RuntimeError(f"expected {requests} acknowledgements, got {acks}")
+    return elapsed, requests * len(payload)
+
+
+def bench_rtt(command, requests):
+    """Send small requests one at a time; return sorted round-trip latencies."""
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, bufsize=0)
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        process.stdin.write(b'{"jsonrpc":"2.0","id":%d,"method":"tools/list"}\n' % i)
+        while not process.stdout.readline().startswith(b"{"):
+            pass
+        latencies.append(time.perf_counter() - started)
+    process.stdin.close()
+    process.wait()
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--direction", choices=["stdout", "stdin", "rtt", "all"], default="all")
+    parser.add_argument("--frames", type=int, default=2000, help="Frames or requests per run")
+    parser.add_argument("--frame-size", type=int, default=16384)
+    parser.add_argument("--noise-every", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the best run is reported")
+    parser.add_argument("--skip-compat", action="store_true",
+                        help="Skip the default line-decoding mode, which is slow for large frames")
+    args = parser.parse_args()
+    directions = ["stdout", "stdin", "rtt"] if args.direction == "all" else [args.direction]
+
+    if "stdout" in directions:
+        child = [sys.executable, STUB_CHILD, "--frames", str(args.frames),
+                 "--frame-size", str(args.frame_size), "--noise-every", str(args.noise_every)]
+        print(f"\nstdout: {args.frames} frames of ~{args.frame_size} bytes, noise every {args.noise_every} frames")
+        print(f"{'mode':<24}{'seconds':>10}{'MB/s':>10}{'frames/s':>12}")
+        for label, command in modes_for(child, not args.skip_compat).items():
+            elapsed, total = min(bench_stdout(command, args.frames) for _ in range(args.repeat))
+            print(f"{label:<24}{elapsed:>10.3f}{total / elapsed / 1e6:>10.1f}{args.frames / elapsed:>12.0f}")
+
+    echo_child = [sys.executable, STUB_CHILD, "--echo"]
+    if "stdin" in directions:
+        print(f"\nstdin: {args.frames} requests of ~{args.frame_size} bytes")
+        print(f"{'mode':<24}{'seconds':>10}{'MB/s':>10}{'req/s':>12}")
+        for label, command in modes_for(echo_child, not args.skip_compat).items():
+            elapsed, total = min(bench_stdin(command, args.frames, args.frame_size) for _ in range(args.repeat))
+            print(f"{label:<24}{elapsed:>10.3f}{total / elapsed / 1e6:>10.1f}{args.frames / elapsed:>12.0f}")
+
+    if "rtt" in directions:
+        requests = min(args.frames, 500)
+        print(f"\nrtt: {requests} sequential small requests")
+        print(f"{'mode':<24}{'p50 ms':>10}{'p99 ms':>10}")
+        for label, command in modes_for(echo_child, not args.skip_compat).items():
+            latencies = bench_rtt(command, requests)
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            print(f"{label:<24}{p50:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
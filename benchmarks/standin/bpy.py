@@ -0,0 +1,1139 @@
+"""
+In-process stand-in for the subset of Blender's bpy module that blender_mcp_server.py
+uses, so the server can be run, smoke-tested and benchmarked without Blender:
+
+    PYTHONPATH=benchmarks/standin python blender_mcp_server.py
+
+Covers bpy.data (objects, meshes, materials, collections, scenes, actions),
+bpy.context (scene, view_layer, active_object), bpy.ops (mesh primitives, render, save,
+undo_push), bpy.app and bpy.path. It follows Blender where the server depends on the behaviour:
+
+- datablock names are unique per type, clashes get ".001" style suffixes, and
+  bpy.data collections iterate in name order
+- collection.objects keeps link order; scene.objects covers child collections
+- foreach_get/foreach_set take flat sequences or buffers and reject size mismatches
+- Object.copy() shares the object's data, like a linked duplicate
+- mesh elements live in flat arrays; loop_triangles fan-triangulate the polygons
+- new node materials get a Principled BSDF and a Material Output node
+- modifiers and the colour management settings describe their settings in bl_rna.properties
+
+Animation data is stored (actions, F-curves, keyframe_points) but never evaluated
+onto properties. Not covered: the depsgraph (matrix_world is always current, so
+view_layer.update() only counts calls, and modifiers are stored but never applied), mathutils
+and real rendering. The render
+operator sleeps BLENDER_MCP_STANDIN_RENDER_SECONDS (default 0.05) and writes a flat
+grey PNG. Everything runs in one process with no dependencies beyond the standard
+library; render_worker.py stands in for command-line Blender rendering animation frames.
+"""
+
+import array
+import json
+import math
+import os
+import struct
+import time
+import types
+import zlib
+
+# ---------------------------------------------------------------------------
+# Flat buffers (foreach_get / foreach_set)
+# ---------------------------------------------------------------------------
+
+
+def _flatten(values):
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from _flatten(value)
+        else:
+            yield value
+
+
+def _read_buffer(seq, typecode: str, size: int) -> array.array:
+    """seq (nested sequence, array or buffer) as a flat array of typecode holding size items."""
+    try:
+        view = memoryview(seq)
+    except TypeError:
+        view = None
+    if view is not None and view.format == typecode and view.c_contiguous:
+        values = array.array(typecode)
+        values.frombytes(view.cast("B"))
+    else:
+        convert = float if typecode == "f" else int
+        source = view.tolist() if view is not None else seq
+        values = array.array(typecode, (convert(v) for v in _flatten(source)))
+    if len(values) != size:
+        raise RuntimeError(f"internal error setting the array: expected {size} items, got {len(values)}")
+    return values
+
+
+def _write_buffer(seq, values: array.array):
+    """Copy values into seq (list, array.array or NumPy array), which must have the same size."""
+    try:
+        view = memoryview(seq)
+    except TypeError:
+        view = None
+    if view is not None and view.format == values.typecode and view.c_contiguous:
+        if view.nbytes != len(values) * values.itemsize:
+            raise RuntimeError(f"internal error getting the array: expected {len(values)} items")
+        view.cast("B")[:] = memoryview(values).cast("B")
+        return
+    if hasattr(seq, "reshape"):
+        seq = seq.reshape(-1)
+    if len(seq) != len(values):
+        raise RuntimeError(f"internal error getting the array: expected {len(values)} items, got {len(seq)}")
+    seq[:] = values if not isinstance(seq, list) else values.tolist()
+
+
+class _PropCollection:
+    """Shared behaviour of bpy_prop_collection: lookup by name or index, foreach_get/set."""
+
+    def _list(self) -> list:
+        raise NotImplementedError
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __len__(self):
+        return len(self._list())
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return self._list()[key]
+        item = self.get(key)
+        if item is None:
+            raise KeyError(f'bpy_prop_collection[key]: key "{key}" not found')
+        return item
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        for item in self._list():
+            if item.name == key:
+                return item
+        return default
+
+    def keys(self) -> list[str]:
+        return [item.name for item in self._list()]
+
+    def values(self) -> list:
+        return list(self._list())
+
+    def items(self) -> list:
+        return [(item.name, item) for item in self._list()]
+
+    def foreach_get(self, attr: str, seq):
+        items = self._list()
+        first = getattr(items[0], attr) if items else 0.0
+        values = array.array("i" if isinstance(first, int) else "f")
+        if isinstance(first, (list, tuple)):
+            for item in items:
+                values.extend(_flatten(getattr(item, attr)))
+        else:
+            values.extend(getattr(item, attr) for item in items)
+        _write_buffer(seq, values)
+
+    def foreach_set(self, attr: str, seq):
+        items = self._list()
+        if not items:
+            _read_buffer(seq, "f", 0)
+            return
+        current = getattr(items[0], attr)
+        width = len(current) if isinstance(current, (list, tuple)) else 1
+        values = _read_buffer(seq, "i" if isinstance(current, int) else "f", width * len(items))
+        if width == 1:
+            for item, value in zip(items, values):
+                setattr(item, attr, value)
+            return
+        for i, item in enumerate(items):
+            setattr(item, attr, values[i * width:(i + 1) * width])
+
+
+# ---------------------------------------------------------------------------
+# ID datablocks
+# ---------------------------------------------------------------------------
+
+
+class _RNAProperty:
+    def __init__(self, identifier: str, prop_type: str):
+        self.identifier = identifier
+        self.type = prop_type
+
+
+def _rna_type(value) -> str:
+    if isinstance(value, bool):
+        return 'BOOLEAN'
+    if isinstance(value, int):
+        return 'INT'
+    if isinstance(value, (float, list)):
+        return 'FLOAT'
+    if isinstance(value, str):
+        return 'ENUM'
+    return 'POINTER'
+
+
+class _Struct:
+    """A settings struct whose bl_rna.properties list the settings it was created with."""
+
+    def __init__(self, **settings):
+        for identifier, value in settings.items():
+            setattr(self, identifier, list(value) if isinstance(value, tuple) else value)
+        self.bl_rna = types.SimpleNamespace(
+            properties=[_RNAProperty(identifier, _rna_type(value)) for identifier, value in settings.items()])
+
+
+class _Vector(list):
+    """Stand-in for mathutils.Vector: a list of floats with x, y, z accessors."""
+
+    def __init__(self, values):
+        super().__init__(float(v) for v in values)
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    z = property(lambda self: self[2])
+
+
+class ID:
+    """Base datablock. Names are unique within the owning bpy.data collection."""
+
+    _owner: "_IDCollection | None" = None
+    _name = ""
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        if self._owner is None:
+            self._name = value
+        elif value != self._name:
+            self._owner._rename(self, value)
+
+    @property
+    def users(self) -> int:
+        return 1
+
+    def __repr__(self):
+        return f"<bpy_struct, {type(self).__name__}(\"{self._name}\")>"
+
+
+class _IDCollection(_PropCollection):
+    """bpy.data.<type>: datablocks of one type, iterated in name order like Blender."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._items: dict[str, ID] = {}
+        self._sorted: list[ID] | None = None
+        self._next_suffix: dict[str, int] = {}
+
+    def _list(self) -> list:
+        if self._sorted is None:
+            self._sorted = [self._items[name] for name in sorted(self._items)]
+        return self._sorted
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def keys(self) -> list[str]:
+        return [item.name for item in self._list()]
+
+    def _unique(self, name: str) -> str:
+        name = name[:63]
+        if name not in self._items:
+            return name
+        base = name
+        if len(name) > 4 and name[-4] == "." and name[-3:].isdigit():
+            base = name[:-4]
+        suffix = self._next_suffix.get(base, 1)
+        while f"{base}.{suffix:03d}" in self._items:
+            suffix += 1
+        self._next_suffix[base] = suffix + 1
+        return f"{base}.{suffix:03d}"
+
+    def _add(self, item: ID, name: str) -> ID:
+        item._name = self._unique(name)
+        item._owner = self
+        self._items[item._name] = item
+        self._sorted = None
+        return item
+
+    def _rename(self, item: ID, value: str):
+        old = item._name
+        del self._items[old]
+        item._name = self._unique(value)
+        self._items[item._name] = item
+        self._sorted = None
+        item._renamed(old)
+
+    def new(self, name: str, *args, **kwargs) -> ID:
+        return self._add(self._factory(*args, **kwargs), name)
+
+    def remove(self, item: ID, do_unlink: bool = True):
+        if self._items.get(item.name) is not item:
+            raise ReferenceError(f"{type(item).__name__} '{item.name}' has been removed")
+        item._removed()
+        del self._items[item.name]
+        self._sorted = None
+        item._owner = None
+
+
+# ---------------------------------------------------------------------------
+# Meshes
+# ---------------------------------------------------------------------------
+
+
+class _Element:
+    """View of one element (vertex, loop, polygon...) of an _ElementCollection."""
+
+    __slots__ = ("_collection", "_index")
+
+    def __init__(self, collection, index):
+        object.__setattr__(self, "_collection", collection)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, attr):
+        collection, index = self._collection, self._index
+        values = collection._data[attr]
+        width = collection._fields[attr][1]
+        if width == 1:
+            return values[index]
+        return _Vector(values[index * width:(index + 1) * width])
+
+    def __setattr__(self, attr, value):
+        collection, index = self._collection, self._index
+        values = collection._data[attr]
+        width = collection._fields[attr][1]
+        if width == 1:
+            values[index] = value
+        else:
+            values[index * width:(index + 1) * width] = array.array(values.typecode, value)
+
+
+class _ElementCollection(_PropCollection):
+    """Mesh element data stored as one flat array per property."""
+
+    def __init__(self, fields: dict[str, tuple[str, int]]):
+        self._fields = fields
+        self._data = {attr: array.array(typecode) for attr, (typecode, _) in fields.items()}
+        self._count = 0
+
+    def _list(self):
+        return [_Element(self, i) for i in range(self._count)]
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return (_Element(self, i) for i in range(self._count))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("bpy_prop_collection[index]: index out of range")
+        return _Element(self, index)
+
+    def add(self, count: int):
+        for attr, (typecode, width) in self._fields.items():
+            self._data[attr].frombytes(bytes(count * width * self._data[attr].itemsize))
+        self._count += count
+
+    def foreach_get(self, attr: str, seq):
+        _write_buffer(seq, self._data[attr])
+
+    def foreach_set(self, attr: str, seq):
+        typecode, width = self._fields[attr]
+        self._data[attr] = _read_buffer(seq, typecode, self._count * width)
+
+
+class _MaterialList(list):
+    """Mesh.materials: material slots of the mesh data."""
+
+    def append(self, material):
+        super().append(material)
+
+
+class _UVLayers(_PropCollection):
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._layers = []
+
+    def _list(self):
+        return self._layers
+
+    def new(self, name: str = "UVMap", do_init: bool = True):
+        layer = types.SimpleNamespace(name=name, data=_ElementCollection({"uv": ("f", 2)}))
+        layer.data.add(len(self._mesh.loops))
+        self._layers.append(layer)
+        return layer
+
+
+class Mesh(ID):
+    def __init__(self):
+        self.vertices = _ElementCollection({"co": ("f", 3)})
+        self.edges = _ElementCollection({"vertices": ("i", 2)})
+        self.loops = _ElementCollection({"vertex_index": ("i", 1)})
+        self.polygons = _ElementCollection({"loop_start": ("i", 1), "loop_total": ("i", 1),
+                                            "material_index": ("i", 1), "use_smooth": ("i", 1)})
+        self.loop_triangles = _ElementCollection({"vertices": ("i", 3)})
+        self.materials = _MaterialList()
+        self.uv_layers = _UVLayers(self)
+        self.shape_keys = None
+        self.custom_normals: tuple[str, int] | None = None
+
+    @property
+    def users(self) -> int:
+        return sum(1 for obj in data.objects if obj.data is self)
+
+    def _renamed(self, old):
+        pass
+
+    def _removed(self):
+        for obj in data.objects:
+            if obj.data is self:
+                obj.data = None
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices.add(len(vertices))
+        self.vertices.foreach_set("co", list(_flatten(vertices)))
+        if edges:
+            self.edges.add(len(edges))
+            self.edges.foreach_set("vertices", list(_flatten(edges)))
+        sizes = [len(face) for face in faces]
+        self.loops.add(sum(sizes))
+        self.loops.foreach_set("vertex_index", [index for face in faces for index in face])
+        self.polygons.add(len(faces))
+        starts, total = [], 0
+        for size in sizes:
+            starts.append(total)
+            total += size
+        self.polygons.foreach_set("loop_start", starts)
+        self.polygons.foreach_set("loop_total", sizes)
+
+    def update(self, calc_edges: bool = False, calc_edges_loose: bool = False):
+        pass
+
+    def validate(self, verbose: bool = False, clean_customdata: bool = True) -> bool:
+        """True if invalid geometry was found (indices out of range are reported, not fixed)."""
+        count = len(self.vertices)
+        indices = self.loops._data["vertex_index"]
+        return bool(indices) and (min(indices) < 0 or max(indices) >= count)
+
+    def calc_loop_triangles(self):
+        indices = self.loops._data["vertex_index"]
+        triangles = array.array("i")
+        polygons = self.polygons._data
+        for start, total in zip(polygons["loop_start"], polygons["loop_total"]):
+            for k in range(1, total - 1):
+                triangles.extend((indices[start], indices[start + k], indices[start + k + 1]))
+        self.loop_triangles = _ElementCollection({"vertices": ("i", 3)})
+        self.loop_triangles.add(len(triangles) // 3)
+        self.loop_triangles._data["vertices"] = triangles
+
+    def normals_split_custom_set(self, normals):
+        if len(normals) != len(self.loops):
+            raise ValueError(f"Number of custom normals is not number of loops ({len(normals)} / {len(self.loops)})")
+        self.custom_normals = ("LOOP", len(normals))
+
+    def normals_split_custom_set_from_vertices(self, normals):
+        if len(normals) != len(self.vertices):
+            raise ValueError(f"Number of custom normals is not number of vertices "
+                             f"({len(normals)} / {len(self.vertices)})")
+        self.custom_normals = ("VERTEX", len(normals))
+
+
+def _cube_geometry(size: float):
+    r = size / 2.0
+    vertices = [(x, y, z) for x in (-r, r) for y in (-r, r) for z in (-r, r)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    return vertices, faces
+
+
+def _uv_sphere_geometry(radius: float, segments: int, rings: int):
+    vertices = [(0.0, 0.0, radius)]
+    for ring in range(1, rings):
+        phi = math.pi * ring / rings
+        for segment in range(segments):
+            theta = 2.0 * math.pi * segment / segments
+            vertices.append((radius * math.sin(phi) * math.cos(theta), radius * math.sin(phi) * math.sin(theta),
+                             radius * math.cos(phi)))
+    vertices.append((0.0, 0.0, -radius))
+    bottom = len(vertices) - 1
+    faces = [(0, 1 + s, 1 + (s + 1) % segments) for s in range(segments)]
+    for ring in range(rings - 2):
+        start = 1 + ring * segments
+        for s in range(segments):
+            n = (s + 1) % segments
+            faces.append((start + s, start + segments + s, start + segments + n, start + n))
+    last = 1 + (rings - 2) * segments
+    faces.extend((last + (s + 1) % segments, last + s, bottom) for s in range(segments))
+    return vertices, faces
+
+
+# ---------------------------------------------------------------------------
+# Materials
+# ---------------------------------------------------------------------------
+
+
+class _Socket:
+    def __init__(self, name: str, default_value):
+        self.identifier = self.name = name
+        self.default_value = default_value
+        self.is_linked = False
+
+
+class _Sockets(_PropCollection):
+    def __init__(self, sockets):
+        self._sockets = list(sockets)
+
+    def _list(self):
+        return self._sockets
+
+
+class _Node:
+    def __init__(self, name: str, node_type: str, inputs=()):
+        self.name = name
+        self.type = node_type
+        self.inputs = _Sockets(inputs)
+
+
+class _Nodes(_PropCollection):
+    def __init__(self, nodes):
+        self._nodes = list(nodes)
+
+    def _list(self):
+        return self._nodes
+
+
+# Principled BSDF inputs and defaults (a subset, as in Blender 4.x/5.x)
+PRINCIPLED_INPUTS = (
+    ("Base Color", (0.8, 0.8, 0.8, 1.0)),
+    ("Metallic", 0.0),
+    ("Roughness", 0.5),
+    ("IOR", 1.5),
+    ("Alpha", 1.0),
+    ("Emission Color", (1.0, 1.0, 1.0, 1.0)),
+    ("Emission Strength", 0.0),
+)
+
+
+class Material(ID):
+    def __init__(self):
+        self._use_nodes = False
+        self.node_tree = None
+        self.diffuse_color = [0.8, 0.8, 0.8, 1.0]
+        self.metallic = 0.0
+        self.roughness = 0.4
+        self.blend_method = "OPAQUE"
+        self.use_backface_culling = False
+        self.pass_index = 0
+
+    @property
+    def use_nodes(self) -> bool:
+        return self._use_nodes
+
+    @use_nodes.setter
+    def use_nodes(self, value: bool):
+        self._use_nodes = bool(value)
+        if value and self.node_tree is None:
+            principled = _Node("Principled BSDF", "BSDF_PRINCIPLED",
+                               (_Socket(name, list(v) if isinstance(v, tuple) else v) for name, v in PRINCIPLED_INPUTS))
+            output = _Node("Material Output", "OUTPUT_MATERIAL", (_Socket("Surface", None),))
+            self.node_tree = types.SimpleNamespace(nodes=_Nodes((principled, output)), links=[])
+
+    @property
+    def users(self) -> int:
+        count = sum(sum(1 for m in mesh.materials if m is self) for mesh in data.meshes)
+        for obj in data.objects:
+            count += sum(1 for slot in obj._slots if slot.link == 'OBJECT' and slot._material is self)
+        return count
+
+    def user_remap(self, new: "Material"):
+        for mesh in data.meshes:
+            for i, material in enumerate(mesh.materials):
+                if material is self:
+                    mesh.materials[i] = new
+        for obj in data.objects:
+            for slot in obj._slots:
+                if slot._material is self:
+                    slot._material = new
+
+    def _renamed(self, old):
+        pass
+
+    def _removed(self):
+        for mesh in data.meshes:
+            for i, material in enumerate(mesh.materials):
+                if material is self:
+                    mesh.materials[i] = None
+        for obj in data.objects:
+            for slot in obj._slots:
+                if slot._material is self:
+                    slot._material = None
+
+
+# ---------------------------------------------------------------------------
+# Animation
+# ---------------------------------------------------------------------------
+
+
+class _Keyframes(_ElementCollection):
+    """FCurve.keyframe_points; interpolation holds the enum's values (0 CONSTANT, 1 LINEAR, 2 BEZIER)."""
+
+    def __init__(self):
+        super().__init__({"co": ("f", 2), "interpolation": ("i", 1)})
+
+    def add(self, count: int):
+        super().add(count)
+        modes = self._data["interpolation"]
+        for i in range(len(modes) - count, len(modes)):
+            modes[i] = 2  # New keys are Bezier, the default in Blender's preferences
+
+    def clear(self):
+        self.__init__()
+
+
+class FCurve:
+    def __init__(self, data_path: str, index: int, group: str):
+        self.data_path = data_path
+        self.array_index = index
+        self.group = types.SimpleNamespace(name=group) if group else None
+        self.keyframe_points = _Keyframes()
+
+    def update(self):
+        """Sort the keyframes by frame (there are no handles to recalculate)."""
+        points = self.keyframe_points
+        co, modes = points._data["co"], points._data["interpolation"]
+        order = sorted(range(len(points)), key=lambda i: co[2 * i])
+        points._data["co"] = array.array("f", (v for i in order for v in co[2 * i:2 * i + 2]))
+        points._data["interpolation"] = array.array("i", (modes[i] for i in order))
+
+    def evaluate(self, frame: float) -> float:
+        """Value at frame; Bezier segments are evaluated as linear."""
+        co, modes = self.keyframe_points._data["co"], self.keyframe_points._data["interpolation"]
+        count = len(modes)
+        if not count:
+            return 0.0
+        if frame <= co[0]:
+            return co[1]
+        for i in range(count - 1):
+            (f0, v0), (f1, v1) = co[2 * i:2 * i + 2], co[2 * i + 2:2 * i + 4]
+            if frame < f1:
+                if modes[i] == 0 or f1 == f0:
+                    return v0
+                return v0 + (v1 - v0) * (frame - f0) / (f1 - f0)
+        return co[-1]
+
+
+class Action(ID):
+    """A layered action as in Blender 5.0: F-curves are reached through fcurve_ensure_for_datablock."""
+
+    def __init__(self):
+        self._fcurves: dict[tuple[str, str, int], FCurve] = {}
+
+    def fcurve_ensure_for_datablock(self, datablock, data_path: str, index: int = 0, group_name: str = ""):
+        key = (datablock.name, data_path, index)
+        if key not in self._fcurves:
+            self._fcurves[key] = FCurve(data_path, index, group_name)
+        return self._fcurves[key]
+
+    def _renamed(self, old):
+        pass
+
+    def _removed(self):
+        pass
+
+
+class _AnimData:
+    def __init__(self):
+        self.action = None
+
+
+# ---------------------------------------------------------------------------
+# Objects and collections
+# ---------------------------------------------------------------------------
+
+
+class _MaterialSlot:
+    def __init__(self, obj, index: int):
+        self._object = obj
+        self._index = index
+        self.link = 'DATA'
+        self._material = None
+
+    @property
+    def material(self):
+        if self.link == 'OBJECT':
+            return self._material
+        materials = self._object.data.materials
+        return materials[self._index] if self._index < len(materials) else None
+
+    @material.setter
+    def material(self, material):
+        if self.link == 'OBJECT':
+            self._material = material
+        else:
+            self._object.data.materials[self._index] = material
+
+
+# Settings of some modifier types, with Blender's defaults
+MODIFIER_SETTINGS = {
+    "SUBSURF": {"levels": 1, "render_levels": 2, "quality": 3},
+    "ARRAY": {"count": 2, "relative_offset_displace": (1.0, 0.0, 0.0)},
+    "BEVEL": {"width": 0.1, "segments": 1},
+    "BOOLEAN": {"operation": "DIFFERENCE", "object": None},
+    "SOLIDIFY": {"thickness": 0.01},
+}
+
+
+class _Modifiers(_PropCollection):
+    def __init__(self):
+        self._modifiers = []
+
+    def _list(self):
+        return self._modifiers
+
+    def new(self, name: str, type: str):
+        if type not in MODIFIER_SETTINGS:
+            raise TypeError(f'ObjectModifiers.new(): enum "{type}" not found')
+        modifier = _Struct(name=name, type=type, show_viewport=True, show_render=True, **MODIFIER_SETTINGS[type])
+        self._modifiers.append(modifier)
+        return modifier
+
+    def remove(self, modifier):
+        self._modifiers.remove(modifier)
+
+
+def _euler_matrix(rotation) -> list[list[float]]:
+    """3x3 rotation matrix of an XYZ Euler rotation (Rz @ Ry @ Rx)."""
+    (ca, sa), (cb, sb), (cc, sc) = ((math.cos(a), math.sin(a)) for a in rotation)
+    return [
+        [cb * cc, sa * sb * cc - ca * sc, ca * sb * cc + sa * sc],
+        [cb * sc, sa * sb * sc + ca * cc, ca * sb * sc - sa * cc],
+        [-sb, sa * cb, ca * cb],
+    ]
+
+
+class Object(ID):
+    def __init__(self, object_data=None):
+        self.data = object_data
+        self._location = _Vector((0, 0, 0))
+        self._rotation = _Vector((0, 0, 0))
+        self._scale = _Vector((1, 1, 1))
+        self.parent = None
+        self.hide_viewport = False
+        self.hide_render = False
+        self.instance_type = 'NONE'
+        self.instance_collection = None
+        self.users_collection: list[Collection] = []
+        self._slots: list[_MaterialSlot] = []
+        self.modifiers = _Modifiers()
+        self.animation_data = None
+
+    @property
+    def type(self) -> str:
+        if self.data is None:
+            return 'EMPTY'
+        return {Mesh: 'MESH'}.get(type(self.data), 'CAMERA')
+
+    location = property(lambda self: self._location,
+                        lambda self, value: setattr(self, "_location", _Vector(value)))
+    rotation_euler = property(lambda self: self._rotation,
+                              lambda self, value: setattr(self, "_rotation", _Vector(value)))
+    scale = property(lambda self: self._scale,
+                     lambda self, value: setattr(self, "_scale", _Vector(value)))
+
+    @property
+    def matrix_world(self) -> tuple[tuple[float, ...], ...]:
+        """4x4 world matrix rows (parent inverse matrices are not modelled)."""
+        rotation = _euler_matrix(self._rotation)
+        local = [[rotation[r][c] * self._scale[c] for c in range(3)] + [self._location[r]] for r in range(3)]
+        local.append([0.0, 0.0, 0.0, 1.0])
+        if self.parent is not None:
+            parent = self.parent.matrix_world
+            local = [[sum(parent[r][k] * local[k][c] for k in range(4)) for c in range(4)] for r in range(4)]
+        return tuple(tuple(row) for row in local)
+
+    @property
+    def bound_box(self) -> list[tuple[float, float, float]]:
+        """Local-space bounding box corners (a unit cube for objects without geometry)."""
+        lo, hi = [-1.0] * 3, [1.0] * 3
+        if isinstance(self.data, Mesh) and len(self.data.vertices):
+            co = self.data.vertices._data["co"]
+            lo = [min(co[k::3]) for k in range(3)]
+            hi = [max(co[k::3]) for k in range(3)]
+        return [(x, y, z) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+
+    @property
+    def dimensions(self) -> _Vector:
+        box = self.bound_box
+        return _Vector((box[-1][k] - box[0][k]) * abs(self._scale[k]) for k in range(3))
+
+    @property
+    def material_slots(self) -> list[_MaterialSlot]:
+        count = len(self.data.materials) if hasattr(self.data, "materials") else 0
+        while len(self._slots) < count:
+            self._slots.append(_MaterialSlot(self, len(self._slots)))
+        return self._slots[:count]
+
+    @property
+    def children(self) -> tuple:
+        return tuple(obj for obj in data.objects if obj.parent is self)
+
+    @property
+    def children_recursive(self) -> list:
+        result = []
+        for child in self.children:
+            result.append(child)
+            result.extend(child.children_recursive)
+        return result
+
+    def animation_data_create(self) -> _AnimData:
+        if self.animation_data is None:
+            self.animation_data = _AnimData()
+        return self.animation_data
+
+    def path_resolve(self, path: str):
+        """Dotted attribute paths and ["custom property"] lookups."""
+        value = self
+        for part in path.replace("[", ".[").split("."):
+            try:
+                value = getattr(value, part) if not part.startswith("[") else value[json.loads(part[1:-1])]
+            except (AttributeError, KeyError, IndexError, TypeError, ValueError):
+                raise ValueError(f'Object.path_resolve("{path}") could not be resolved') from None
+        return value
+
+    def visible_get(self) -> bool:
+        return not self.hide_viewport and bool(self.users_collection)
+
+    def copy(self) -> "Object":
+        duplicate = data.objects.new(self.name, self.data)
+        duplicate._location, duplicate._rotation, duplicate._scale = (
+            _Vector(self._location), _Vector(self._rotation), _Vector(self._scale))
+        duplicate.parent = self.parent
+        duplicate.hide_viewport, duplicate.hide_render = self.hide_viewport, self.hide_render
+        duplicate.instance_type, duplicate.instance_collection = self.instance_type, self.instance_collection
+        for slot in self.material_slots:
+            copied = _MaterialSlot(duplicate, slot._index)
+            copied.link, copied._material = slot.link, slot._material
+            duplicate._slots.append(copied)
+        for modifier in self.modifiers:
+            copied = duplicate.modifiers.new(modifier.name, modifier.type)
+            for prop in modifier.bl_rna.properties:
+                value = getattr(modifier, prop.identifier)
+                setattr(copied, prop.identifier, list(value) if isinstance(value, list) else value)
+        return duplicate
+
+    def _renamed(self, old):
+        for collection in self.users_collection:
+            collection.objects._renamed(old, self)
+
+    def _removed(self):
+        for collection in list(self.users_collection):
+            collection.objects.unlink(self)
+        for child in self.children:
+            child.parent = None
+        if context.active_object is self:
+            context.active_object = None
+
+
+class _CollectionObjects(_PropCollection):
+    """Collection.objects: objects linked directly to a collection, in link order."""
+
+    def __init__(self, owner):
+        self._owner = owner
+        self._items: dict[str, Object] = {}
+
+    def _list(self):
+        return list(self._items.values())
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def keys(self):
+        return list(self._items)
+
+    def link(self, obj: Object):
+        if obj.name in self._items:
+            raise RuntimeError(f"Object '{obj.name}' already in collection '{self._owner.name}'")
+        self._items[obj.name] = obj
+        obj.users_collection.append(self._owner)
+
+    def unlink(self, obj: Object):
+        if self._items.get(obj.name) is not obj:
+            raise RuntimeError(f"Object '{obj.name}' not in collection '{self._owner.name}'")
+        del self._items[obj.name]
+        obj.users_collection.remove(self._owner)
+
+    def _renamed(self, old: str, obj: Object):
+        self._items = {(obj.name if name == old else name): item for name, item in self._items.items()}
+
+
+class _CollectionChildren(_PropCollection):
+    def __init__(self):
+        self._children = []
+
+    def _list(self):
+        return self._children
+
+    def link(self, collection):
+        if collection in self._children:
+            raise RuntimeError(f"Collection '{collection.name}' already in collection")
+        self._children.append(collection)
+
+    def unlink(self, collection):
+        self._children.remove(collection)
+
+
+class Collection(ID):
+    def __init__(self):
+        self.objects = _CollectionObjects(self)
+        self.children = _CollectionChildren()
+
+    @property
+    def all_objects(self) -> "_ObjectList":
+        seen: dict[str, Object] = {}
+        for obj in self.objects:
+            seen[obj.name] = obj
+        for child in self.children:
+            for obj in child.all_objects:
+                seen.setdefault(obj.name, obj)
+        return _ObjectList(seen)
+
+    def _renamed(self, old):
+        pass
+
+    def _removed(self):
+        for obj in list(self.objects):
+            self.objects.unlink(obj)
+        for parent in data.collections:
+            if self in parent.children._children:
+                parent.children.unlink(self)
+        for scene in data.scenes:
+            if self in scene.collection.children._children:
+                scene.collection.children.unlink(self)
+
+
+class _ObjectList(_PropCollection):
+    """Read-only view of objects keyed by name (Collection.all_objects, Scene.objects)."""
+
+    def __init__(self, objects: dict[str, Object]):
+        self._objects = objects
+
+    def _list(self):
+        return list(self._objects.values())
+
+    def get(self, key, default=None):
+        return self._objects.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._objects
+
+    def keys(self):
+        return list(self._objects)
+
+
+class _SceneObjects(_PropCollection):
+    """Scene.objects: every object in the scene's collection tree."""
+
+    def __init__(self, scene):
+        self._scene = scene
+
+    def _view(self) -> _ObjectList:
+        return self._scene.collection.all_objects
+
+    def _list(self):
+        return self._view()._list()
+
+    def get(self, key, default=None):
+        return self._view().get(key, default)
+
+    def __contains__(self, key):
+        return key in self._view()
+
+    def keys(self):
+        return self._view().keys()
+
+
+# ---------------------------------------------------------------------------
+# Scenes, context and operators
+# ---------------------------------------------------------------------------
+
+
+class _RenderSettings:
+    def __init__(self):
+        self.engine = "BLENDER_EEVEE_NEXT"
+        self.resolution_x, self.resolution_y = 1920, 1080
+        self.resolution_percentage = 100
+        self.filepath = "/tmp/"
+        self.use_file_extension = True
+        self.film_transparent = False
+        self.fps = 24
+        self.image_settings = types.SimpleNamespace(file_format="PNG", color_mode="RGBA", quality=90)
+
+    @property
+    def file_extension(self) -> str:
+        return {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp", "OPEN_EXR": ".exr"}.get(self.image_settings.file_format, ".png")
+
+
+class Scene(ID):
+    def __init__(self):
+        self.collection = Collection()
+        self.collection._name = "Scene Collection"
+        self.objects = _SceneObjects(self)
+        self.render = _RenderSettings()
+        self.frame_start, self.frame_end, self.frame_current = 1, 250, 1
+        self.frame_step = 1
+        self.camera = None
+        self.world = types.SimpleNamespace(name="World", color=[0.05, 0.05, 0.05], use_nodes=False, node_tree=None)
+        self.cycles = types.SimpleNamespace(samples=4096, preview_samples=1024)
+        self.eevee = types.SimpleNamespace(taa_render_samples=64)
+        self.view_settings = _Struct(view_transform="AgX", look="None", exposure=0.0, gamma=1.0)
+        self.display_settings = _Struct(display_device="sRGB")
+
+    def _renamed(self, old):
+        pass
+
+    def _removed(self):
+        pass
+
+
+class _BlendData:
+    def __init__(self):
+        self.objects = _IDCollection(Object)
+        self.meshes = _IDCollection(Mesh)
+        self.materials = _IDCollection(Material)
+        self.collections = _IDCollection(Collection)
+        self.scenes = _IDCollection(Scene)
+        self.actions = _IDCollection(Action)
+        self.filepath = ""
+        self.is_dirty = False
+
+
+class _ViewLayer:
+    """view_layer.update() has nothing to evaluate here; it only counts calls."""
+
+    def __init__(self):
+        self.update_count = 0
+
+    def update(self):
+        self.update_count += 1
+
+
+data = _BlendData()
+context = types.SimpleNamespace(scene=data.scenes.new("Scene"), view_layer=_ViewLayer(), active_object=None)
+
+
+def _add_mesh_object(name: str, vertices, faces, location, rotation, scale):
+    mesh = data.meshes.new(name)
+    mesh.from_pydata(vertices, [], faces)
+    obj = data.objects.new(name, mesh)
+    obj.location, obj.rotation_euler, obj.scale = location, rotation, scale
+    context.scene.collection.objects.link(obj)
+    context.active_object = obj
+    data.is_dirty = True
+    return {'FINISHED'}
+
+
+def _primitive_cube_add(size=2.0, location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1), **kwargs):
+    return _add_mesh_object("Cube", *_cube_geometry(size), location, rotation, scale)
+
+
+def _primitive_uv_sphere_add(segments=32, ring_count=16, radius=1.0, location=(0, 0, 0), rotation=(0, 0, 0),
+                             scale=(1, 1, 1), **kwargs):
+    return _add_mesh_object("Sphere", *_uv_sphere_geometry(radius, segments, ring_count), location, rotation, scale)
+
+
+def png(width: int, height: int) -> bytes:
+    """A flat grey RGB PNG; also used by render_worker.py."""
+    def chunk(tag, payload):
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload))
+    row = b"\x00" + b"\x80\x80\x80" * width
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+def _render(write_still=False, animation=False, **kwargs):
+    scene = context.scene
+    render = scene.render
+    seconds = float(os.environ.get("BLENDER_MCP_STANDIN_RENDER_SECONDS", "0.05"))
+    steps = 4
+    for step in range(1, steps + 1):
+        time.sleep(seconds / steps)
+        for handler in list(app.handlers.render_stats):
+            handler(f"Fra:{scene.frame_current} | Rendering | Sample {step}/{steps}")
+    if write_still:
+        width = max(1, render.resolution_x * render.resolution_percentage // 100)
+        height = max(1, render.resolution_y * render.resolution_percentage // 100)
+        filepath = path.abspath(render.filepath)
+        if render.use_file_extension and not os.path.splitext(filepath)[1]:
+            filepath += render.file_extension
+        with open(filepath, "wb") as f:
+            f.write(png(width, height))
+    return {'FINISHED'}
+
+
+def _save_as_mainfile(filepath="", compress=False, copy=False, **kwargs):
+    """Write a JSON summary of the file contents (not a real .blend); render_worker.py reads it."""
+    scene = context.scene
+    summary = {
+        "scene": {"name": scene.name, "resolution_x": scene.render.resolution_x,
+                  "resolution_y": scene.render.resolution_y,
+                  "resolution_percentage": scene.render.resolution_percentage,
+                  "frame_start": scene.frame_start, "frame_end": scene.frame_end,
+                  "frame_step": scene.frame_step},
+        "objects": data.objects.keys(),
+        "meshes": data.meshes.keys(),
+        "materials": data.materials.keys(),
+        "collections": data.collections.keys(),
+    }
+    payload = json.dumps(summary).encode()
+    with open(filepath, "wb") as f:
+        f.write(zlib.compress(payload) if compress else payload)
+    if not copy:
+        data.filepath = filepath
+        data.is_dirty = False
+    return {'FINISHED'}
+
+
+# Messages passed to ops.ed.undo_push, oldest first
+undo_steps: list[str] = []
+
+
+def _undo_push(message="Undo"):
+    undo_steps.append(message)
+    return {'FINISHED'}
+
+
+ops = types.SimpleNamespace(
+    mesh=types.SimpleNamespace(primitive_cube_add=_primitive_cube_add,
+                               primitive_uv_sphere_add=_primitive_uv_sphere_add),
+    render=types.SimpleNamespace(render=_render),
+    wm=types.SimpleNamespace(save_as_mainfile=_save_as_mainfile),
+    ed=types.SimpleNamespace(undo_push=_undo_push),
+)
+
+
+def _abspath(filepath: str, start=None, library=None) -> str:
+    if filepath.startswith("//"):
+        return os.path.join(start or os.path.dirname(data.filepath), filepath[2:])
+    return filepath
+
+
+path = types.SimpleNamespace(abspath=_abspath)
+
+app = types.SimpleNamespace(
+    version=(5, 0, 0),
+    version_string="5.0.0 (stand-in)",
+    binary_path="",
+    background=True,
+    handlers=types.SimpleNamespace(render_init=[], render_stats=[], render_post=[], render_cancel=[],
+                                   render_complete=[], depsgraph_update_post=[], save_pre=[], save_post=[]),
+)
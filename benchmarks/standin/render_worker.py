@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Stand-in for command-line Blender rendering frames, for render_animation without Blender:
+
+    BLENDER_MCP_RENDER_WORKER_CMD="python benchmarks/standin/render_worker.py"
+
+Understands the arguments render_animation passes, as Blender does:
+
+    -b/--background  <file.blend>  -S/--scene <name>  -o/--render-output <path>
+    -f/--render-frame <frames>  (or -s/--frame-start, -e/--frame-end, -j/--frame-jump, -a)
+
+Arguments run in order, like Blender's. The .blend is the JSON summary the stand-in
+bpy's save_as_mainfile writes. Frames are comma-separated numbers or 'a..b' ranges.
+For each frame it prints "Fra:<n>" lines, sleeps BLENDER_MCP_STANDIN_RENDER_SECONDS
+(default 0.05), writes a flat grey PNG named the way Blender names frames ('#' runs
+become the zero-padded frame number, otherwise four digits are appended) and prints
+"Saved: '<path>'".
+
+BLENDER_MCP_STANDIN_CRASH_FRAMES (comma-separated) makes the worker exit with an error
+the first time it reaches each listed frame for a given .blend, to exercise retries.
+BLENDER_MCP_STANDIN_LONG_LINE_FRAMES does the same with a 128 KiB line of output, longer
+than a pipe reader will take in one line, and carries on rendering.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+from bpy import png
+
+
+def parse_frames(text: str) -> list[int]:
+    frames = []
+    for part in text.split(","):
+        start, sep, end = part.partition("..")
+        frames.extend(range(int(start), int(end) + 1) if sep else [int(start)])
+    return frames
+
+
+def frame_path(output: str, frame: int) -> str:
+    if "#" in output:
+        path = re.sub(r"#+", lambda m: str(frame).zfill(len(m.group(0))), output)
+    else:
+        path = output + f"{frame:04d}"
+    return path if os.path.splitext(path)[1] else path + ".png"
+
+
+class Worker:
+    def __init__(self):
+        self.blend = None
+        self.scene = {}
+        self.output = "/tmp/"
+        self.frame_start = self.frame_end = None
+        self.frame_step = None
+        self.crash_frames = self._frames_from_env("BLENDER_MCP_STANDIN_CRASH_FRAMES")
+        self.long_line_frames = self._frames_from_env("BLENDER_MCP_STANDIN_LONG_LINE_FRAMES")
+
+    @staticmethod
+    def _frames_from_env(name: str) -> set[int]:
+        return {int(f) for f in os.environ.get(name, "").split(",") if f.strip()}
+
+    def _first_time(self, event: str, frame: int) -> bool:
+        """True the first time event happens at frame for this .blend."""
+        marker = f"{self.blend}.{event}-{frame}"
+        if os.path.exists(marker):
+            return False
+        open(marker, "w").close()
+        return True
+
+    def load(self, blend: str):
+        with open(blend, "rb") as f:
+            summary = json.load(f)
+        self.blend = blend
+        self.scene = summary.get("scene", {})
+
+    def render(self, frame: int):
+        seconds = float(os.environ.get("BLENDER_MCP_STANDIN_RENDER_SECONDS", "0.05"))
+        print(f"Fra:{frame} Mem:1.00M | Scene, ViewLayer | Rendering", flush=True)
+        if frame in self.crash_frames and self._first_time("crashed", frame):
+            print(f"Error: stand-in crash at frame {frame}", flush=True)
+            sys.exit(1)
+        if frame in self.long_line_frames and self._first_time("long-line", frame):
+            print("x" * (128 * 1024), flush=True)
+        time.sleep(seconds)
+        scale = self.scene.get("resolution_percentage", 100) / 100
+        width = max(1, int(self.scene.get("resolution_x", 1920) * scale))
+        height = max(1, int(self.scene.get("resolution_y", 1080) * scale))
+        path = frame_path(self.output, frame)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(png(width, height))
+        print(f"Saved: '{path}'", flush=True)
+
+    def run(self, argv: list[str]):
+        args = iter(argv)
+        for arg in args:
+            if arg in ("-b", "--background"):
+                continue
+            elif arg in ("-S", "--scene"):
+                name = next(args)
+                if self.scene.get("name", name) != name:
+                    raise SystemExit(f"Error: scene '{name}' not found")
+            elif arg in ("-o", "--render-output"):
+                self.output = next(args)
+            elif arg in ("-f", "--render-frame"):
+                for frame in parse_frames(next(args)):
+                    self.render(frame)
+            elif arg in ("-s", "--frame-start"):
+                self.frame_start = int(next(args))
+            elif arg in ("-e", "--frame-end"):
+                self.frame_end = int(next(args))
+            elif arg in ("-j", "--frame-jump"):
+                self.frame_step = int(next(args))
+            elif arg in ("-a", "--render-anim"):
+                start = self.scene.get("frame_start", 1) if self.frame_start is None else self.frame_start
+                end = self.scene.get("frame_end", 250) if self.frame_end is None else self.frame_end
+                step = self.scene.get("frame_step", 1) if self.frame_step is None else self.frame_step
+                for frame in range(start, end + 1, step):
+                    self.render(frame)
+            elif not arg.startswith("-"):
+                self.load(arg)
+            else:
+                raise SystemExit(f"Error: unsupported argument {arg!r}")
+
+
+if __name__ == "__main__":
+    Worker().run(sys.argv[1:])
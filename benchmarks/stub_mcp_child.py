@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Stand-in for `blender --background --python blender_mcp_server.py`.
+Prints Blender-like startup noise and JSON-RPC frames on stdout without needing Blender,
+so the wrapper can be benchmarked and tested anywhere.
+
+Modes:
+    --frames N   emit N frames and exit (stdout throughput)
+    --echo       answer every stdin line with a small frame carrying its id and size
+
+--startup-delay S sleeps before the banner, standing in for Blender's cold start.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+ID_PATTERN = re.compile(rb'"id":\s*(\d+)')
+
+BANNER = [
+    b"Blender 5.0.1 (hash 1234567890ab built 2025-11-18 00:00:00)\n",
+    b"Read prefs: \"/home/user/.config/blender/5.0/config/userpref.blend\"\n",
+    b"found bundled python: /opt/blender/5.0/python\n",
+    b"Color management: using fallback mode for management\n",
+]
+
+NOISE = b"Info: Saved session recovery to \"/tmp/quit.blend\"\n"
+
+
+def make_frame(payload_size, index):
+    """A JSON-RPC notification whose serialized size is roughly payload_size bytes."""
+    frame = {
+        "jsonrpc": "2.0",
+        "method": "notifications/message",
+        "params": {"level": "info", "data": f"{index}:" + "x" * payload_size},
+    }
+    return json.dumps(frame, separators=(",", ":")).encode() + b"\n"
+
+
+def emit(args):
+    out = sys.stdout.buffer
+    out.write(b"".join(BANNER))
+    frame = make_frame(args.frame_size, 0)
+
+    batch = []
+    for i in range(args.frames):
+        batch.append(frame)
+        if args.noise_every and (i + 1) % args.noise_every == 0:
+            batch.append(NOISE)
+        if len(batch) >= 64:
+            out.write(b"".join(batch))
+            batch = []
+    out.write(b"".join(batch))
+    out.flush()
+
+
+def echo():
+    out = sys.stdout.buffer
+    out.write(b"".join(BANNER))
+    out.flush()
+    for line in sys.stdin.buffer:
+        match = ID_PATTERN.search(line, 0, 64)
+        request_id = int(match.group(1)) if match else None
+        reply = {"jsonrpc": "2.0", "id": request_id, "result": {"bytes": len(line)}}
+        out.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+        out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=1000, help="JSON-RPC frames to emit")
+    parser.add_argument("--frame-size", type=int, default=1024, help="Approximate bytes per frame")
+    parser.add_argument("--noise-every", type=int, default=10,
+                        help="Emit one non-JSON line after every N frames (0 disables)")
+    parser.add_argument("--echo", action="store_true", help="Reply to stdin lines instead of emitting frames")
+    parser.add_argument("--startup-delay", type=float, default=0.0,
+                        help="Seconds to sleep before printing the banner, like Blender's startup")
+    args = parser.parse_args()
+    time.sleep(args.startup_delay)
+    if args.echo:
+        echo()
+    else:
+        emit(args)
+
+
+if __name__ == "__main__":
+    main()
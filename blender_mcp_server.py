@@ -8,6 +8,42 @@ A Model Context Protocol server for controlling Blender 3D software.
 # This prevents Blender's C-level output from polluting the JSON-RPC channel
 import sys
 import os
+import time
+
+
+class StartupTimer:
+    """Timestamps of the startup phases, from the top of this script to the first reply.
+
+    Phases are always recorded (a perf_counter call each); with --startup-timing or
+    BLENDER_MCP_STARTUP_TIMING=1 they are logged on stderr once the initialize
+    request has been answered. get_server_stats reports them either way.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+        self.enabled = os.environ.get("BLENDER_MCP_STARTUP_TIMING", "0") == "1"
+        self.answered = None  # threading.Event, set once threading is imported
+        self._reported = 0
+
+    def mark(self, phase: str):
+        self.phases.append((phase, time.perf_counter()))
+
+    def stats(self) -> dict:
+        """Milliseconds from the top of the script to the end of each phase."""
+        return {phase: round((at - self.started) * 1000, 1) for phase, at in self.phases}
+
+    def report(self):
+        """Print the phases not printed yet: duration, then time since the top of the script."""
+        previous = self.phases[self._reported - 1][1] if self._reported else self.started
+        for phase, at in self.phases[self._reported:]:
+            print(f"startup: {phase:<22}{(at - previous) * 1000:>8.1f} ms{(at - self.started) * 1000:>9.1f} ms",
+                  file=sys.stderr)
+            previous = at
+        self._reported = len(self.phases)
+
+
+startup = StartupTimer()
 
 # Save the original stdout file descriptor BEFORE any other code runs
 _original_stdout_fd = os.dup(sys.stdout.fileno())
@@ -22,11 +58,41 @@ os.dup2(_devnull_fd, sys.stdout.fileno())
 os.close(_devnull_fd)
 
 # Now we can import everything else
+import argparse
+import array
+import ast
 import asyncio
+import base64
+import bisect
+import concurrent.futures
+import contextlib
+import contextvars
+import ctypes
+import fnmatch
+import hashlib
+import heapq
+import hmac
+import itertools
 import json
-from typing import Any
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
 import logging
+import math
+import mmap
+import random
+import re
+import secrets
+import shlex
+import shutil
 import site
+import socket
+import struct
+import tempfile
+import threading
+
+startup.answered = threading.Event()
+startup.mark("stdlib imports")
 
 # Add user site-packages to sys.path
 # This allows Blender to find packages installed with pip install --user
@@ -44,6 +110,17 @@ for pkg_path in blender_site_packages:
 
 print(f"Using Python: {sys.executable}", file=sys.stderr)
 print(f"sys.path (first 3): {sys.path[:3]}", file=sys.stderr)
+startup.mark("path setup")
+
+# The MCP stack is the bulk of the import time and is needed for the handshake, so it
+# goes first; everything only tools need is imported later (see _finish_startup)
+import anyio
+from mcp.server import Server
+from mcp.shared.message import SessionMessage
+from mcp.types import (JSONRPCError, JSONRPCMessage, JSONRPCRequest, JSONRPCResponse, Tool, TextContent,
+                       ImageContent)
+import mcp.server.stdio
+startup.mark("mcp import")
 
 # Import bpy (Blender Python API)
 try:
@@ -54,6 +131,13 @@ except ImportError:
     BLENDER_AVAILABLE = False
     print("Warning: bpy module not available. This script must be run from within Blender.", file=sys.stderr)
 
+# mathutils ships with Blender; used for exact ray hits when available
+try:
+    import mathutils
+except ImportError:
+    mathutils = None
+startup.mark("bpy import")
+
 # Now restore stdout for MCP JSON-RPC communication
 os.dup2(_original_stdout_fd, sys.stdout.fileno())
 os.close(_original_stdout_fd)
@@ -62,9 +146,9 @@ os.close(_original_stdout_fd)
 sys.stdout = os.fdopen(sys.stdout.fileno(), 'w', buffering=1)
 sys.stdout.flush()
 
-from mcp.server import Server
-from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
-import mcp.server.stdio
+# NumPy is bundled with Blender; fall back to the array module when it is missing.
+# It is imported by _finish_startup() on the bpy thread, after the handshake.
+np = None
 
 # Configure logging to stderr (not stdout, as MCP uses stdout for JSON-RPC)
 logging.basicConfig(
@@ -74,402 +158,6111 @@ logging.basicConfig(
 )
 logger = logging.getLogger("blender-mcp")
 
-# Suppress Blender's internal logging to stdout
-if BLENDER_AVAILABLE:
-    # Redirect Blender's logging to stderr
-    import logging as blender_logging
-    for handler in blender_logging.root.handlers[:]:
-        blender_logging.root.removeHandler(handler)
+# Longest the bpy thread waits for the handshake before running _finish_startup anyway
+STARTUP_DEFER_SECONDS = 2.0
+
+
+def _finish_startup(wait: float = STARTUP_DEFER_SECONDS):
+    """Setup that tools need but the MCP handshake does not.
+
+    Runs on the bpy thread before it takes any work. It waits up to `wait` seconds for the
+    first reply, so that these imports do not compete with the handshake for the GIL.
+    Nothing touches np before this: every tool that uses it runs on the bpy thread.
+    """
+    global np
+    startup.answered.wait(wait)
+    try:
+        import numpy
+        np = numpy
+    except ImportError:
+        pass
+
+    # Suppress Blender's internal logging to stdout
+    if BLENDER_AVAILABLE:
+        # Redirect Blender's logging to stderr
+        import logging as blender_logging
+        for handler in blender_logging.root.handlers[:]:
+            blender_logging.root.removeHandler(handler)
+
+        stderr_handler = blender_logging.StreamHandler(sys.stderr)
+        stderr_handler.setFormatter(blender_logging.Formatter('[Blender] %(levelname)s: %(message)s'))
+        blender_logging.root.addHandler(stderr_handler)
+    startup.mark("deferred setup")
+    if startup.enabled:
+        startup.report()
 
-    stderr_handler = blender_logging.StreamHandler(sys.stderr)
-    stderr_handler.setFormatter(blender_logging.Formatter('[Blender] %(levelname)s: %(message)s'))
-    blender_logging.root.addHandler(stderr_handler)
 
 # Initialize MCP server
 app = Server("blender-mcp")
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available Blender tools."""
-    return [
-        Tool(
-            name="create_cube",
-            description="Create a cube in the Blender scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "location": {
-                        "type": "array",
-                        "items": {"type": "number"},
-                        "description": "Location [x, y, z] for the cube",
-                        "default": [0, 0, 0]
-                    },
-                    "scale": {
-                        "type": "array",
-                        "items": {"type": "number"},
-                        "description": "Scale [x, y, z] for the cube",
-                        "default": [1, 1, 1]
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "Name for the cube object"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="create_sphere",
-            description="Create a UV sphere in the Blender scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "location": {
-                        "type": "array",
-                        "items": {"type": "number"},
-                        "description": "Location [x, y, z] for the sphere",
-                        "default": [0, 0, 0]
-                    },
-                    "radius": {
-                        "type": "number",
-                        "description": "Radius of the sphere",
-                        "default": 1.0
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "Name for the sphere object"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="delete_object",
-            description="Delete an object from the scene by name",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the object to delete"
-                    }
-                },
-                "required": ["name"]
-            }
-        ),
-        Tool(
-            name="list_objects",
-            description="List all objects in the current scene",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="move_object",
-            description="Move an object to a new location",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the object to move"
-                    },
-                    "location": {
-                        "type": "array",
-                        "items": {"type": "number"},
-                        "description": "New location [x, y, z]"
-                    }
-                },
-                "required": ["name", "location"]
-            }
-        ),
-        Tool(
-            name="set_material",
-            description="Set or create a material for an object",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "object_name": {
-                        "type": "string",
-                        "description": "Name of the object"
-                    },
-                    "material_name": {
-                        "type": "string",
-                        "description": "Name for the material"
-                    },
-                    "color": {
-                        "type": "array",
-                        "items": {"type": "number"},
-                        "description": "RGBA color [r, g, b, a] values between 0 and 1",
-                        "default": [0.8, 0.8, 0.8, 1.0]
-                    }
-                },
-                "required": ["object_name", "material_name"]
-            }
-        ),
-        Tool(
-            name="render_scene",
-            description="Render the current scene to an image file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filepath": {
-                        "type": "string",
-                        "description": "Output file path for the render"
-                    },
-                    "resolution_x": {
-                        "type": "integer",
-                        "description": "Render resolution width",
-                        "default": 1920
-                    },
-                    "resolution_y": {
-                        "type": "integer",
-                        "description": "Render resolution height",
-                        "default": 1080
-                    }
-                },
-                "required": ["filepath"]
-            }
-        ),
-        Tool(
-            name="save_blend_file",
-            description="Save the current Blender file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filepath": {
-                        "type": "string",
-                        "description": "Path where to save the .blend file"
-                    }
-                },
-                "required": ["filepath"]
-            }
-        ),
-        Tool(
-            name="execute_python",
-            description="Execute arbitrary Python code in Blender's context",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "Python code to execute"
-                    }
-                },
-                "required": ["code"]
-            }
-        )
-    ]
+# Primitive types understood by create_objects_batch
+BATCH_PRIMITIVE_TYPES = ("cube", "sphere", "plane", "cylinder", "cone", "empty")
 
+# Shared mesh datablocks for batch-created primitives, keyed by (type, size params).
+# We store mesh names rather than ID references, since IDs become invalid once removed.
+_shared_primitive_meshes: dict[tuple, str] = {}
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls for Blender operations."""
 
-    if not BLENDER_AVAILABLE:
-        return [TextContent(
-            type="text",
-            text="Error: Blender Python API (bpy) is not available. This server must be run from within Blender."
-        )]
+def _primitive_geometry(kind: str, radius: float, depth: float, segments: int, rings: int):
+    """Build (vertices, faces) for a primitive, matching the bpy.ops defaults."""
+    if kind == "cube":
+        r = radius
+        verts = [(x, y, z) for x in (-r, r) for y in (-r, r) for z in (-r, r)]
+        faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+        return verts, faces
+
+    if kind == "plane":
+        r = radius
+        return [(-r, -r, 0), (r, -r, 0), (r, r, 0), (-r, r, 0)], [(0, 1, 2, 3)]
+
+    if kind == "sphere":
+        verts = [(0.0, 0.0, radius)]
+        for ring in range(1, rings):
+            phi = math.pi * ring / rings
+            z = radius * math.cos(phi)
+            ring_radius = radius * math.sin(phi)
+            for seg in range(segments):
+                theta = 2.0 * math.pi * seg / segments
+                verts.append((ring_radius * math.cos(theta), ring_radius * math.sin(theta), z))
+        verts.append((0.0, 0.0, -radius))
+        bottom = len(verts) - 1
+
+        faces = []
+        for seg in range(segments):
+            faces.append((0, 1 + seg, 1 + (seg + 1) % segments))
+        for ring in range(rings - 2):
+            start = 1 + ring * segments
+            for seg in range(segments):
+                nxt = (seg + 1) % segments
+                faces.append((start + seg, start + segments + seg, start + segments + nxt, start + nxt))
+        last = 1 + (rings - 2) * segments
+        for seg in range(segments):
+            faces.append((last + (seg + 1) % segments, last + seg, bottom))
+        return verts, faces
+
+    if kind in ("cylinder", "cone"):
+        top_radius = radius if kind == "cylinder" else 0.0
+        half = depth / 2.0
+        verts = []
+        for seg in range(segments):
+            theta = 2.0 * math.pi * seg / segments
+            verts.append((radius * math.cos(theta), radius * math.sin(theta), -half))
+        if top_radius > 0.0:
+            for seg in range(segments):
+                theta = 2.0 * math.pi * seg / segments
+                verts.append((top_radius * math.cos(theta), top_radius * math.sin(theta), half))
+            faces = [(seg, (seg + 1) % segments, segments + (seg + 1) % segments, segments + seg)
+                     for seg in range(segments)]
+            faces.append(tuple(range(segments - 1, -1, -1)))
+            faces.append(tuple(range(segments, 2 * segments)))
+        else:
+            verts.append((0.0, 0.0, half))
+            apex = len(verts) - 1
+            faces = [(seg, (seg + 1) % segments, apex) for seg in range(segments)]
+            faces.append(tuple(range(segments - 1, -1, -1)))
+        return verts, faces
+
+    raise ValueError(f"Unsupported primitive type '{kind}'")
+
+
+def _get_shared_primitive_mesh(spec: dict):
+    """Return the shared mesh datablock for a primitive spec, creating it on first use."""
+    kind = spec.get("type", "cube")
+    radius = float(spec.get("radius", spec.get("size", 2.0) / 2.0))
+    depth = float(spec.get("depth", 2.0))
+    segments = int(spec.get("segments", 32))
+    rings = int(spec.get("rings", 16))
+
+    if kind in ("cube", "plane"):
+        key = (kind, radius)
+    elif kind == "sphere":
+        key = (kind, radius, segments, rings)
+    else:
+        key = (kind, radius, depth, segments)
+
+    mesh_name = _shared_primitive_meshes.get(key)
+    mesh = bpy.data.meshes.get(mesh_name) if mesh_name else None
+    if mesh is None:
+        verts, faces = _primitive_geometry(kind, radius, depth, segments, rings)
+        mesh = bpy.data.meshes.new(f"MCP_{kind.capitalize()}")
+        mesh.from_pydata(verts, [], faces)
+        mesh.update()
+        _shared_primitive_meshes[key] = mesh.name
+    return mesh
+
+
+def _principled_node(mat):
+    """The material's Principled BSDF node, or None."""
+    if not mat.use_nodes or mat.node_tree is None:
+        return None
+    return next((node for node in mat.node_tree.nodes if getattr(node, "type", None) == 'BSDF_PRINCIPLED'), None)
+
+
+def _set_principled_inputs(mat, inputs: dict):
+    """Set Principled BSDF inputs by name, e.g. {"Roughness": 0.2}."""
+    principled = _principled_node(mat)
+    if principled is None:
+        return
+    for input_name, value in inputs.items():
+        socket = principled.inputs.get(input_name)
+        if socket is None:
+            raise ValueError(f"Principled BSDF has no input '{input_name}'")
+        socket.default_value = value
+
+
+def _get_or_create_material(mat_name: str, color=None, inputs: dict | None = None):
+    """Look up a material by name, creating a node-based one if missing, and set its color."""
+    mat = bpy.data.materials.get(mat_name)
+    if mat is None:
+        mat = bpy.data.materials.new(name=mat_name)
+        mat.use_nodes = True
+
+    if color is not None and mat.use_nodes:
+        principled = mat.node_tree.nodes.get('Principled BSDF')
+        if principled:
+            principled.inputs['Base Color'].default_value = color
+    if inputs:
+        _set_principled_inputs(mat, inputs)
+
+    return mat
+
 
+def _socket_value(value):
+    """A socket value as a hashable, float32-rounded key part."""
     try:
-        if name == "create_cube":
-            location = arguments.get("location", [0, 0, 0])
-            scale = arguments.get("scale", [1, 1, 1])
-            obj_name = arguments.get("name")
+        return tuple(round(v, 5) for v in array.array('f', value))
+    except TypeError:
+        if isinstance(value, float):
+            return round(array.array('f', [value])[0], 5)
+        return value
 
-            bpy.ops.mesh.primitive_cube_add(location=location)
-            obj = bpy.context.active_object
-            obj.scale = scale
 
-            if obj_name:
-                obj.name = obj_name
+class MaterialLibrary:
+    """Hash index of plain Principled BSDF materials by their input values.
 
-            return [TextContent(
-                type="text",
-                text=f"Created cube '{obj.name}' at location {location} with scale {scale}"
-            )]
+    A material is plain when its node tree is a single Principled BSDF with nothing
+    linked into it (plus the output it feeds), which is what set_material creates. Its
+    key is the value of every Principled input, so a requested parameter set (the
+    defaults overlaid with the requested inputs) finds an identical existing material
+    however it was named or created. execute_python calls invalidate() and the index is
+    rebuilt from bpy.data.materials on next use.
+    """
 
-        elif name == "create_sphere":
-            location = arguments.get("location", [0, 0, 0])
-            radius = arguments.get("radius", 1.0)
-            obj_name = arguments.get("name")
+    def __init__(self):
+        self.dirty = True
+        self.created = 0
+        self.reused = 0
+        self._index: dict[tuple, str] = {}
+        self._defaults: dict[str, Any] | None = None
 
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, location=location)
-            obj = bpy.context.active_object
+    def invalidate(self):
+        self.dirty = True
 
-            if obj_name:
-                obj.name = obj_name
+    @staticmethod
+    def key(mat) -> tuple | None:
+        """Key of a plain material, or None if it has any other nodes or links."""
+        principled = _principled_node(mat)
+        if principled is None:
+            return None
+        nodes = mat.node_tree.nodes
+        if len(nodes) > 2 or any(getattr(node, "type", None) not in ('BSDF_PRINCIPLED', 'OUTPUT_MATERIAL')
+                                 for node in nodes):
+            return None
+        if any(getattr(socket, "is_linked", False) for socket in principled.inputs):
+            return None
+        return tuple((socket.name, _socket_value(socket.default_value))
+                     for socket in principled.inputs if hasattr(socket, "default_value"))
 
-            return [TextContent(
-                type="text",
-                text=f"Created sphere '{obj.name}' at location {location} with radius {radius}"
-            )]
+    def _input_defaults(self) -> dict[str, Any]:
+        """Principled input defaults of a new material, read once from a throwaway one."""
+        if self._defaults is None:
+            probe = bpy.data.materials.new(name="blender_mcp_defaults")
+            try:
+                probe.use_nodes = True
+                self._defaults = dict(self.key(probe) or ())
+            finally:
+                bpy.data.materials.remove(probe)
+        return self._defaults
 
-        elif name == "delete_object":
-            obj_name = arguments["name"]
-            obj = bpy.data.objects.get(obj_name)
+    def request_key(self, color=None, inputs: dict | None = None) -> tuple:
+        values = dict(self._input_defaults())
+        requested = dict(inputs or {})
+        if color is not None:
+            requested["Base Color"] = color
+        for input_name, value in requested.items():
+            if input_name not in values:
+                raise ValueError(f"Principled BSDF has no input '{input_name}'")
+            values[input_name] = _socket_value(value)
+        return tuple(values.items())
 
-            if obj is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: Object '{obj_name}' not found"
-                )]
+    def _rebuild(self):
+        self._index = {}
+        for mat in bpy.data.materials:
+            key = self.key(mat)
+            if key is not None:
+                self._index.setdefault(key, mat.name)
+        self.dirty = False
 
-            bpy.data.objects.remove(obj, do_unlink=True)
-            return [TextContent(
-                type="text",
-                text=f"Deleted object '{obj_name}'"
-            )]
+    def acquire(self, mat_name: str, color=None, inputs: dict | None = None):
+        """Return (material, reused): an identical existing material, or a new one named mat_name."""
+        if self.dirty:
+            self._rebuild()
+        key = self.request_key(color, inputs)
+        existing = bpy.data.materials.get(self._index.get(key, ""))
+        if existing is not None and self.key(existing) == key:
+            self.reused += 1
+            return existing, True
 
-        elif name == "list_objects":
-            objects = [obj.name for obj in bpy.data.objects]
-            return [TextContent(
-                type="text",
-                text=f"Objects in scene:\n" + "\n".join(f"- {obj}" for obj in objects)
-            )]
+        mat = bpy.data.materials.new(name=mat_name)
+        mat.use_nodes = True
+        if color is not None:
+            _set_principled_inputs(mat, {"Base Color": color})
+        if inputs:
+            _set_principled_inputs(mat, inputs)
+        self._index[self.key(mat) or key] = mat.name
+        self.created += 1
+        return mat, False
 
-        elif name == "move_object":
-            obj_name = arguments["name"]
-            location = arguments["location"]
+    def stats(self) -> dict:
+        return {
+            "indexed": len(self._index),
+            "created": self.created,
+            "reused": self.reused,
+        }
 
-            obj = bpy.data.objects.get(obj_name)
-            if obj is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: Object '{obj_name}' not found"
-                )]
 
-            obj.location = location
-            return [TextContent(
-                type="text",
-                text=f"Moved object '{obj_name}' to location {location}"
-            )]
+material_library = MaterialLibrary()
 
-        elif name == "set_material":
-            obj_name = arguments["object_name"]
-            mat_name = arguments["material_name"]
-            color = arguments.get("color", [0.8, 0.8, 0.8, 1.0])
+# Whether set_material and create_objects_batch share identical materials when a call does
+# not say; off unless BLENDER_MCP_MATERIAL_DEDUP=1
+MATERIAL_DEDUP_DEFAULT = os.environ.get("BLENDER_MCP_MATERIAL_DEDUP") == "1"
 
-            obj = bpy.data.objects.get(obj_name)
-            if obj is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: Object '{obj_name}' not found"
-                )]
 
-            # Create or get material
-            mat = bpy.data.materials.get(mat_name)
-            if mat is None:
-                mat = bpy.data.materials.new(name=mat_name)
-                mat.use_nodes = True
-
-            # Set color
-            if mat.use_nodes:
-                principled = mat.node_tree.nodes.get('Principled BSDF')
-                if principled:
-                    principled.inputs['Base Color'].default_value = color
-
-            # Assign material to object
-            if obj.data.materials:
-                obj.data.materials[0] = mat
+def _assign_material(obj, mat):
+    """Put mat in obj's first material slot, honouring object-linked slots."""
+    if not obj.material_slots:
+        obj.data.materials.append(None)
+    slot = obj.material_slots[0]
+    if slot.link != 'OBJECT' and obj.data.users > 1:
+        # Shared mesh data: a data-level material would change every object using the mesh
+        slot.link = 'OBJECT'
+    slot.material = mat
+
+
+def _create_batch_object(spec: dict, collection):
+    """Create one object from a create_objects_batch spec without going through bpy.ops."""
+    kind = spec.get("type", "cube")
+    if kind not in BATCH_PRIMITIVE_TYPES:
+        raise ValueError(f"Unsupported type '{kind}' (expected one of {', '.join(BATCH_PRIMITIVE_TYPES)})")
+
+    data = None if kind == "empty" else _get_shared_primitive_mesh(spec)
+    obj_name = spec.get("name") or kind.capitalize()
+
+    obj = bpy.data.objects.new(obj_name, data)
+    try:
+        obj.location = spec.get("location", [0, 0, 0])
+        obj.rotation_euler = spec.get("rotation", [0, 0, 0])
+        obj.scale = spec.get("scale", [1, 1, 1])
+
+        material = spec.get("material")
+        if material:
+            if data is None:
+                raise ValueError("Empties cannot have materials")
+            if spec.get("dedup_material", MATERIAL_DEDUP_DEFAULT):
+                mat, _ = material_library.acquire(material, spec.get("color"), spec.get("inputs"))
             else:
-                obj.data.materials.append(mat)
+                mat = _get_or_create_material(material, spec.get("color"), spec.get("inputs"))
+            # The mesh is shared, so the material goes on an object-level slot
+            if not data.materials:
+                data.materials.append(None)
+            slot = obj.material_slots[0]
+            slot.link = 'OBJECT'
+            slot.material = mat
 
-            return [TextContent(
-                type="text",
-                text=f"Set material '{mat_name}' with color {color[:3]} on object '{obj_name}'"
-            )]
+        collection.objects.link(obj)
+    except Exception:
+        bpy.data.objects.remove(obj, do_unlink=True)
+        raise
 
-        elif name == "render_scene":
-            filepath = arguments["filepath"]
-            res_x = arguments.get("resolution_x", 1920)
-            res_y = arguments.get("resolution_y", 1080)
+    return obj
 
-            scene = bpy.context.scene
-            scene.render.resolution_x = res_x
-            scene.render.resolution_y = res_y
-            scene.render.filepath = filepath
 
-            bpy.ops.render.render(write_still=True)
+# Tool argument names mapped to the bpy.types.Object vector properties they cover
+TRANSFORM_ATTRS = {
+    "location": "location",
+    "rotation": "rotation_euler",
+    "scale": "scale",
+}
 
-            return [TextContent(
-                type="text",
-                text=f"Rendered scene to {filepath} at {res_x}x{res_y}"
-            )]
 
-        elif name == "save_blend_file":
-            filepath = arguments["filepath"]
-            bpy.ops.wm.save_as_mainfile(filepath=filepath)
+def _resolve_transform_source(collection_name: str | None):
+    """Return the bpy_prop_collection whose objects bulk transform tools operate on."""
+    if collection_name:
+        collection = bpy.data.collections.get(collection_name)
+        if collection is None:
+            raise ValueError(f"Collection '{collection_name}' not found")
+        return collection.objects
+    return bpy.context.scene.objects
 
-            return [TextContent(
-                type="text",
-                text=f"Saved Blender file to {filepath}"
-            )]
 
-        elif name == "execute_python":
-            code = arguments["code"]
+def _select_transform_indices(source, names: list[str] | None, pattern: str | None):
+    """Pick objects out of source by explicit names (keeping their order) or a name glob.
 
-            # Create a namespace with bpy available
-            namespace = {"bpy": bpy}
+    Returns (selected_names, indices, missing_names). indices is None when every
+    object in source is selected in source order.
+    """
+    all_names = source.keys()
 
-            # Execute the code
-            exec(code, namespace)
+    if names is not None:
+        positions = {obj_name: i for i, obj_name in enumerate(all_names)}
+        selected, indices, missing = [], [], []
+        for obj_name in names:
+            i = positions.get(obj_name)
+            if i is None:
+                missing.append(obj_name)
+            else:
+                selected.append(obj_name)
+                indices.append(i)
+        return selected, indices, missing
 
-            # Get any output
-            result = namespace.get("result", "Code executed successfully")
+    if pattern:
+        indices = [i for i, obj_name in enumerate(all_names) if fnmatch.fnmatchcase(obj_name, pattern)]
+        return [all_names[i] for i in indices], indices, []
 
-            return [TextContent(
-                type="text",
-                text=str(result)
-            )]
+    return list(all_names), None, []
+
+
+def _bulk_get_vectors(source, attr: str, count: int, width: int = 3):
+    """Read a width-component property of every object in source as one flat float32 buffer."""
+    if np is not None:
+        buffer = np.empty(count * width, dtype=np.float32)
+    else:
+        buffer = array.array('f', bytes(count * width * 4))
+    source.foreach_get(attr, buffer)
+    return buffer
 
+
+def _take_vectors(buffer, indices, precision: int) -> list[float]:
+    """Return the flat [x, y, z, ...] values for the selected rows of a bulk buffer."""
+    if np is not None:
+        rows = buffer.reshape(-1, 3)
+        if indices is not None:
+            rows = rows[indices]
+        return rows.astype(np.float64).round(precision).ravel().tolist()
+
+    if indices is None:
+        return [round(v, precision) for v in buffer]
+    return [round(buffer[i * 3 + k], precision) for i in indices for k in range(3)]
+
+
+def _put_vectors(buffer, indices, values: list[float]):
+    """Write flat [x, y, z, ...] values (or one broadcast triple) into the selected rows."""
+    if np is not None:
+        rows = buffer.reshape(-1, 3)
+        new_rows = np.asarray(values, dtype=np.float32).reshape(-1, 3)
+        if indices is None:
+            rows[:] = new_rows
         else:
-            return [TextContent(
-                type="text",
-                text=f"Error: Unknown tool '{name}'"
-            )]
+            rows[indices] = new_rows
+        return
 
-    except Exception as e:
-        logger.error(f"Error executing {name}: {e}", exc_info=True)
-        return [TextContent(
-            type="text",
-            text=f"Error executing {name}: {str(e)}"
-        )]
+    if indices is None:
+        indices = range(len(buffer) // 3)
+    broadcast = len(values) == 3
+    for row, i in enumerate(indices):
+        offset = 0 if broadcast else row * 3
+        buffer[i * 3:i * 3 + 3] = array.array('f', values[offset:offset + 3])
 
 
-async def main():
-    """Main entry point for the server."""
-    # Ensure stdout is clean for MCP JSON-RPC communication
-    sys.stdout.flush()
-    sys.stderr.flush()
+# Element types accepted for create_mesh buffers, with their struct/array format
+BUFFER_DTYPES = {
+    "float32": "f", "float64": "d",
+    "int32": "i", "uint32": "I", "int64": "q", "uint16": "H", "uint8": "B",
+}
 
-    logger.info("Starting Blender MCP Server...")
+# .npy descr strings (little-endian) for BUFFER_DTYPES
+_NPY_DESCR = {
+    "<f4": "float32", "<f8": "float64", "<i4": "int32", "<u4": "uint32",
+    "<i8": "int64", "<u2": "uint16", "|u1": "uint8",
+}
 
-    if not BLENDER_AVAILABLE:
-        logger.warning("Blender Python API not available - limited functionality")
 
-    # Run the MCP server
-    try:
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await app.run(
-                read_stream,
-                write_stream,
-                app.create_initialization_options()
+def _read_npy_header(data) -> tuple[str, int]:
+    """(dtype name, data offset) of a .npy file, for reading it without NumPy."""
+    if data[:6] != b"\x93NUMPY":
+        raise ValueError("not a .npy file")
+    if data[6] == 1:
+        (header_len,) = struct.unpack("<H", data[8:10])
+        start = 10
+    else:
+        (header_len,) = struct.unpack("<I", data[8:12])
+        start = 12
+    header = ast.literal_eval(bytes(data[start:start + header_len]).decode("latin1"))
+    if header["fortran_order"] and len(header["shape"]) > 1:
+        raise ValueError(".npy arrays in Fortran order are not supported")
+    dtype = _NPY_DESCR.get(header["descr"])
+    if dtype is None:
+        raise ValueError(f"unsupported .npy dtype {header['descr']}")
+    return dtype, start + header_len
+
+
+def _load_buffer(spec: dict, default_dtype: str):
+    """Open a create_mesh buffer: base64 bytes, or a .npy or raw file that is memory-mapped.
+
+    Returns a flat NumPy array over the bytes (a typed memoryview when NumPy is missing);
+    file contents are paged in by the OS as foreach_set reads them, never copied into
+    Python objects.
+    """
+    dtype = spec.get("dtype", default_dtype)
+    if dtype not in BUFFER_DTYPES:
+        raise ValueError(f"unsupported dtype '{dtype}' (expected one of {', '.join(BUFFER_DTYPES)})")
+
+    if "base64" in spec:
+        data = base64.b64decode(spec["base64"], validate=True)
+        offset = 0
+    elif "path" in spec:
+        path = spec["path"]
+        if path.endswith(".npy") and np is not None:
+            return np.load(path, mmap_mode="r").reshape(-1)
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = spec.get("offset", 0)
+        if path.endswith(".npy"):
+            dtype, offset = _read_npy_header(data)
+    else:
+        raise ValueError("a buffer needs 'base64' or 'path'")
+
+    fmt = BUFFER_DTYPES[dtype]
+    if offset < 0 or offset > len(data):
+        raise ValueError(f"offset {offset} is outside the buffer's {len(data)} bytes")
+    count, extra = divmod(len(data) - offset, struct.calcsize(fmt))
+    if extra:
+        raise ValueError(f"buffer has {len(data) - offset} bytes, not a whole number of {dtype} values")
+    if np is not None:
+        return np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+    return memoryview(data)[offset:offset + count * struct.calcsize(fmt)].cast(fmt)
+
+
+def _as_format(buffer, fmt: str):
+    """buffer with element format fmt, converting (copying) only when the type differs."""
+    if np is not None:
+        return np.ascontiguousarray(buffer, dtype=np.dtype(fmt))
+    if buffer.format != fmt:
+        raise ValueError(f"buffer is '{buffer.format}' but '{fmt}' is needed; converting needs NumPy")
+    return buffer
+
+
+# Fields list_objects can return per object; "name" is always included
+OBJECT_FIELDS = ("name", "type", "collections", "parent", "data", "visible",
+                 "location", "rotation", "scale", "dimensions")
+
+
+def _object_fields(obj, fields, precision: int = 4) -> dict:
+    info = {"name": obj.name}
+    for field_name in fields:
+        if field_name == "type":
+            info["type"] = obj.type
+        elif field_name == "collections":
+            info["collections"] = [collection.name for collection in obj.users_collection]
+        elif field_name == "parent":
+            info["parent"] = obj.parent.name if obj.parent else None
+        elif field_name == "data":
+            info["data"] = obj.data.name if obj.data else None
+        elif field_name == "visible":
+            info["visible"] = obj.visible_get()
+        elif field_name in TRANSFORM_ATTRS or field_name == "dimensions":
+            value = getattr(obj, TRANSFORM_ATTRS.get(field_name, field_name))
+            info[field_name] = [round(v, precision) for v in value]
+    return info
+
+
+class SceneRevisions:
+    """Revision counter for the objects of one scene, driving list_objects' change feed.
+
+    scan() compares a cheap signature of every object (type, data, parent, collections,
+    visibility and world matrix) with the previous scan; when anything was added, changed
+    or removed the revision goes up and those objects are stamped with it. Removed objects
+    leave a tombstone. Only the newest max_tombstones are kept, and a client whose last
+    sync predates the oldest dropped one has to resync in full.
+    """
+
+    def __init__(self, max_tombstones: int = 10000):
+        self.revision = 0
+        self.max_tombstones = max_tombstones
+        # name -> [signature, revision added, revision last modified]
+        self._objects: dict[str, list] = {}
+        # name -> revision removed, oldest first
+        self._tombstones: OrderedDict[str, int] = OrderedDict()
+        # Changes at or before this revision are no longer fully known
+        self._floor = 0
+
+    def scan(self, scene) -> int:
+        source = scene.objects
+        count = len(source)
+        matrices = memoryview(_bulk_get_vectors(source, "matrix_world", count, width=16)).cast("B")
+        seen = set()
+        changes = []
+        for i, obj in enumerate(source):
+            signature = (
+                obj.type,
+                obj.data.name if obj.data else None,
+                obj.parent.name if obj.parent else None,
+                tuple(collection.name for collection in obj.users_collection),
+                obj.visible_get(),
+                bytes(matrices[i * 64:(i + 1) * 64]),
             )
-    except Exception as e:
-        logger.error(f"MCP server error: {e}", exc_info=True)
-        raise
+            seen.add(obj.name)
+            known = self._objects.get(obj.name)
+            if known is None:
+                changes.append((obj.name, signature, True))
+            elif known[0] != signature:
+                changes.append((obj.name, signature, False))
+        removed = [name for name in self._objects if name not in seen]
 
+        if not changes and not removed:
+            return self.revision
 
-if __name__ == "__main__":
-    # Final check: ensure no buffered output in stdout
-    sys.stdout.flush()
+        self.revision += 1
+        for name, signature, added in changes:
+            if added:
+                self._objects[name] = [signature, self.revision, self.revision]
+                self._tombstones.pop(name, None)
+            else:
+                self._objects[name][0] = signature
+                self._objects[name][2] = self.revision
+        for name in removed:
+            del self._objects[name]
+            self._tombstones.pop(name, None)
+            self._tombstones[name] = self.revision
+        while len(self._tombstones) > self.max_tombstones:
+            _, dropped = self._tombstones.popitem(last=False)
+            self._floor = max(self._floor, dropped)
+        return self.revision
 
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        logger.info("Shutting down Blender MCP Server...")
-    except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
-        sys.exit(1)
+    def changes_since(self, revision: int) -> tuple[list[str], list[str], list[str]] | None:
+        """(added, modified, removed) names after revision, or None if a full resync is needed."""
+        if revision < self._floor or revision > self.revision:
+            return None
+        added, modified = [], []
+        for name, (_, added_at, modified_at) in self._objects.items():
+            if added_at > revision:
+                added.append(name)
+            elif modified_at > revision:
+                modified.append(name)
+        removed = [name for name, removed_at in self._tombstones.items() if removed_at > revision]
+        return added, modified, removed
+
+
+# One tracker per scene, by scene name
+scene_revisions: dict[str, SceneRevisions] = {}
+
+
+def _world_bounds(obj) -> tuple[list[float], list[float]]:
+    """Axis-aligned world-space (min, max) of obj's bound_box corners."""
+    matrix = [tuple(row) for row in obj.matrix_world][:3]
+    mins = [math.inf] * 3
+    maxs = [-math.inf] * 3
+    for x, y, z in obj.bound_box:
+        for axis, row in enumerate(matrix):
+            value = row[0] * x + row[1] * y + row[2] * z + row[3]
+            if value < mins[axis]:
+                mins[axis] = value
+            if value > maxs[axis]:
+                maxs[axis] = value
+    return mins, maxs
+
+
+class SpatialIndex:
+    """World-space bounding boxes of the current scene's objects, for spatial queries.
+
+    Boxes are bucketed in a uniform grid (cell size taken from the typical object size
+    at rebuild time), so nearest, radius, box and ray queries only look at the cells
+    around the query instead of every object. Objects spanning too many cells are kept
+    in a short list that every query checks. Boxes are also kept in (N, 3) NumPy arrays,
+    used to scan everything at once when a query covers a large part of the scene.
+
+    The server's create, move and delete tools update single objects in place. Anything
+    that can change the scene behind their back, such as execute_python, calls
+    invalidate() and the next query rebuilds the index from scratch.
+    """
+
+    # An object covering more cells than this goes in the always-checked list
+    MAX_OBJECT_CELLS = 64
+    # A query covering more cells than this scans every box instead
+    MAX_QUERY_CELLS = 4096
+
+    def __init__(self):
+        self.scene_name = None
+        self.dirty = True
+        self.rebuilds = 0
+        self.updates = 0
+        self._rows: dict[str, int] = {}
+        self._names: list[str | None] = []
+        self._free: list[int] = []
+        self._mins = self._maxs = self._active = None
+        self._cell_size = 1.0
+        self._cells: dict[tuple[int, int, int], set[int]] = {}
+        self._row_cells: dict[int, tuple | None] = {}
+        self._large: set[int] = set()
+        # Range of cell coordinates ever used, (lo, hi)
+        self._extent: tuple[list[int], list[int]] | None = None
+        self._allocate(0)
+
+    def _allocate(self, capacity: int):
+        if np is not None:
+            mins = np.full((capacity, 3), np.inf)
+            maxs = np.full((capacity, 3), -np.inf)
+            active = np.zeros(capacity, dtype=bool)
+            if self._mins is not None:
+                used = len(self._names)
+                mins[:used], maxs[:used], active[:used] = self._mins[:used], self._maxs[:used], self._active[:used]
+        else:
+            grow = capacity - (len(self._mins) if self._mins is not None else 0)
+            mins = (self._mins or []) + [[math.inf] * 3 for _ in range(grow)]
+            maxs = (self._maxs or []) + [[-math.inf] * 3 for _ in range(grow)]
+            active = (self._active or []) + [False] * grow
+        self._mins, self._maxs, self._active = mins, maxs, active
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def invalidate(self):
+        self.dirty = True
+
+    def ensure(self, scene):
+        """Rebuild if invalidated or if the scene changed."""
+        if self.dirty or self.scene_name != scene.name:
+            self.rebuild(scene)
+
+    def rebuild(self, scene):
+        objects = list(scene.objects)
+        self._load([obj.name for obj in objects], [_world_bounds(obj) for obj in objects])
+        self.scene_name = scene.name
+        self.dirty = False
+        self.rebuilds += 1
+
+    def _load(self, names: list[str], bounds: list[tuple[list[float], list[float]]]):
+        self._rows, self._names, self._free = {}, [], []
+        self._mins = self._maxs = self._active = None
+        self._allocate(max(64, len(names)))
+        self._cells, self._row_cells, self._large, self._extent = {}, {}, set(), None
+
+        # Cells about twice the median object size keep most objects in at most 8 cells;
+        # in sparse scenes, cells holding about one object each keep nearest queries short
+        finite = [(lo, hi) for lo, hi in bounds if all(math.isfinite(v) for v in (*lo, *hi))]
+        cell_size = 1.0
+        if finite:
+            sizes = sorted(max(hi[k] - lo[k] for k in range(3)) for lo, hi in finite)
+            spans = [max(hi[k] for _, hi in finite) - min(lo[k] for lo, _ in finite) for k in range(3)]
+            volume = math.prod(max(span, 1e-3) for span in spans)
+            cell_size = max(2.0 * sizes[len(sizes) // 2], (volume / len(finite)) ** (1 / 3))
+        self._cell_size = max(cell_size, 1e-3)
+
+        for name, (lo, hi) in zip(names, bounds):
+            self._store(name, lo, hi)
+
+    def _cell(self, point) -> tuple[int, int, int]:
+        size = self._cell_size
+        return (math.floor(point[0] / size), math.floor(point[1] / size), math.floor(point[2] / size))
+
+    def _cell_range(self, lo, hi):
+        """Cells covering the box [lo, hi] as ((lo cell), (hi cell), cell count)."""
+        a, b = self._cell(lo), self._cell(hi)
+        return a, b, (b[0] - a[0] + 1) * (b[1] - a[1] + 1) * (b[2] - a[2] + 1)
+
+    def _link(self, row: int, lo, hi):
+        a, b, count = self._cell_range(lo, hi)
+        if count > self.MAX_OBJECT_CELLS:
+            self._large.add(row)
+            self._row_cells[row] = None
+            return
+        for key in itertools.product(range(a[0], b[0] + 1), range(a[1], b[1] + 1), range(a[2], b[2] + 1)):
+            self._cells.setdefault(key, set()).add(row)
+        self._row_cells[row] = (a, b)
+        if self._extent is None:
+            self._extent = (list(a), list(b))
+        else:
+            for k in range(3):
+                self._extent[0][k] = min(self._extent[0][k], a[k])
+                self._extent[1][k] = max(self._extent[1][k], b[k])
+
+    def _unlink(self, row: int):
+        span = self._row_cells.pop(row, None)
+        if span is None:
+            self._large.discard(row)
+            return
+        a, b = span
+        for key in itertools.product(range(a[0], b[0] + 1), range(a[1], b[1] + 1), range(a[2], b[2] + 1)):
+            bucket = self._cells.get(key)
+            if bucket is not None:
+                bucket.discard(row)
+                if not bucket:
+                    del self._cells[key]
+
+    def _store(self, name: str, lo, hi):
+        row = self._rows.get(name)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self._names)
+                if row >= len(self._active):
+                    self._allocate(2 * len(self._active))
+                self._names.append(None)
+            self._rows[name] = row
+            self._names[row] = name
+        else:
+            self._unlink(row)
+        self._mins[row][:] = lo
+        self._maxs[row][:] = hi
+        self._active[row] = True
+        self._link(row, lo, hi)
+
+    def update(self, objects):
+        """Refresh objects (and their children) after they were created or moved.
+
+        matrix_world must be current, i.e. the view layer updated. A change touching a
+        large part of the scene just invalidates: a rebuild is as cheap as row updates.
+        """
+        if self.dirty:
+            return
+        objects = list(objects)
+        if len(objects) > max(1024, len(self._rows) // 4):
+            self.invalidate()
+            return
+        scene_objects = bpy.context.scene.objects
+        for obj in objects:
+            if obj.name not in scene_objects:
+                continue
+            for item in (obj, *getattr(obj, "children_recursive", ())):
+                self._store(item.name, *_world_bounds(item))
+        self.updates += 1
+
+    def remove(self, name: str):
+        if self.dirty:
+            return
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        self._unlink(row)
+        self._names[row] = None
+        self._active[row] = False
+        self._free.append(row)
+        self.updates += 1
+
+    def _box_distance(self, row: int, point) -> float:
+        """Distance from point to the box in row (0 inside)."""
+        lo, hi = self._mins[row], self._maxs[row]
+        total = 0.0
+        for k in range(3):
+            d = max(lo[k] - point[k], point[k] - hi[k], 0.0)
+            total += d * d
+        return math.sqrt(total)
+
+    def _distances(self, rows, point) -> list[float]:
+        """Distances from point to the boxes in rows, in iteration order."""
+        rows = list(rows)
+        if np is not None and len(rows) > 16:
+            p = np.asarray(point, dtype=float)
+            delta = np.maximum(np.maximum(self._mins[rows] - p, p - self._maxs[rows]), 0.0)
+            return np.sqrt((delta * delta).sum(axis=1)).tolist()
+        return [self._box_distance(row, point) for row in rows]
+
+    def _scan_distances(self, point):
+        """Distance from point to every box at once; inf for unused rows."""
+        if np is not None:
+            p = np.asarray(point, dtype=float)
+            delta = np.maximum(np.maximum(self._mins - p, p - self._maxs), 0.0)
+            distances = np.sqrt((delta * delta).sum(axis=1))
+            distances[~self._active] = np.inf
+            return distances
+        return [self._box_distance(row, point) if active else math.inf
+                for row, active in enumerate(self._active)]
+
+    def _candidates(self, lo, hi) -> set[int] | None:
+        """Rows whose cells touch the box [lo, hi], or None if that covers too many cells."""
+        a, b, count = self._cell_range(lo, hi)
+        if count > self.MAX_QUERY_CELLS:
+            return None
+        rows = set(self._large)
+        if self._extent is not None:
+            # Only the part of the query that overlaps used cells can hold anything
+            a = [max(a[k], self._extent[0][k]) for k in range(3)]
+            b = [min(b[k], self._extent[1][k]) for k in range(3)]
+            for key in itertools.product(range(a[0], b[0] + 1), range(a[1], b[1] + 1), range(a[2], b[2] + 1)):
+                bucket = self._cells.get(key)
+                if bucket:
+                    rows |= bucket
+        return rows
+
+    def nearest(self, point, k: int) -> list[tuple[str, float]]:
+        """The k objects whose boxes are closest to point, nearest first.
+
+        Visits rings of cells around point until k boxes are known to be within the
+        radius the rings fully cover.
+        """
+        k = min(k, len(self._rows))
+        if k <= 0:
+            return []
+        found = dict(zip(self._large, self._distances(self._large, point)))
+        center = self._cell(point)
+        lo, hi = self._extent if self._extent is not None else (center, center)
+        # Beyond this ring there are no cells in use
+        last_ring = max(max(center[i] - lo[i], hi[i] - center[i]) for i in range(3))
+        visited = 0
+        ring = 0
+        while True:
+            new_rows = set()
+            for key in self._ring_cells(center, ring):
+                bucket = self._cells.get(key)
+                if bucket:
+                    new_rows |= bucket
+            new_rows.difference_update(found)
+            found.update(zip(new_rows, self._distances(new_rows, point)))
+            visited += max(1, 24 * ring * ring + 2)
+            covered = ring * self._cell_size
+            if ring >= last_ring or sum(1 for d in found.values() if d <= covered) >= k:
+                break
+            if visited > self.MAX_QUERY_CELLS:
+                # Sparse surroundings: checking every box is cheaper than more rings
+                return self._scan_nearest(point, k)
+            ring += 1
+        best = heapq.nsmallest(k, found.items(), key=lambda item: item[1])
+        return [(self._names[row], distance) for row, distance in best]
+
+    def _scan_nearest(self, point, k: int) -> list[tuple[str, float]]:
+        distances = self._scan_distances(point)
+        if np is not None:
+            rows = np.argpartition(distances, k - 1)[:k]
+            rows = rows[np.argsort(distances[rows])]
+            return [(self._names[row], float(distances[row])) for row in rows]
+        best = heapq.nsmallest(k, enumerate(distances), key=lambda item: item[1])
+        return [(self._names[row], distance) for row, distance in best]
+
+    @staticmethod
+    def _ring_cells(center, ring: int):
+        """Cells at exactly Chebyshev distance ring from center."""
+        cx, cy, cz = center
+        if ring == 0:
+            yield center
+            return
+        span = range(-ring, ring + 1)
+        for dx in span:
+            for dy in span:
+                if abs(dx) == ring or abs(dy) == ring:
+                    for dz in span:
+                        yield (cx + dx, cy + dy, cz + dz)
+                else:
+                    yield (cx + dx, cy + dy, cz - ring)
+                    yield (cx + dx, cy + dy, cz + ring)
+
+    def within_radius(self, point, radius: float) -> list[tuple[str, float]]:
+        """Objects whose boxes come within radius of point, nearest first."""
+        rows = self._candidates([c - radius for c in point], [c + radius for c in point])
+        if rows is None:
+            distances = self._scan_distances(point)
+            if np is not None:
+                rows = np.flatnonzero(distances <= radius)
+                hits = list(zip(rows.tolist(), distances[rows].tolist()))
+            else:
+                hits = [(row, d) for row, d in enumerate(distances) if d <= radius]
+        else:
+            rows = list(rows)
+            hits = [(row, d) for row, d in zip(rows, self._distances(rows, point)) if d <= radius]
+        hits.sort(key=lambda hit: hit[1])
+        return [(self._names[row], distance) for row, distance in hits]
+
+    def overlapping(self, box_min, box_max) -> list[str]:
+        """Names of objects whose boxes overlap [box_min, box_max], in name order."""
+        rows = self._candidates(box_min, box_max)
+        if rows is None and np is not None:
+            hit = self._active & (self._mins <= box_max).all(axis=1) & (self._maxs >= box_min).all(axis=1)
+            rows = np.flatnonzero(hit).tolist()
+        else:
+            if rows is None:
+                rows = [row for row, active in enumerate(self._active) if active]
+            rows = [row for row in rows
+                    if all(self._mins[row][k] <= box_max[k] and self._maxs[row][k] >= box_min[k] for k in range(3))]
+        return sorted(self._names[row] for row in rows)
+
+    def _ray_entry(self, row: int, origin, inverse) -> float | None:
+        """Ray parameter where the ray enters the box in row (0 if it starts inside), or None."""
+        near, far = 0.0, math.inf
+        lo, hi = self._mins[row], self._maxs[row]
+        for k in range(3):
+            if inverse[k] is None:
+                if not lo[k] <= origin[k] <= hi[k]:
+                    return None
+                continue
+            t1 = (lo[k] - origin[k]) * inverse[k]
+            t2 = (hi[k] - origin[k]) * inverse[k]
+            if t1 > t2:
+                t1, t2 = t2, t1
+            near, far = max(near, t1), min(far, t2)
+            if near > far:
+                return None
+        return near
+
+    def ray(self, origin, direction, max_distance: float):
+        """Yield (name, entry distance) for boxes the ray enters within max_distance, nearest first.
+
+        direction must be normalized. Walks the grid cell by cell (3D DDA); a hit is only
+        yielded once the walk has passed its distance, so the order is exact and callers
+        can stop early.
+        """
+        inverse = [1.0 / d if d != 0.0 else None for d in direction]
+        pending: list[tuple[float, int]] = []
+        tested = set()
+
+        def test(rows):
+            for row in rows:
+                if row not in tested:
+                    tested.add(row)
+                    t = self._ray_entry(row, origin, inverse)
+                    if t is not None and t <= max_distance:
+                        heapq.heappush(pending, (t, row))
+
+        def release(limit):
+            while pending and pending[0][0] <= limit:
+                t, row = heapq.heappop(pending)
+                yield self._names[row], t
+
+        test(self._large)
+        if self._extent is not None:
+            size = self._cell_size
+            # Clip the ray to the box of cells in use
+            t_start, t_end = 0.0, max_distance
+            for k in range(3):
+                lo = self._extent[0][k] * size
+                hi = (self._extent[1][k] + 1) * size
+                if inverse[k] is None:
+                    if not lo <= origin[k] < hi:
+                        t_end = -1.0
+                    continue
+                t1, t2 = (lo - origin[k]) * inverse[k], (hi - origin[k]) * inverse[k]
+                if t1 > t2:
+                    t1, t2 = t2, t1
+                t_start, t_end = max(t_start, t1), min(t_end, t2)
+
+            if t_start <= t_end:
+                start = [origin[k] + direction[k] * t_start for k in range(3)]
+                cell = list(self._cell(start))
+                step, t_next, t_delta = [0] * 3, [math.inf] * 3, [math.inf] * 3
+                for k in range(3):
+                    if inverse[k] is None:
+                        continue
+                    step[k] = 1 if direction[k] > 0 else -1
+                    boundary = (cell[k] + (1 if step[k] > 0 else 0)) * size
+                    t_next[k] = t_start + (boundary - start[k]) * inverse[k]
+                    t_delta[k] = size * abs(inverse[k])
+
+                while True:
+                    bucket = self._cells.get(tuple(cell))
+                    if bucket:
+                        test(bucket)
+                    axis = min(range(3), key=t_next.__getitem__)
+                    t_exit = t_next[axis]
+                    # Every box not seen yet lies beyond this cell
+                    yield from release(t_exit)
+                    if t_exit > t_end:
+                        break
+                    cell[axis] += step[axis]
+                    t_next[axis] += t_delta[axis]
+
+        yield from release(math.inf)
+
+    def stats(self) -> dict:
+        return {
+            "scene": self.scene_name,
+            "objects": len(self._rows),
+            "dirty": self.dirty,
+            "rebuilds": self.rebuilds,
+            "updates": self.updates,
+            "cell_size": self._cell_size,
+            "cells": len(self._cells),
+            "large_objects": len(self._large),
+        }
+
+
+spatial_index = SpatialIndex()
+
+
+# Identity of the client whose request is being handled. Set once per connection by the
+# socket transport and inherited by every task that connection's session starts.
+current_client: contextvars.ContextVar[str] = contextvars.ContextVar("current_client", default="stdio")
+
+
+# Scheduling classes for bpy work, most urgent first
+PRIORITIES = ("read", "write", "heavy")
+
+
+class BpyExecutor:
+    """Runs callables on the thread that owns bpy.
+
+    Blender only supports bpy access from its main thread, so the MCP server's asyncio
+    loop runs on a worker thread and hands every bpy call to this executor, which the
+    main thread drains in serve_forever().
+
+    Work is submitted with a priority class: "read" for queries, "write" for light
+    edits and "heavy" for renders, saves and long scripts. The most urgent non-empty
+    class is served first; a class passed over STARVATION_LIMIT times in a row gets the
+    next turn anyway. Within a class, work is queued per client (current_client) and
+    served round-robin, one call per client per turn, so a client submitting a burst of
+    calls cannot starve the others sharing the instance.
+
+    Reads may overtake writes, but a client's writes always run in the order it sent
+    them: a write joins the least urgent class the client still has work queued in, and
+    a client's oldest queued write goes first whichever class was picked.
+
+    generation counts completed non-read calls, so results computed on the bpy thread
+    can be tagged with the scene state they saw. before_heavy, if set, runs on the bpy
+    thread just before each heavy call.
+    """
+
+    STARVATION_LIMIT = 8
+
+    def __init__(self):
+        self._ready = threading.Condition()
+        # priority -> client id -> pending (future, func, args, kwargs); insertion order is the turn order
+        self._queues: dict[str, OrderedDict[str, deque]] = {p: OrderedDict() for p in PRIORITIES}
+        self._passed = dict.fromkeys(PRIORITIES, 0)
+        self._served: dict[str, int] = {}
+        self._served_by_priority = dict.fromkeys(PRIORITIES, 0)
+        self.generation = 0
+        self.before_heavy: Callable[[], None] | None = None
+
+    def submit(self, func, *args, priority: str = "write", **kwargs) -> concurrent.futures.Future:
+        """Queue func(*args, **kwargs) for the bpy thread and return its future."""
+        future = concurrent.futures.Future()
+        client = current_client.get()
+        with self._ready:
+            if priority != "read":
+                for later in PRIORITIES[PRIORITIES.index(priority) + 1:]:
+                    if client in self._queues[later]:
+                        priority = later
+            self._queues[priority].setdefault(client, deque()).append((future, func, args, kwargs))
+            self._ready.notify()
+        return future
+
+    async def run(self, func, *args, priority: str = "write", **kwargs):
+        """Run func on the bpy thread and await its result from the asyncio loop."""
+        return await asyncio.wrap_future(self.submit(func, *args, priority=priority, **kwargs))
+
+    def _pick_priority(self) -> str | None:
+        waiting = [p for p in PRIORITIES if self._queues[p]]
+        if not waiting:
+            return None
+        chosen = waiting[0]
+        for priority in waiting[1:]:
+            if self._passed[priority] >= self.STARVATION_LIMIT:
+                chosen = priority
+                break
+        for priority in waiting:
+            self._passed[priority] = 0 if priority == chosen else self._passed[priority] + 1
+        return chosen
+
+    def _next(self, timeout: float):
+        """Pop the next call, or None after timeout."""
+        with self._ready:
+            priority = self._pick_priority()
+            if priority is None:
+                if not self._ready.wait(timeout):
+                    return None
+                priority = self._pick_priority()
+                if priority is None:
+                    return None
+            client = next(iter(self._queues[priority]))
+            if priority != "read":
+                # Writes of one client run in order: an older one may sit in a more urgent class
+                for earlier in PRIORITIES[1:PRIORITIES.index(priority)]:
+                    if client in self._queues[earlier]:
+                        priority = earlier
+                        break
+            queues = self._queues[priority]
+            pending = queues[client]
+            future, func, args, kwargs = pending.popleft()
+            if pending:
+                queues.move_to_end(client)
+            else:
+                del queues[client]
+            self._served[client] = self._served.get(client, 0) + 1
+            self._served_by_priority[priority] += 1
+            return priority, future, func, args, kwargs
+
+    def serve_forever(self, stop_event: threading.Event, poll_interval: float = 0.1):
+        """Execute queued work on the calling thread until stop_event is set."""
+        while not stop_event.is_set():
+            item = self._next(poll_interval)
+            if item is None:
+                continue
+            priority, future, func, args, kwargs = item
+
+            # Skip work whose caller has already gone away
+            if not future.set_running_or_notify_cancel():
+                continue
+            if priority == "heavy" and self.before_heavy is not None:
+                try:
+                    with tracer.span("before_heavy", "bpy"):
+                        self.before_heavy()
+                except Exception as e:
+                    logger.error(f"before_heavy hook failed: {e}", exc_info=True)
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                exception = e
+            else:
+                exception = None
+            if priority != "read":
+                with self._ready:
+                    self.generation += 1
+            if exception is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exception)
+
+    def stats(self) -> dict:
+        with self._ready:
+            return {
+                "pending": {
+                    priority: {client: len(pending) for client, pending in queues.items()}
+                    for priority, queues in self._queues.items()
+                },
+                "served": dict(self._served),
+                "served_by_priority": dict(self._served_by_priority),
+                "generation": self.generation,
+            }
+
+
+bpy_executor = BpyExecutor()
+
+
+class ReadSnapshot:
+    """Results of read-only tools, answered on the asyncio loop without a bpy round trip.
+
+    Entries are keyed by tool name and arguments and tagged with the executor generation
+    they were computed at, so an entry is only served while no write has completed
+    since: every write a client has had a response for is visible. Calls still in
+    flight are concurrent, as in JSON-RPC, and a read may be answered from the state
+    before them. Before heavy work starts, the most recently used stale entries are
+    recomputed, so queries that keep polling the scene during a long render, save or
+    script are answered from the state just before it instead of waiting for it.
+    """
+
+    def __init__(self, executor: BpyExecutor, max_entries: int = 64, refresh_entries: int = 8,
+                 enabled: bool = True):
+        self.executor = executor
+        self.max_entries = max_entries
+        self.refresh_entries = refresh_entries
+        self.enabled = enabled
+        # key -> [generation, result, handler, arguments], least recently used first
+        self._entries: OrderedDict[tuple[str, str], list] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @staticmethod
+    def key(name: str, arguments: Any) -> tuple[str, str]:
+        return name, json.dumps(arguments, sort_keys=True, default=str)
+
+    def lookup(self, key: tuple[str, str]):
+        """The cached result for key if no write has completed since it was computed, else None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self.executor.generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def compute(self, key: tuple[str, str], handler, arguments):
+        """Run a read tool on the bpy thread and remember its result."""
+        generation = self.executor.generation
+        result = handler(arguments)
+        if self.enabled and not _is_error_result(result):
+            with self._lock:
+                self._entries[key] = [generation, result, handler, arguments]
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return result
+
+    def refresh(self):
+        """Recompute the most recently used stale entries. Runs on the bpy thread."""
+        generation = self.executor.generation
+        with self._lock:
+            stale = [(key, entry) for key, entry in reversed(self._entries.items()) if entry[0] != generation]
+        for key, (_, _, handler, arguments) in stale[:self.refresh_entries]:
+            try:
+                result = handler(arguments)
+            except Exception:
+                result = None
+            with self._lock:
+                if result is None or _is_error_result(result):
+                    self._entries.pop(key, None)
+                elif key in self._entries:
+                    self._entries[key][:2] = [generation, result]
+            self.refreshes += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "current": sum(1 for entry in self._entries.values() if entry[0] == self.executor.generation),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+            }
+
+
+read_snapshot = ReadSnapshot(bpy_executor, enabled=os.environ.get("BLENDER_MCP_READ_SNAPSHOT", "1") != "0")
+bpy_executor.before_heavy = read_snapshot.refresh
+
+
+# Render progress as reported in render_stats strings, e.g. "Sample 12/128" (Cycles),
+# "Rendering 12 / 64 samples" (EEVEE) or "Rendered 3/16 Tiles"
+_RENDER_PROGRESS_PATTERNS = (
+    re.compile(r"Sample (\d+)\s*/\s*(\d+)"),
+    re.compile(r"Rendering (\d+)\s*/\s*(\d+) samples"),
+    re.compile(r"Rendered (\d+)\s*/\s*(\d+) Tiles"),
+)
+
+
+@dataclass
+class RenderJob:
+    """A render requested through render_scene and its progress."""
+    job_id: str
+    filepath: str
+    resolution_x: int
+    resolution_y: int
+    status: str = "queued"  # queued, running, done, failed, cancelled
+    progress: float = 0.0
+    message: str = ""
+    error: str | None = None
+    use_cache: bool = True
+    cached: bool = False
+    cancel_requested: bool = False
+    preview: dict | None = None  # scale, samples, format, quality and max_bytes for a preview render
+    image: bytes | None = field(default=None, repr=False)  # the encoded preview
+    output: str | None = None  # where a preview with a filepath is saved, resolved on the bpy thread
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def to_dict(self) -> dict:
+        info = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "filepath": self.filepath,
+            "resolution": [self.resolution_x, self.resolution_y],
+        }
+        if self.message:
+            info["message"] = self.message
+        if self.error:
+            info["error"] = self.error
+        if self.cached:
+            info["cached"] = True
+        if self.preview:
+            info["preview"] = dict(self.preview)
+            if self.image is not None:
+                info["preview"]["bytes"] = len(self.image)
+        if self.cancel_requested and self.status == "running":
+            info["cancel_requested"] = True
+        if self.started_at is not None:
+            end = self.finished_at if self.finished_at is not None else time.time()
+            info["elapsed_seconds"] = round(end - self.started_at, 3)
+        return info
+
+
+@dataclass
+class AnimationJob(RenderJob):
+    """A render_animation job: frame shards rendered by background Blender worker processes.
+
+    frame_start/end/step left as None take the scene's values when the snapshot is saved.
+    """
+    frame_start: int | None = None
+    frame_end: int | None = None
+    frame_step: int | None = None
+    frames: list[int] = field(default_factory=list)
+    workers: int = 1
+    frames_per_shard: int = 0
+    retries: int = 2
+    scene_name: str = ""
+    done_frames: set[int] = field(default_factory=set)
+    failed_frames: list[int] = field(default_factory=list)
+    shards: int = 0
+    retried_shards: int = 0
+    last_saved: str | None = None
+    processes: set = field(default_factory=set, repr=False)
+
+    def to_dict(self) -> dict:
+        info = super().to_dict()
+        info["frames"] = {
+            "total": len(self.frames),
+            "done": len(self.done_frames),
+            "first": self.frames[0] if self.frames else None,
+            "last": self.frames[-1] if self.frames else None,
+        }
+        if self.failed_frames:
+            info["frames"]["failed"] = self.failed_frames
+        info["workers"] = self.workers
+        info["shards"] = self.shards
+        info["retried_shards"] = self.retried_shards
+        if self.last_saved:
+            info["last_saved"] = self.last_saved
+        return info
+
+    def terminate_workers(self):
+        for process in list(self.processes):
+            if process.returncode is None:
+                process.terminate()
+
+
+def _update_render_progress(job: RenderJob, stats: str):
+    """render_stats handler body: record Blender's progress line on the job."""
+    job.message = stats.strip()
+    for pattern in _RENDER_PROGRESS_PATTERNS:
+        match = pattern.search(stats)
+        if match and int(match.group(2)):
+            job.progress = min(1.0, int(match.group(1)) / int(match.group(2)))
+            break
+
+
+def _render_output_path(filepath: str, render) -> str:
+    """The file write_still saves to for filepath: '//' paths resolved against the .blend,
+    and the format's extension added when the path has none (with use_file_extension on)."""
+    output = bpy.path.abspath(filepath)
+    if render.use_file_extension and not os.path.splitext(output)[1]:
+        output += render.file_extension
+    return output
+
+
+def _render_still(job: RenderJob):
+    """Render one still for a job, or serve it from the render cache. Runs on the bpy thread."""
+    scene = bpy.context.scene
+    scene.render.resolution_x = job.resolution_x
+    scene.render.resolution_y = job.resolution_y
+    scene.render.filepath = job.filepath
+    output = _render_output_path(job.filepath, scene.render)
+
+    fingerprint = None
+    if job.use_cache and render_cache.enabled:
+        with tracer.span("scene_fingerprint", "render"):
+            fingerprint = scene_fingerprint(scene)
+        if render_cache.fetch(fingerprint, output):
+            job.cached = True
+            job.message = "Served from render cache"
+            return
+
+    def on_render_stats(stats, *args):
+        _update_render_progress(job, str(stats))
+
+    bpy.app.handlers.render_stats.append(on_render_stats)
+    try:
+        with tracer.span("render.render", "operator", filepath=job.filepath):
+            bpy.ops.render.render(write_still=True)
+    finally:
+        bpy.app.handlers.render_stats.remove(on_render_stats)
+
+    if fingerprint is not None and os.path.exists(output):
+        render_cache.store(fingerprint, output)
+
+
+# Preview formats Blender can write, and their MIME types
+PREVIEW_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+PREVIEW_DEFAULTS = {"scale": 25, "samples": 16, "format": "JPEG", "quality": 75, "max_bytes": 256 * 1024}
+# Renders a preview may take to get under max_bytes
+PREVIEW_ATTEMPTS = 3
+
+
+def _image_mime_type(data: bytes) -> str | None:
+    """MIME type from the image's signature, whatever format was asked for."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@contextlib.contextmanager
+def _overridden(*settings):
+    """Set (owner, attribute, value) triples for the block, then restore them in the same order.
+
+    Every original is read before anything is set: setting a file format can change the
+    color mode, and restoring the format first lets the color mode be restored after it.
+    """
+    saved = [(owner, name, getattr(owner, name)) for owner, name, _ in settings]
+    try:
+        for owner, name, value in settings:
+            setattr(owner, name, value)
+        yield
+    finally:
+        for owner, name, value in saved:
+            setattr(owner, name, value)
+
+
+def _render_preview(job: RenderJob):
+    """Render a scaled-down, low-sample preview into job.image. Runs on the bpy thread.
+
+    Render settings are restored afterwards. Blender hands render results to Python only
+    through files, so the image is written to a private temporary directory and read
+    back. An image over max_bytes is rendered again at a scale that should fit, since
+    encoded size follows the pixel count, and with lower quality for lossy formats.
+    """
+    options = job.preview
+    scene = bpy.context.scene
+    render = scene.render
+    scale, quality = options["scale"], options["quality"]
+    overrides = [
+        (render, "resolution_x", job.resolution_x),
+        (render, "resolution_y", job.resolution_y),
+        (render, "use_file_extension", True),
+        (render.image_settings, "file_format", options["format"]),
+        (render.image_settings, "color_mode", "RGB"),
+    ]
+    if render.engine == "CYCLES":
+        overrides.append((scene.cycles, "samples", options["samples"]))
+    elif render.engine.startswith("BLENDER_EEVEE"):
+        overrides.append((scene.eevee, "taa_render_samples", options["samples"]))
+
+    def on_render_stats(stats, *args):
+        _update_render_progress(job, str(stats))
+
+    workdir = tempfile.mkdtemp(prefix="blender_mcp_preview_")
+    bpy.app.handlers.render_stats.append(on_render_stats)
+    try:
+        for attempt in range(PREVIEW_ATTEMPTS):
+            filepath = os.path.join(workdir, f"preview{attempt}")
+            with _overridden(*overrides, (render, "resolution_percentage", scale),
+                             (render.image_settings, "quality", quality), (render, "filepath", filepath)):
+                with tracer.span("render.render", "operator", preview=True, scale=scale):
+                    bpy.ops.render.render(write_still=True)
+                filepath += render.file_extension
+                if job.filepath:
+                    job.output = _render_output_path(job.filepath, render)
+            with open(filepath, "rb") as f:
+                job.image = f.read()
+            job.preview.update(scale=scale, quality=quality)
+            if len(job.image) <= options["max_bytes"] or scale == 1:
+                break
+            scale = max(1, int(scale * math.sqrt(options["max_bytes"] / len(job.image)) * 0.9))
+            if options["format"] != "PNG":
+                quality = max(30, quality - 15)
+    finally:
+        bpy.app.handlers.render_stats.remove(on_render_stats)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# Worker output lines: the frame being rendered, and each written file
+_WORKER_FRAME_LINE = re.compile(rb"^Fra:\s*(\d+)")
+_WORKER_SAVED_LINE = re.compile(rb"^\s*Saved: '(.+)'")
+
+
+def _render_worker_command() -> list[str]:
+    """Program that renders animation shards; Blender's command-line render arguments are appended.
+
+    BLENDER_MCP_RENDER_WORKER_CMD replaces it, e.g. with a stand-in renderer for tests.
+    Otherwise it is BLENDER_MCP_BLENDER_EXE or the running Blender, like the wrapper's child.
+    """
+    command = os.environ.get("BLENDER_MCP_RENDER_WORKER_CMD")
+    if command:
+        return shlex.split(command, posix=(sys.platform != "win32"))
+    blender = os.environ.get("BLENDER_MCP_BLENDER_EXE") or bpy.app.binary_path
+    if not blender:
+        raise RuntimeError("No Blender executable to launch; set BLENDER_MCP_BLENDER_EXE "
+                           "or BLENDER_MCP_RENDER_WORKER_CMD")
+    return [blender]
+
+
+def _frame_list_argument(frames: list[int]) -> str:
+    """Frames in Blender's --render-frame syntax: consecutive runs as 'a..b', joined by commas."""
+    parts = []
+    start = previous = frames[0]
+    for frame in frames[1:] + [None]:
+        if frame is not None and frame == previous + 1:
+            previous = frame
+            continue
+        parts.append(str(start) if start == previous else f"{start}..{previous}")
+        start = previous = frame
+    return ",".join(parts)
+
+
+def _save_render_snapshot(path: str, output_path: str, resolution_x: int | None, resolution_y: int | None) -> dict:
+    """Save a copy of the open file for worker processes. Runs on the bpy thread.
+
+    A resolution override is written into the copy only; the open scene is left as it was.
+    Returns the scene's name, frame range and resolution, and output_path made absolute,
+    since '//' would otherwise resolve next to the copy.
+    """
+    scene = bpy.context.scene
+    render = scene.render
+    original = (render.resolution_x, render.resolution_y)
+    if resolution_x:
+        render.resolution_x = resolution_x
+    if resolution_y:
+        render.resolution_y = resolution_y
+    try:
+        with tracer.span("wm.save_as_mainfile", "operator", copy=True):
+            bpy.ops.wm.save_as_mainfile(filepath=path, copy=True)
+        resolution = (render.resolution_x, render.resolution_y)
+    finally:
+        render.resolution_x, render.resolution_y = original
+    return {
+        "scene": scene.name,
+        "frame_start": scene.frame_start,
+        "frame_end": scene.frame_end,
+        "frame_step": getattr(scene, "frame_step", 1),
+        "resolution": resolution,
+        "output_path": bpy.path.abspath(output_path),
+    }
+
+
+async def _render_shard(job: AnimationJob, command: list[str], blend: str, frames: list[int]) -> str:
+    """Render frames in one worker process, recording each saved frame on the job.
+
+    Returns the last lines of the worker's output, for error messages.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command, "--background", blend, "--scene", job.scene_name,
+        "--render-output", job.filepath, "--render-frame", _frame_list_argument(frames),
+        stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    job.processes.add(process)
+    tail: deque[bytes] = deque(maxlen=10)
+    frame = None
+    try:
+        async for line in process.stdout:
+            tail.append(line)
+            match = _WORKER_FRAME_LINE.match(line)
+            if match:
+                frame = int(match.group(1))
+                continue
+            match = _WORKER_SAVED_LINE.match(line)
+            if match and frame in frames:
+                job.done_frames.add(frame)
+                job.last_saved = match.group(1).decode(errors="replace")
+                job.progress = len(job.done_frames) / len(job.frames)
+                job.message = f"Saved frame {frame} ({len(job.done_frames)}/{len(job.frames)})"
+        await process.wait()
+    finally:
+        job.processes.discard(process)
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+    return b"".join(tail).decode(errors="replace").strip()
+
+
+async def _run_animation_job(job: AnimationJob, command: list[str], blend: str):
+    """Render job.frames in shards on job.workers processes, retrying shards that fail."""
+    if not job.frames_per_shard:
+        # Several shards per worker keep every worker busy to the end when frames differ in cost
+        job.frames_per_shard = max(1, -(-len(job.frames) // (job.workers * 4)))
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(job.frames), job.frames_per_shard):
+        queue.put_nowait((job.frames[i:i + job.frames_per_shard], 0))
+    job.shards = pending = queue.qsize()
+    job.workers = min(job.workers, job.shards)
+    errors: list[str] = []
+
+    async def worker():
+        nonlocal pending
+        while True:
+            shard = await queue.get()
+            if shard is None:
+                return
+            frames, attempt = shard
+            if not job.cancel_requested:
+                try:
+                    output = await _render_shard(job, command, blend, frames)
+                except Exception as e:
+                    # A worker that cannot start, or whose output cannot be read (a line over the
+                    # stream limit), is a failed attempt like one that exits with an error
+                    logger.warning(f"{job.job_id}: worker for frames {_frame_list_argument(frames)} failed: {e!r}")
+                    output = f"{type(e).__name__}: {e}"
+                missing = [frame for frame in frames if frame not in job.done_frames]
+                if missing and not job.cancel_requested:
+                    if attempt < job.retries:
+                        job.retried_shards += 1
+                        logger.warning(f"{job.job_id}: retrying frames {_frame_list_argument(missing)}")
+                        queue.put_nowait((missing, attempt + 1))
+                        continue
+                    job.failed_frames.extend(missing)
+                    errors.append(f"frames {_frame_list_argument(missing)}: {output[-500:]}")
+            pending -= 1
+            if pending == 0:
+                for _ in range(job.workers):
+                    queue.put_nowait(None)
+
+    await asyncio.gather(*(worker() for _ in range(job.workers)))
+    job.failed_frames.sort()
+    return errors
+
+
+def _hash_values(h, values):
+    h.update(repr(values).encode())
+
+
+# Node properties that only affect the editor, not shading
+_NODE_LAYOUT_PROPS = frozenset((
+    "rna_type", "name", "label", "location", "location_absolute", "width", "height", "dimensions",
+    "select", "show_options", "show_preview", "show_texture", "hide", "parent", "color",
+    "use_custom_color", "inputs", "outputs", "internal_links",
+))
+
+# Properties of datablocks and modifiers that are bookkeeping or only affect the viewport/UI
+_RNA_SKIP_PROPS = frozenset((
+    "rna_type", "name", "name_full", "id_type", "session_uid", "is_evaluated", "original", "users",
+    "use_fake_user", "use_extra_user", "is_embedded_data", "is_missing", "is_runtime_data", "tag",
+    "is_library_indirect", "library", "library_weak_reference", "asset_data", "override_library",
+    "preview", "id_data", "show_viewport", "show_in_editmode", "show_on_cage", "show_expanded",
+    "is_active", "is_override_data", "persistent_uid", "execution_time", "use_pin_to_last",
+))
+
+# Render settings that only say where and how fast to render, not what the image looks like
+_RENDER_SKIP_PROPS = _RNA_SKIP_PROPS | {"filepath", "threads", "threads_mode", "use_lock_interface",
+                                        "use_persistent_data", "preview_pixel_size"}
+
+# Material settings outside the node tree that affect how it renders
+_MATERIAL_SETTINGS = ("blend_method", "surface_render_method", "use_backface_culling",
+                      "pass_index", "metallic", "roughness")
+
+
+def _rna_value(value):
+    """A property value in a form whose repr is stable across processes."""
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return value
+    try:
+        return tuple(_rna_value(item) for item in value)
+    except TypeError:
+        return value
+
+
+def _hash_rna(h, struct, skip=_RNA_SKIP_PROPS, referenced: list | None = None):
+    """Feed every non-collection RNA property of struct into h.
+
+    Pointers are hashed by name; pointed-to objects (a boolean cutter, an array's offset
+    empty) are also appended to referenced so the caller can hash their state.
+    """
+    if struct is None:
+        _hash_values(h, None)
+        return
+    for prop in getattr(getattr(struct, "bl_rna", None), "properties", ()):
+        if prop.identifier in skip or prop.type == 'COLLECTION':
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == 'POINTER':
+            if referenced is not None and hasattr(value, "matrix_world"):
+                referenced.append(value)
+            value = getattr(value, "name", None)
+        _hash_values(h, (prop.identifier, _rna_value(value)))
+
+
+def _hash_node_tree(h, tree):
+    """Feed a node tree's nodes, their settings and input values, and its links into h."""
+    for node in tree.nodes:
+        _hash_values(h, (node.name, getattr(node, "type", None)))
+        _hash_rna(h, node, _NODE_LAYOUT_PROPS)
+        for node_input in node.inputs:
+            _hash_values(h, (getattr(node_input, "identifier", None),
+                             _rna_value(getattr(node_input, "default_value", None))))
+    for link in getattr(tree, "links", ()):
+        _hash_values(h, (link.from_node.name, link.from_socket.identifier,
+                         link.to_node.name, link.to_socket.identifier))
+
+
+def _hash_material(h, mat, with_name: bool = True):
+    """Feed a material's node inputs (or viewport color when not node-based) into h."""
+    if mat is None:
+        _hash_values(h, None)
+        return
+    _hash_values(h, (mat.name if with_name else None, mat.use_nodes, tuple(mat.diffuse_color)))
+    _hash_values(h, tuple(getattr(mat, setting, None) for setting in _MATERIAL_SETTINGS))
+    if mat.use_nodes and mat.node_tree:
+        _hash_node_tree(h, mat.node_tree)
+
+
+def _bulk_get_ints(source, attr: str, count: int):
+    """Read an integer (or boolean) property of every element in source as one flat int32 buffer."""
+    if np is not None:
+        buffer = np.empty(count, dtype=np.int32)
+    else:
+        buffer = array.array('i', bytes(count * 4))
+    source.foreach_get(attr, buffer)
+    return buffer
+
+
+def _hash_mesh(h, mesh):
+    """Feed mesh geometry into h without building Python lists of vertices.
+
+    Covers vertex positions, face topology (the vertex index of every corner), material
+    indices, smooth shading, UV maps and shape keys.
+    """
+    count, corners, faces = len(mesh.vertices), len(mesh.loops), len(mesh.polygons)
+    _hash_values(h, (count, faces, corners))
+    h.update(_bulk_get_vectors(mesh.vertices, "co", count).tobytes())
+    h.update(_bulk_get_ints(mesh.loops, "vertex_index", corners).tobytes())
+    for attr in ("loop_start", "loop_total", "material_index", "use_smooth"):
+        h.update(_bulk_get_ints(mesh.polygons, attr, faces).tobytes())
+    for layer in mesh.uv_layers:
+        _hash_values(h, ("uv", layer.name, getattr(layer, "active_render", None)))
+        h.update(_bulk_get_vectors(layer.data, "uv", corners, 2).tobytes())
+    shape_keys = getattr(mesh, "shape_keys", None)
+    if shape_keys is not None:
+        _hash_rna(h, shape_keys)
+        for block in shape_keys.key_blocks:
+            _hash_values(h, ("shape_key", block.name))
+            _hash_rna(h, block)
+            h.update(_bulk_get_vectors(block.data, "co", count).tobytes())
+
+
+def _hash_object_data(h, obj):
+    """Feed the render-relevant settings of an object's data (mesh, light, camera) into h."""
+    data = obj.data
+    _hash_values(h, ("data", data.name))
+    if obj.type == 'MESH':
+        _hash_mesh(h, data)
+    elif obj.type == 'LIGHT':
+        _hash_rna(h, data)
+        if getattr(data, "use_nodes", False) and data.node_tree:
+            _hash_node_tree(h, data.node_tree)
+    elif obj.type == 'CAMERA':
+        _hash_rna(h, data)
+        _hash_rna(h, getattr(data, "dof", None))
+    else:
+        _hash_rna(h, data)
+
+
+def scene_fingerprint(scene) -> str:
+    """Hash the scene state that affects a still render.
+
+    Covers render, engine and colour management settings, the camera, world, every
+    renderable object's world transform and modifier stack, mesh geometry, light and camera
+    data, and the materials in use. Objects a modifier points at are hashed even when they
+    are hidden from the render. Shared meshes and materials are hashed once per call.
+    """
+    h = hashlib.sha256()
+    render = scene.render
+    _hash_values(h, (
+        render.engine, render.resolution_x, render.resolution_y, render.resolution_percentage,
+        render.image_settings.file_format, render.film_transparent, scene.frame_current,
+        scene.camera.name if scene.camera else None,
+    ))
+    _hash_rna(h, render, _RENDER_SKIP_PROPS)
+    _hash_rna(h, render.image_settings)
+    for settings in ("cycles", "eevee", "view_settings", "display_settings"):
+        _hash_values(h, settings)
+        _hash_rna(h, getattr(scene, settings, None))
+    cycles = getattr(scene, "cycles", None)
+    if cycles is not None:
+        _hash_values(h, ("cycles", cycles.samples))
+    eevee = getattr(scene, "eevee", None)
+    if eevee is not None:
+        _hash_values(h, ("eevee", eevee.taa_render_samples))
+    if scene.world is not None:
+        _hash_values(h, ("world", scene.world.name, tuple(scene.world.color)))
+        if scene.world.use_nodes and scene.world.node_tree:
+            _hash_material(h, scene.world)
+
+    hashed_objects, hashed_data, hashed_materials = set(), set(), set()
+    referenced = []
+
+    def hash_object(obj):
+        hashed_objects.add(obj.name)
+        _hash_values(h, (obj.name, obj.type, tuple(tuple(row) for row in obj.matrix_world)))
+        for modifier in getattr(obj, "modifiers", ()):
+            _hash_values(h, ("modifier", modifier.name, modifier.type))
+            _hash_rna(h, modifier, referenced=referenced)
+
+        data = obj.data
+        if data is not None and (obj.type, data.name) not in hashed_data:
+            hashed_data.add((obj.type, data.name))
+            _hash_object_data(h, obj)
+
+        for slot in obj.material_slots:
+            mat = slot.material
+            _hash_values(h, ("slot", slot.link, mat.name if mat else None))
+            if mat is not None and mat.name not in hashed_materials:
+                hashed_materials.add(mat.name)
+                _hash_material(h, mat)
+
+    for obj in sorted(scene.objects, key=lambda o: o.name):
+        if not obj.hide_render:
+            hash_object(obj)
+    while referenced:
+        obj = referenced.pop()
+        if obj.name not in hashed_objects:
+            hash_object(obj)
+
+    return h.hexdigest()
+
+
+class RenderCache:
+    """Size-bounded, on-disk LRU store of rendered images keyed by scene fingerprint.
+
+    Entries are files named after the fingerprint; recency is kept in memory and
+    mirrored in file mtimes so the LRU order survives a server restart.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_entries: int, enabled: bool = True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.isdir(self.directory):
+            return
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        for _, path, size in sorted(files):
+            fingerprint = os.path.splitext(os.path.basename(path))[0]
+            self._entries[fingerprint] = (path, size)
+        self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self._entries.values())
+
+    def fetch(self, fingerprint: str, destination: str) -> bool:
+        """Copy the cached render for fingerprint to destination. Returns False on a miss."""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None or not os.path.exists(entry[0]):
+                self._entries.pop(fingerprint, None)
+                self.misses += 1
+                return False
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+
+        path = entry[0]
+        os.utime(path)
+        if os.path.abspath(path) != os.path.abspath(destination):
+            # Blender creates the output directory when it writes a render
+            os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+            shutil.copyfile(path, destination)
+        return True
+
+    def store(self, fingerprint: str, source: str):
+        """Copy a freshly rendered file into the cache and evict down to the limits."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, fingerprint + os.path.splitext(source)[1])
+        shutil.copyfile(source, path)
+        with self._lock:
+            self._entries[fingerprint] = (path, os.path.getsize(path))
+            self._entries.move_to_end(fingerprint)
+            self.stores += 1
+            self._evict()
+
+    def _remove_oldest(self):
+        _, (path, _) = self._entries.popitem(last=False)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._entries and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            self._remove_oldest()
+            self.evictions += 1
+
+    def configure(self, max_bytes: int | None = None, max_entries: int | None = None,
+                  enabled: bool | None = None, clear: bool = False):
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if enabled is not None:
+                self.enabled = enabled
+            if clear:
+                while self._entries:
+                    self._remove_oldest()
+            self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+
+render_cache = RenderCache(
+    os.environ.get("BLENDER_MCP_RENDER_CACHE_DIR",
+                   os.path.join(tempfile.gettempdir(), "blender_mcp_render_cache")),
+    max_bytes=int(float(os.environ.get("BLENDER_MCP_RENDER_CACHE_MB", "512")) * 1024 * 1024),
+    max_entries=int(os.environ.get("BLENDER_MCP_RENDER_CACHE_ENTRIES", "256")),
+    enabled=os.environ.get("BLENDER_MCP_RENDER_CACHE", "1") != "0",
+)
+
+
+class RenderJobQueue:
+    """Bounded queue of render jobs, executed one at a time through the bpy executor.
+
+    Jobs are owned by the asyncio loop; only the render itself runs on the bpy thread,
+    so status polling and cancellation stay responsive while a render is in progress.
+
+    Animation jobs each start a pool of worker processes, so at most max_animations run
+    at once; later ones stay queued (up to maxsize of them) until a slot frees.
+    """
+
+    def __init__(self, executor: BpyExecutor, maxsize: int = 8, history: int = 64, max_animations: int = 1):
+        self.executor = executor
+        self.maxsize = maxsize
+        self.history = history
+        self.max_animations = max(1, max_animations)
+        self._jobs: OrderedDict[str, RenderJob] = OrderedDict()
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._animation_slots: asyncio.Semaphore | None = None
+        self._ids = itertools.count(1)
+
+    def submit(self, filepath: str, resolution_x: int, resolution_y: int, use_cache: bool = True,
+               preview: dict | None = None) -> RenderJob:
+        """Queue a render job. Must be called from the asyncio loop.
+
+        A preview job renders into job.image instead of filepath and skips the render cache.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run_jobs())
+
+        job = RenderJob(f"render-{next(self._ids)}", filepath, resolution_x, resolution_y,
+                        use_cache=use_cache and not preview, preview=preview)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise RuntimeError(f"Render queue is full ({self.maxsize} jobs pending)") from None
+
+        self._jobs[job.job_id] = job
+        self._prune()
+        return job
+
+    def submit_animation(self, filepath: str, resolution_x: int | None, resolution_y: int | None,
+                         **options) -> AnimationJob:
+        """Start a render_animation job. Must be called from the asyncio loop.
+
+        Animation jobs run in worker processes, beside the still-render queue; only the
+        snapshot they render from is taken on the bpy thread.
+        """
+        active = [job for job in self._jobs.values()
+                  if isinstance(job, AnimationJob) and job.status in ("queued", "running")]
+        if len(active) - self.max_animations >= self.maxsize:
+            raise RuntimeError(f"Animation queue is full ({self.maxsize} jobs waiting)")
+        if self._animation_slots is None:
+            self._animation_slots = asyncio.Semaphore(self.max_animations)
+
+        job = AnimationJob(f"animation-{next(self._ids)}", filepath, resolution_x, resolution_y,
+                           use_cache=False, **options)
+        if len(active) >= self.max_animations:
+            job.message = f"Waiting for a free animation slot ({len(active)} jobs ahead)"
+        self._jobs[job.job_id] = job
+        self._prune()
+        asyncio.get_running_loop().create_task(self._run_animation(job))
+        return job
+
+    async def _run_animation(self, job: AnimationJob):
+        async with self._animation_slots:
+            # Cancelled while waiting for a slot
+            if job.status == "queued":
+                await self._render_animation(job)
+
+    async def _render_animation(self, job: AnimationJob):
+        job.status = "running"
+        job.started_at = time.time()
+        workdir = tempfile.mkdtemp(prefix="blender_mcp_anim_")
+        try:
+            command = _render_worker_command()
+            blend = os.path.join(workdir, "snapshot.blend")
+            info = await self.executor.run(_save_render_snapshot, blend, job.filepath, job.resolution_x,
+                                           job.resolution_y, priority="heavy")
+            job.scene_name = info["scene"]
+            job.filepath = info["output_path"]
+            job.resolution_x, job.resolution_y = info["resolution"]
+            start = info["frame_start"] if job.frame_start is None else job.frame_start
+            end = info["frame_end"] if job.frame_end is None else job.frame_end
+            step = info["frame_step"] if job.frame_step is None else job.frame_step
+            job.frames = list(range(start, end + 1, max(1, step)))
+            if not job.frames:
+                raise ValueError(f"The frame range {start}..{end} is empty")
+            job.message = f"Rendering {len(job.frames)} frames on {job.workers} workers"
+            errors = await _run_animation_job(job, command, blend)
+        except Exception as e:
+            logger.error(f"Animation job {job.job_id} failed: {e}", exc_info=True)
+            self._finish(job, "failed", str(e))
+        else:
+            if job.cancel_requested:
+                self._finish(job, "cancelled")
+            elif errors:
+                self._finish(job, "failed", "; ".join(errors))
+            else:
+                self._finish(job, "done")
+        finally:
+            job.terminate_workers()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def get(self, job_id: str) -> RenderJob:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Render job '{job_id}' not found")
+        return job
+
+    def list(self) -> list[RenderJob]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> RenderJob:
+        """Cancel a queued job, or flag a running one so its result is discarded."""
+        job = self.get(job_id)
+        if job.status == "queued":
+            self._finish(job, "cancelled")
+        elif job.status == "running":
+            # Blender offers no API to abort a background render from Python; animation
+            # workers are separate processes and are stopped
+            job.cancel_requested = True
+            if isinstance(job, AnimationJob):
+                job.terminate_workers()
+        return job
+
+    async def _run_jobs(self):
+        while True:
+            job = await self._queue.get()
+            if job.status != "queued":
+                continue
+
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                await self.executor.run(_render_preview if job.preview else _render_still, job, priority="heavy")
+            except Exception as e:
+                logger.error(f"Render job {job.job_id} failed: {e}", exc_info=True)
+                self._finish(job, "failed", str(e))
+            else:
+                if job.cancel_requested:
+                    self._finish(job, "cancelled")
+                else:
+                    job.progress = 1.0
+                    self._finish(job, "done")
+
+    def _finish(self, job: RenderJob, status: str, error: str | None = None):
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.done.set()
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.status in ("done", "failed", "cancelled")]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job.job_id]
+
+
+render_jobs = RenderJobQueue(bpy_executor, maxsize=int(os.environ.get("BLENDER_MCP_RENDER_QUEUE_SIZE", "8")),
+                             max_animations=int(os.environ.get("BLENDER_MCP_ANIMATION_JOBS", "1")))
+
+
+class AutoSaver:
+    """Coalesced saves of the .blend file, run on the bpy thread at heavy priority.
+
+    save_blend_file queues a request and by default waits for it. A request made while no
+    save is queued or running starts one at once; requests arriving while a save runs share
+    the next one, and saves after that start at most once per `window` seconds, so a burst
+    of requests for one file costs one save now and one at the end of the burst. A save is skipped when the file is unchanged since the last save
+    to it: bpy.data.is_dirty is false and no non-read call has run since (the executor
+    generation). With snapshots > 0 every save is also copied to <name>_snapshots/ as
+    <name>.NNNN.blend, keeping the newest `snapshots` copies. With interval > 0 the open
+    file is saved every interval seconds, which costs nothing while it is unchanged.
+
+    Requests, stats and the timers belong to the asyncio loop.
+    """
+
+    def __init__(self, executor: BpyExecutor, window: float, compress: bool, snapshots: int, interval: float):
+        self.executor = executor
+        self.window = window
+        self.compress = compress
+        self.snapshots = snapshots
+        self.interval = interval
+        self.requests = 0
+        self.coalesced = 0
+        self.saves = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.save_seconds = 0.0
+        self.max_save_seconds = 0.0
+        self.last: dict | None = None
+        # The most recent failure, cleared by the next successful save
+        self.last_error: dict | None = None
+        # filepath (None: the open file) -> [compress override, futures waiting on the save]
+        self._pending: dict[str | None, list] = {}
+        self._flusher: asyncio.Task | None = None
+        # When the flusher last started a round of saves (time.monotonic())
+        self._last_flush = -math.inf
+        self._timer: asyncio.Task | None = None
+        # Absolute path -> executor generation just after the last save to it; bpy thread only
+        self._saved_generation: dict[str, int] = {}
+
+    def request(self, filepath: str | None, compress: bool | None = None) -> asyncio.Future:
+        """Queue a save of filepath and return a future for its result. Must be called from the asyncio loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.requests += 1
+        entry = self._pending.get(filepath)
+        if entry is None:
+            self._pending[filepath] = [compress, [future]]
+        else:
+            self.coalesced += 1
+            if compress is not None:
+                entry[0] = compress
+            entry[1].append(future)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_throttled())
+        return future
+
+    async def _flush_throttled(self):
+        """Run pending saves now, then later arrivals at most once per window."""
+        while self._pending:
+            delay = self._last_flush + self.window - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_flush = time.monotonic()
+            await self.flush()
+
+    async def flush(self):
+        """Run every pending save now."""
+        while self._pending:
+            filepath = next(iter(self._pending))
+            compress, futures = self._pending.pop(filepath)
+            result = await self._save(filepath, self.compress if compress is None else compress)
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+
+    async def _save(self, filepath: str | None, compress: bool) -> dict:
+        try:
+            result = await self.executor.run(self._save_now, filepath, compress, priority="heavy")
+            if result["status"] == "saved" and self.snapshots > 0:
+                result["snapshot"] = await asyncio.to_thread(self._snapshot, result["filepath"])
+        except Exception as e:
+            logger.error(f"Saving {filepath or 'the open file'} failed: {e}", exc_info=True)
+            self.failed += 1
+            self.last_error = {"filepath": filepath, "error": str(e), "failed_at": time.time()}
+            return {"status": "failed", "filepath": filepath, "error": str(e)}
+
+        if result["status"] == "saved":
+            self.saves += 1
+            self.bytes_written += result["bytes"]
+            self.save_seconds += result["seconds"]
+            self.max_save_seconds = max(self.max_save_seconds, result["seconds"])
+            self.last = dict(result, finished_at=time.time())
+            self.last_error = None
+        else:
+            self.skipped += 1
+        return result
+
+    def _save_now(self, filepath: str | None, compress: bool) -> dict:
+        """Save unless nothing changed since the last save to the same file. Runs on the bpy thread."""
+        path = os.path.abspath(bpy.path.abspath(filepath)) if filepath else bpy.data.filepath
+        if not path:
+            return {"status": "skipped", "reason": "the open file has never been saved"}
+        generation = self.executor.generation
+        unchanged = (not bpy.data.is_dirty and path == bpy.data.filepath and os.path.exists(path)
+                     and self._saved_generation.get(path) == generation)
+        if unchanged:
+            # The executor counts this call too once it returns
+            self._saved_generation[path] = generation + 1
+            return {"status": "skipped", "filepath": path, "reason": "no changes since the last save"}
+
+        started = time.perf_counter()
+        with tracer.span("wm.save_as_mainfile", "operator", compress=compress):
+            bpy.ops.wm.save_as_mainfile(filepath=path, compress=compress)
+        seconds = time.perf_counter() - started
+        self._saved_generation[path] = generation + 1
+        return {
+            "status": "saved",
+            "filepath": path,
+            "compressed": compress,
+            "bytes": os.path.getsize(path),
+            "seconds": round(seconds, 4),
+        }
+
+    def _snapshot(self, path: str) -> str:
+        """Copy a saved file to the next numbered snapshot and drop the oldest ones."""
+        stem, ext = os.path.splitext(os.path.basename(path))
+        directory = os.path.join(os.path.dirname(path), f"{stem}_snapshots")
+        os.makedirs(directory, exist_ok=True)
+        pattern = re.compile(rf"^{re.escape(stem)}\.(\d+){re.escape(ext)}$")
+        numbers = sorted(int(match.group(1)) for match in map(pattern.match, os.listdir(directory)) if match)
+        numbers.append(numbers[-1] + 1 if numbers else 1)
+        target = os.path.join(directory, f"{stem}.{numbers[-1]:04d}{ext}")
+        shutil.copyfile(path, target)
+        for number in numbers[:-self.snapshots]:
+            try:
+                os.remove(os.path.join(directory, f"{stem}.{number:04d}{ext}"))
+            except OSError:
+                pass
+        return target
+
+    def start(self):
+        """Start or stop the periodic save to match interval. Must be called from the asyncio loop."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.interval > 0:
+            self._timer = asyncio.get_running_loop().create_task(self._save_periodically())
+
+    async def _save_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.request(None)
+
+    def configure(self, window: float | None = None, compress: bool | None = None,
+                  snapshots: int | None = None, interval: float | None = None):
+        if window is not None:
+            self.window = max(0.0, window)
+        if compress is not None:
+            self.compress = compress
+        if snapshots is not None:
+            self.snapshots = max(0, snapshots)
+        if interval is not None:
+            self.interval = max(0.0, interval)
+            self.start()
+
+    def stats(self) -> dict:
+        return {
+            "window_seconds": self.window,
+            "compress": self.compress,
+            "snapshots": self.snapshots,
+            "interval_seconds": self.interval,
+            "pending": len(self._pending),
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "saves": self.saves,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "bytes_written": self.bytes_written,
+            "save_seconds": round(self.save_seconds, 4),
+            "max_save_seconds": round(self.max_save_seconds, 4),
+            "last_save": self.last,
+            "last_error": self.last_error,
+        }
+
+
+autosaver = AutoSaver(
+    bpy_executor,
+    window=float(os.environ.get("BLENDER_MCP_AUTOSAVE_WINDOW", "1.0")),
+    compress=os.environ.get("BLENDER_MCP_AUTOSAVE_COMPRESS", "0") == "1",
+    snapshots=int(os.environ.get("BLENDER_MCP_AUTOSAVE_SNAPSHOTS", "0")),
+    interval=float(os.environ.get("BLENDER_MCP_AUTOSAVE_INTERVAL", "0")),
+)
+
+
+class CodeCache:
+    """LRU of compiled execute_python code objects keyed by the source's sha256."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, source: str):
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return code
+            self.misses += 1
+
+        # A SyntaxError propagates and is not cached
+        code = compile(source, "<execute_python>", "exec")
+        with self._lock:
+            self._entries[key] = code
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return code
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+code_cache = CodeCache(int(os.environ.get("BLENDER_MCP_CODE_CACHE_SIZE", "128")))
+
+
+def _approximate_size(value: Any, seen: set, depth: int = 0) -> int:
+    """Bytes held by value, following containers; modules, bpy data and classes count shallowly."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if np is not None and isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.base is not None else value.nbytes)
+    size = sys.getsizeof(value)
+    if depth >= 8:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _approximate_size(key, seen, depth + 1) + _approximate_size(item, seen, depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        for item in value:
+            size += _approximate_size(item, seen, depth + 1)
+    return size
+
+
+@dataclass
+class PythonSession:
+    """A named execute_python namespace that persists between calls."""
+    name: str
+    namespace: dict
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    calls: int = 0
+
+    def to_dict(self) -> dict:
+        # Skip the injected bpy module and Python's own __builtins__
+        names = [key for key in self.namespace if key not in ("bpy", "__builtins__")]
+        seen = {id(bpy), id(self.namespace.get("__builtins__"))}
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "names": len(names),
+            "approx_bytes": sum(_approximate_size(self.namespace[key], seen) for key in names),
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+        }
+
+
+python_sessions: dict[str, PythonSession] = {}
+
+# Characters of execute_python output kept per call; older output is dropped first
+SCRIPT_OUTPUT_CHARS = int(os.environ.get("BLENDER_MCP_SCRIPT_OUTPUT_CHARS", "65536"))
+# Default execute_python time limit in seconds; 0 means none
+SCRIPT_TIME_LIMIT = float(os.environ.get("BLENDER_MCP_SCRIPT_TIME_LIMIT", "0"))
+# Seconds between output notifications while a script runs
+SCRIPT_STREAM_INTERVAL = 0.25
+
+
+class ScriptInterrupted(BaseException):
+    """Raised inside an execute_python script to stop it.
+
+    A BaseException, so that the script's own `except Exception` blocks let it through.
+    """
+
+
+class _TextTail:
+    """The last `limit` characters appended, and a count of those dropped before them."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: deque[str] = deque()
+        self.size = 0
+        self.dropped = 0
+
+    def append(self, text: str):
+        self.parts.append(text)
+        self.size += len(text)
+        while self.size > self.limit:
+            excess = self.size - self.limit
+            first = self.parts[0]
+            if len(first) <= excess:
+                self.parts.popleft()
+                excess = len(first)
+            else:
+                self.parts[0] = first[excess:]
+            self.size -= excess
+            self.dropped += excess
+
+    def __str__(self) -> str:
+        return "".join(self.parts)
+
+
+def _set_async_exception(thread_id: int, exception: type[BaseException] | None) -> int:
+    """Raise exception in another thread at its next check between bytecodes; None clears it.
+
+    Returns the number of threads it was set for: 1, or 0 when thread_id is not running.
+    """
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exception) if exception is not None else None
+    )
+
+
+class ScriptRun:
+    """One execute_python call: the output it prints, and a way to stop it.
+
+    Output goes to a bounded buffer for the result and to a second one that the asyncio
+    side drains to stream notifications. interrupt() raises ScriptInterrupted in the bpy
+    thread (PyThreadState_SetAsyncExc), so the stop is cooperative: it takes effect at
+    the script's next Python bytecode, after any C call in progress (a render, an
+    operator) returns. A run stopped while still queued never starts. stop_reason is set
+    only when the script was actually stopped: a script that returns before the exception
+    is raised, or catches it and carries on, finishes normally.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, time_limit: float, output_limit: int = SCRIPT_OUTPUT_CHARS):
+        self.script_id = f"python-{next(self._ids)}"
+        self.time_limit = time_limit
+        self.state = "queued"  # queued, running, finished
+        self.stop_reason: str | None = None
+        # Reason for an interrupt delivered to the running script but not yet raised in it
+        self._interrupt_reason: str | None = None
+        self.started_at: float | None = None
+        self.output = _TextTail(output_limit)
+        self._unsent = _TextTail(output_limit)
+        self._thread_id: int | None = None
+        self._lock = threading.Lock()
+
+    def write(self, text: str):
+        with self._lock:
+            self.output.append(text)
+            self._unsent.append(text)
+
+    def take_unsent(self) -> str:
+        """Output written since the last call (prefixed with a note if some was dropped)."""
+        with self._lock:
+            text, dropped = str(self._unsent), self._unsent.dropped
+            self._unsent = _TextTail(self._unsent.limit)
+        return f"[{dropped} characters dropped]\n{text}" if dropped else text
+
+    def interrupt(self, reason: str) -> bool:
+        """Stop the script; False when it has already finished."""
+        with self._lock:
+            if self.state == "finished":
+                return False
+            if self.state == "queued":
+                # run() checks this under the lock, so the script never starts
+                self.stop_reason = self.stop_reason or reason
+                return True
+            if _set_async_exception(self._thread_id, ScriptInterrupted) != 1:
+                return False
+            self._interrupt_reason = self._interrupt_reason or reason
+            return True
+
+    def run(self, func):
+        """Call func on the bpy thread as this script, capturing its output."""
+        token = _current_script.set(self)
+        interrupted = False
+        try:
+            with self._lock:
+                if self.stop_reason:
+                    return None
+                self.state = "running"
+                self.started_at = time.perf_counter()
+                self._thread_id = threading.get_ident()
+            return func()
+        except ScriptInterrupted:
+            interrupted = True
+            return None
+        finally:
+            # An interrupt can arrive before the lock is taken here; retry until the state is final
+            while True:
+                try:
+                    self._finish(interrupted)
+                    break
+                except ScriptInterrupted:
+                    pass
+            _current_script.reset(token)
+
+    def _finish(self, interrupted: bool):
+        with self._lock:
+            if self.state == "running" and self._interrupt_reason:
+                # Drop an interrupt that was delivered but has not been raised yet
+                _set_async_exception(self._thread_id, None)
+                if interrupted:
+                    self.stop_reason = self._interrupt_reason
+            self.state = "finished"
+
+
+# Scripts queued or running, by id, for cancel_python
+running_scripts: dict[str, ScriptRun] = {}
+
+# The ScriptRun whose code is executing on this thread, if any
+_current_script: contextvars.ContextVar[ScriptRun | None] = contextvars.ContextVar("current_script", default=None)
+
+
+class _ScriptStream:
+    """Stands in for sys.stdout or sys.stderr: text an execute_python script writes goes to
+    its ScriptRun, anything written by other code or other threads to the original stream."""
+
+    def __init__(self, original):
+        self._original = original
+
+    def write(self, text: str) -> int:
+        run = _current_script.get()
+        if run is None:
+            return self._original.write(text)
+        run.write(text)
+        return len(text)
+
+    def flush(self):
+        if _current_script.get() is None:
+            self._original.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+
+def _capture_script_output():
+    """Route sys.stdout and sys.stderr through _ScriptStream (once)."""
+    if not isinstance(sys.stdout, _ScriptStream):
+        sys.stdout = _ScriptStream(sys.stdout)
+    if not isinstance(sys.stderr, _ScriptStream):
+        sys.stderr = _ScriptStream(sys.stderr)
+
+
+class ToolStats:
+    """Call count, error count and recent latencies for one tool."""
+
+    def __init__(self, window: int = 2048):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, error: bool):
+        self.count += 1
+        self.errors += int(error)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._latencies.append(seconds)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000.0, 3),
+            "mean_ms": round(self.total_seconds * 1000.0 / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(percentile(0.50), 3),
+            "p95_ms": round(percentile(0.95), 3),
+            "p99_ms": round(percentile(0.99), 3),
+            "max_ms": round(self.max_seconds * 1000.0, 3),
+        }
+
+
+@dataclass
+class RegisteredTool:
+    """A tool handler together with its MCP schema, built once at registration."""
+    tool: Tool
+    handler: Callable[[Any], Any]
+    bpy_thread: bool
+    priority: str
+
+
+class Tracer:
+    """Opt-in recorder of Chrome trace events, viewable in chrome://tracing or ui.perfetto.dev.
+
+    Each JSON-RPC request becomes an async span from the moment it is read to the
+    moment its response is written, with nested phases: "parse" (the MCP layer
+    decoding and validating it), "tool <name>", "queue" (waiting for the bpy thread)
+    and "respond" (building and writing the response). The bpy thread's work is
+    recorded as complete events on that thread: each tool call, view layer updates
+    (depsgraph evaluation), snapshot refreshes and execute_python's compile and exec.
+
+    Disabled, each call site costs one attribute check; span() returns a shared null
+    context. Events are kept in memory, up to max_events, until export() writes them.
+    """
+
+    def __init__(self, max_events: int = 1_000_000):
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+        # (client, request id) -> [read at, method, [(phase, start, end), ...]]
+        self._requests: dict[tuple[str, Any], list] = {}
+        self._threads: dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._null = contextlib.nullcontext()
+
+    def start(self):
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+        with self._lock:
+            self._requests.clear()
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._requests.clear()
+            self.dropped = 0
+
+    def _add(self, events: list[dict]):
+        with self._lock:
+            room = self.max_events - len(self._events)
+            if room < len(events):
+                self.dropped += len(events) - max(room, 0)
+                events = events[:max(room, 0)]
+            self._events.extend(events)
+
+    def _event(self, name: str, cat: str, ph: str, at: float, **fields) -> dict:
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        return {"name": name, "cat": cat, "ph": ph, "ts": round((at - self._origin) * 1e6, 1),
+                "pid": self._pid, "tid": thread.ident, **fields}
+
+    def complete(self, name: str, cat: str, started: float, ended: float, args: dict | None = None):
+        """Record a span on the current thread."""
+        event = self._event(name, cat, "X", started, dur=round((ended - started) * 1e6, 1))
+        if args:
+            event["args"] = args
+        self._add([event])
+
+    @contextlib.contextmanager
+    def _span(self, name: str, cat: str, args: dict):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, started, time.perf_counter(), args)
+
+    def span(self, name: str, cat: str, **args):
+        """Context manager recording its body as a span on the current thread."""
+        if not self.enabled:
+            return self._null
+        return self._span(name, cat, args)
+
+    def request_read(self, client: str, request_id, method: str):
+        self._requests[(client, request_id)] = [time.perf_counter(), method, []]
+
+    def current_request(self) -> list | None:
+        """The trace record of the JSON-RPC request being handled, if it was read while tracing."""
+        try:
+            request_id = app.request_context.request_id
+        except LookupError:
+            return None
+        return self._requests.get((current_client.get(), request_id))
+
+    def wrap(self, func, name: str, request: list | None):
+        """func as run on the bpy thread, recording its queue wait and the call itself."""
+        submitted = time.perf_counter()
+
+        def traced(*args, **kwargs):
+            started = time.perf_counter()
+            if request is not None:
+                request[2].append(("queue", submitted, started))
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.complete(name, "bpy", started, time.perf_counter())
+        return traced
+
+    def response_sent(self, client: str, request_id):
+        """Close the request's async span and its phases."""
+        with self._lock:
+            request = self._requests.pop((client, request_id), None)
+        if request is None:
+            return
+        read_at, method, phases = request
+        sent_at = time.perf_counter()
+        trace_id = f"{client}:{request_id}"
+        phases = sorted(phases, key=lambda phase: phase[1])
+        if phases:
+            phases.insert(0, ("parse", read_at, phases[0][1]))
+            phases.append(("respond", max(end for _, _, end in phases), sent_at))
+        events = [self._event(method, "jsonrpc", "b", read_at, id=trace_id)]
+        for phase, started, ended in phases:
+            events.append(self._event(phase, "jsonrpc", "b", started, id=trace_id))
+            events.append(self._event(phase, "jsonrpc", "e", ended, id=trace_id))
+        events.append(self._event(method, "jsonrpc", "e", sent_at, id=trace_id))
+        self._add(events)
+
+    def export(self, path: str) -> int:
+        """Write the recorded events as a Chrome trace JSON file; returns the event count."""
+        with self._lock:
+            events = list(self._events)
+        names = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": ident, "args": {"name": name}}
+                 for ident, name in self._threads.items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"enabled": self.enabled, "events": len(self._events), "dropped": self.dropped,
+                    "open_requests": len(self._requests)}
+
+
+tracer = Tracer()
+if os.environ.get("BLENDER_MCP_TRACE"):
+    tracer.start()
+
+
+class ToolRegistry:
+    """Table of tool handlers keyed by name, with per-tool latency statistics.
+
+    Handlers registered with bpy_thread=True are plain functions run on the bpy thread
+    through the executor, scheduled by their priority class (see BpyExecutor); the
+    others are coroutines run directly on the asyncio loop. Results of "read" tools are
+    served from the read snapshot when it is current.
+    """
+
+    def __init__(self, executor: BpyExecutor, snapshot: ReadSnapshot):
+        self.executor = executor
+        self.snapshot = snapshot
+        self._tools: dict[str, RegisteredTool] = {}
+        self._tool_list: list[Tool] = []
+        self._stats: dict[str, ToolStats] = {}
+        self.started_at = time.time()
+
+    def register(self, name: str, description: str, input_schema: dict, bpy_thread: bool = True,
+                 priority: str = "write"):
+        """Decorator registering a tool handler under name."""
+        def decorator(handler):
+            tool = Tool(name=name, description=description, inputSchema=input_schema)
+            self._tools[name] = RegisteredTool(tool, handler, bpy_thread, priority)
+            self._tool_list.append(tool)
+            self._stats[name] = ToolStats()
+            return handler
+        return decorator
+
+    def list_tools(self) -> list[Tool]:
+        return self._tool_list
+
+    async def call(self, name: str, arguments: Any) -> list[TextContent]:
+        """Dispatch a tool call, timing it and recording failures."""
+        registered = self._tools.get(name)
+        if registered is None:
+            return [TextContent(
+                type="text",
+                text=f"Error: Unknown tool '{name}'"
+            )]
+
+        started = time.perf_counter()
+        handler, compute = registered.handler, self.snapshot.compute
+        request = None
+        if tracer.enabled:
+            request = tracer.current_request()
+            if registered.bpy_thread and registered.priority == "read":
+                compute = tracer.wrap(compute, name, request)
+            elif registered.bpy_thread:
+                handler = tracer.wrap(handler, name, request)
+
+        error = True
+        try:
+            if registered.bpy_thread and registered.priority == "read":
+                key = self.snapshot.key(name, arguments)
+                result = self.snapshot.lookup(key)
+                if result is None:
+                    result = await self.executor.run(compute, key, registered.handler, arguments, priority="read")
+            elif registered.bpy_thread:
+                result = await self.executor.run(handler, arguments, priority=registered.priority)
+            else:
+                result = await handler(arguments)
+            # Handlers report expected failures as "Error: ..." text rather than raising
+            error = _is_error_result(result)
+            return result
+        except Exception as e:
+            logger.error(f"Error executing {name}: {e}", exc_info=True)
+            return [TextContent(
+                type="text",
+                text=f"Error executing {name}: {str(e)}"
+            )]
+        finally:
+            ended = time.perf_counter()
+            self._stats[name].record(ended - started, error)
+            if request is not None:
+                request[2].append((f"tool {name}", started, ended))
+
+    def call_inline(self, name: str, arguments: Any) -> list[TextContent]:
+        """Run a bpy-thread tool directly, from code already on the bpy thread (the batch tool)."""
+        registered = self._tools.get(name)
+        if registered is None or not registered.bpy_thread:
+            return [TextContent(
+                type="text",
+                text=f"Error: Unknown tool '{name}'"
+            )]
+
+        started = time.perf_counter()
+        error = True
+        try:
+            with tracer.span(name, "bpy"):
+                result = registered.handler(arguments)
+            error = _is_error_result(result)
+            return result
+        except Exception as e:
+            logger.error(f"Error executing {name}: {e}", exc_info=True)
+            return [TextContent(
+                type="text",
+                text=f"Error executing {name}: {str(e)}"
+            )]
+        finally:
+            self._stats[name].record(time.perf_counter() - started, error)
+
+    def stats(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "tools": {name: stats.to_dict() for name, stats in self._stats.items() if stats.count},
+        }
+
+    def write_stats(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, indent=2)
+
+
+def _is_error_result(result) -> bool:
+    return bool(result) and isinstance(result[0], TextContent) and result[0].text.startswith("Error")
+
+
+tools = ToolRegistry(bpy_executor, read_snapshot)
+
+
+# Datablock types the batch journal diffs to find what a batch created
+JOURNAL_DATABLOCKS = ("objects", "meshes", "materials", "collections")
+
+
+class Transaction:
+    """Journal for the batch tool.
+
+    While a batch runs, tools report scene changes through _scene_changed() and the
+    view layer update and spatial index refresh happen once, in commit(). With rollback
+    enabled the journal also records enough to undo the batch without Blender's undo
+    stack (which is not available in background mode):
+
+    - names of existing datablocks, so anything the batch created can be removed
+    - a bulk snapshot of every object's transform, taken before the first transform step
+    - material slots of the objects a material step is about to change
+    - deleted objects, which are only renamed and unlinked until the batch commits
+    """
+
+    def __init__(self, rollback: bool):
+        self.rollback_enabled = rollback
+        self._touched: set[str] = set()
+        self._touch_all = False
+        self._deleted: list[tuple[Any, str, list]] = []
+        self._transforms = None
+        self._materials: dict[str, tuple] = {}
+        self._datablocks = ({attr: set(getattr(bpy.data, attr).keys()) for attr in JOURNAL_DATABLOCKS}
+                            if rollback else {})
+
+    def touch(self, objects):
+        if objects is None:
+            self._touch_all = True
+        else:
+            self._touched.update(obj.name for obj in objects)
+
+    def record(self, tool_name: str, arguments: dict):
+        """Save the state the next step may change."""
+        if not self.rollback_enabled:
+            return
+        if tool_name in ("move_object", "set_transforms") and self._transforms is None:
+            objects = bpy.data.objects
+            count = len(objects)
+            self._transforms = (objects.keys(), {attr: _bulk_get_vectors(objects, attr, count)
+                                                 for attr in TRANSFORM_ATTRS.values()})
+        elif tool_name == "set_material":
+            self._save_materials(arguments.get("object_name"))
+        elif tool_name == "assign_materials":
+            for entry in arguments.get("assignments", []):
+                self._save_materials(entry.get("object_name"))
+
+    def _save_materials(self, obj_name):
+        obj = bpy.data.objects.get(obj_name or "")
+        if obj is None or obj.name in self._materials or not hasattr(obj.data, "materials"):
+            return
+        self._materials[obj.name] = (
+            list(obj.data.materials),
+            [(slot.link, slot.material) for slot in obj.material_slots],
+        )
+
+    def delete(self, obj):
+        """Delete obj at commit; until then it is renamed and unlinked so later steps don't see it."""
+        if not self.rollback_enabled:
+            bpy.data.objects.remove(obj, do_unlink=True)
+            return
+        name = obj.name
+        collections = list(obj.users_collection)
+        for collection in collections:
+            collection.objects.unlink(obj)
+        obj.name = f"{name}.mcp_deleted"
+        self._deleted.append((obj, name, collections))
+
+    def commit(self):
+        for obj, _, _ in self._deleted:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        self._deleted.clear()
+        self.flush()
+
+    def flush(self):
+        """The deferred view layer update and spatial index refresh."""
+        with tracer.span("view_layer.update", "depsgraph"):
+            bpy.context.view_layer.update()
+        if self._touch_all:
+            spatial_index.invalidate()
+        elif self._touched:
+            objects = bpy.data.objects
+            spatial_index.update(objects[name] for name in self._touched if name in objects)
+
+    def rollback(self):
+        """Put the scene back the way it was when the transaction started."""
+        # New objects: names that didn't exist, plus any that took the name of a deleted object
+        objects = bpy.data.objects
+        deleted_names = {obj.name for obj, _, _ in self._deleted}
+        created = set(objects.keys()) - self._datablocks["objects"] - deleted_names
+        created.update(name for obj, name, _ in self._deleted if name in objects and objects[name] != obj)
+        for name in created:
+            objects.remove(objects[name], do_unlink=True)
+
+        for obj, name, collections in reversed(self._deleted):
+            obj.name = name
+            for collection in collections:
+                collection.objects.link(obj)
+        self._deleted.clear()
+
+        if self._transforms is not None:
+            names, buffers = self._transforms
+            objects = bpy.data.objects
+            if objects.keys() == names:
+                for attr, buffer in buffers.items():
+                    objects.foreach_set(attr, buffer)
+            else:
+                for i, name in enumerate(names):
+                    obj = objects.get(name)
+                    if obj is not None:
+                        for attr, buffer in buffers.items():
+                            setattr(obj, attr, buffer[3 * i:3 * i + 3])
+
+        for obj_name, (data_materials, slots) in self._materials.items():
+            obj = bpy.data.objects[obj_name]
+            obj.data.materials.clear()
+            for mat in data_materials:
+                obj.data.materials.append(mat)
+            for slot, (link, mat) in zip(obj.material_slots, slots):
+                slot.link = link
+                slot.material = mat
+
+        for attr in ("meshes", "materials", "collections"):
+            datablocks = getattr(bpy.data, attr)
+            for name in set(datablocks.keys()) - self._datablocks[attr]:
+                datablocks.remove(datablocks[name])
+
+        material_library.invalidate()
+        self._touch_all = True
+        self.flush()
+
+
+# The transaction of the batch currently running on the bpy thread, if any
+active_transaction: Transaction | None = None
+
+
+def _scene_changed(objects=None):
+    """Update the view layer and the spatial index after a tool changed objects (None: anything).
+
+    Inside a batch this is deferred to the end of the batch.
+    """
+    if active_transaction is not None:
+        active_transaction.touch(objects)
+        return
+    with tracer.span("view_layer.update", "depsgraph"):
+        bpy.context.view_layer.update()
+    if objects is None:
+        spatial_index.invalidate()
+    else:
+        spatial_index.update(objects)
+
+
+@tools.register(
+    name="create_cube",
+    description="Create a cube in the Blender scene",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "location": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Location [x, y, z] for the cube",
+                "default": [0, 0, 0]
+            },
+            "scale": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Scale [x, y, z] for the cube",
+                "default": [1, 1, 1]
+            },
+            "name": {
+                "type": "string",
+                "description": "Name for the cube object"
+            }
+        }
+    }
+)
+def tool_create_cube(arguments: Any) -> list[TextContent]:
+    location = arguments.get("location", [0, 0, 0])
+    scale = arguments.get("scale", [1, 1, 1])
+    obj_name = arguments.get("name")
+
+    bpy.ops.mesh.primitive_cube_add(location=location)
+    obj = bpy.context.active_object
+    obj.scale = scale
+
+    if obj_name:
+        obj.name = obj_name
+
+    _scene_changed([obj])
+
+    return [TextContent(
+        type="text",
+        text=f"Created cube '{obj.name}' at location {location} with scale {scale}"
+    )]
+
+
+@tools.register(
+    name="create_sphere",
+    description="Create a UV sphere in the Blender scene",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "location": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Location [x, y, z] for the sphere",
+                "default": [0, 0, 0]
+            },
+            "radius": {
+                "type": "number",
+                "description": "Radius of the sphere",
+                "default": 1.0
+            },
+            "name": {
+                "type": "string",
+                "description": "Name for the sphere object"
+            }
+        }
+    }
+)
+def tool_create_sphere(arguments: Any) -> list[TextContent]:
+    location = arguments.get("location", [0, 0, 0])
+    radius = arguments.get("radius", 1.0)
+    obj_name = arguments.get("name")
+
+    bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, location=location)
+    obj = bpy.context.active_object
+
+    if obj_name:
+        obj.name = obj_name
+
+    _scene_changed([obj])
+
+    return [TextContent(
+        type="text",
+        text=f"Created sphere '{obj.name}' at location {location} with radius {radius}"
+    )]
+
+
+@tools.register(
+    name="create_objects_batch",
+    description="Create many primitive objects in one call, sharing mesh data between identical primitives",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "objects": {
+                "type": "array",
+                "description": "Object specs to create",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "type": {
+                            "type": "string",
+                            "description": f"Primitive type: {', '.join(BATCH_PRIMITIVE_TYPES)}",
+                            "default": "cube"
+                        },
+                        "name": {
+                            "type": "string",
+                            "description": "Name for the object"
+                        },
+                        "location": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Location [x, y, z]",
+                            "default": [0, 0, 0]
+                        },
+                        "rotation": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Euler rotation [x, y, z] in radians",
+                            "default": [0, 0, 0]
+                        },
+                        "scale": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Scale [x, y, z]",
+                            "default": [1, 1, 1]
+                        },
+                        "radius": {
+                            "type": "number",
+                            "description": "Radius for sphere/cylinder/cone (half the size for cube/plane)",
+                            "default": 1.0
+                        },
+                        "material": {
+                            "type": "string",
+                            "description": "Name of the material to assign (created if missing)"
+                        },
+                        "color": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "RGBA color [r, g, b, a] for the material"
+                        },
+                        "inputs": {
+                            "type": "object",
+                            "description": "Other Principled BSDF inputs for the material, by name"
+                        },
+                        "dedup_material": {
+                            "type": "boolean",
+                            "description": "Reuse an existing material with identical parameters "
+                                           "(default: BLENDER_MCP_MATERIAL_DEDUP)"
+                        }
+                    }
+                }
+            },
+            "collection": {
+                "type": "string",
+                "description": "Collection to link the new objects into (defaults to the scene collection)"
+            }
+        },
+        "required": ["objects"]
+    }
+)
+def tool_create_objects_batch(arguments: Any) -> list[TextContent]:
+    specs = arguments["objects"]
+    collection_name = arguments.get("collection")
+
+    if collection_name:
+        collection = bpy.data.collections.get(collection_name)
+        if collection is None:
+            return [TextContent(
+                type="text",
+                text=f"Error: Collection '{collection_name}' not found"
+            )]
+    else:
+        collection = bpy.context.scene.collection
+
+    results = []
+    for index, spec in enumerate(specs):
+        try:
+            obj = _create_batch_object(spec, collection)
+            results.append({"index": index, "ok": True, "name": obj.name})
+        except Exception as e:
+            results.append({"index": index, "ok": False, "error": str(e)})
+
+    # A single view layer update for the whole batch
+    _scene_changed([collection.objects[r["name"]] for r in results if r["ok"]])
+
+    created = sum(1 for r in results if r["ok"])
+    return [TextContent(
+        type="text",
+        text=json.dumps({
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
+        })
+    )]
+
+
+@tools.register(
+    name="create_mesh",
+    description="Create a mesh object from binary buffers (base64, or a local .npy/raw file that is "
+                "memory-mapped) for vertices, faces, normals and UVs, filled in bulk",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "name": {
+                "type": "string",
+                "description": "Name for the object and mesh",
+                "default": "Mesh"
+            },
+            "vertices": {
+                "type": "object",
+                "description": "Buffer of x, y, z per vertex: {\"base64\": ...} or {\"path\": ...}, "
+                               "with optional \"dtype\" (default float32) and \"offset\" (raw files)"
+            },
+            "faces": {
+                "type": "object",
+                "description": "Buffer of vertex indices, face after face (default dtype int32)"
+            },
+            "face_size": {
+                "type": "integer",
+                "description": "Vertices per face when all faces are the same size (default 3)",
+                "minimum": 3
+            },
+            "face_sizes": {
+                "type": "object",
+                "description": "Buffer of vertex counts per face, for meshes with mixed face sizes"
+            },
+            "normals": {
+                "type": "object",
+                "description": "Buffer of custom normals, x, y, z per vertex or per face corner"
+            },
+            "uvs": {
+                "type": "object",
+                "description": "Buffer of u, v per vertex or per face corner"
+            },
+            "location": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Location [x, y, z]",
+                "default": [0, 0, 0]
+            },
+            "collection": {
+                "type": "string",
+                "description": "Collection to link the object into (defaults to the scene collection)"
+            },
+            "validate": {
+                "type": "boolean",
+                "description": "Run Blender's mesh validation after filling",
+                "default": False
+            }
+        },
+        "required": ["vertices"]
+    },
+    priority="heavy"
+)
+def tool_create_mesh(arguments: Any) -> list[TextContent]:
+    started = time.perf_counter()
+    name = arguments.get("name", "Mesh")
+
+    collection_name = arguments.get("collection")
+    collection = bpy.data.collections.get(collection_name) if collection_name else bpy.context.scene.collection
+    if collection is None:
+        return [TextContent(
+            type="text",
+            text=f"Error: Collection '{collection_name}' not found"
+        )]
+
+    try:
+        vertices = _as_format(_load_buffer(arguments["vertices"], "float32"), "f")
+        if len(vertices) % 3:
+            raise ValueError(f"vertices has {len(vertices)} values, not a multiple of 3")
+        vertex_count = len(vertices) // 3
+
+        indices = sizes = None
+        loop_count = face_count = 0
+        if "faces" in arguments:
+            indices = _as_format(_load_buffer(arguments["faces"], "int32"), "i")
+            loop_count = len(indices)
+            if not loop_count:
+                raise ValueError("faces is empty")
+            low, high = (int(indices.min()), int(indices.max())) if np is not None else (min(indices), max(indices))
+            if low < 0 or high >= vertex_count:
+                raise ValueError(f"faces reference vertices outside 0..{vertex_count - 1}")
+            if "face_sizes" in arguments:
+                sizes = _as_format(_load_buffer(arguments["face_sizes"], "int32"), "i")
+                total = int(sizes.sum()) if np is not None else sum(sizes)
+                if total != loop_count:
+                    raise ValueError(f"face_sizes add up to {total}, but faces has {loop_count} indices")
+            else:
+                face_size = arguments.get("face_size", 3)
+                if loop_count % face_size:
+                    raise ValueError(f"faces has {loop_count} indices, not a multiple of face_size {face_size}")
+                if np is not None:
+                    sizes = np.full(loop_count // face_size, face_size, dtype=np.int32)
+                else:
+                    sizes = array.array('i', [face_size]) * (loop_count // face_size)
+            face_count = len(sizes)
+            if (int(sizes.min()) if np is not None else min(sizes)) < 3:
+                raise ValueError("every face needs at least 3 vertices")
+    except (OSError, ValueError, TypeError) as e:
+        return [TextContent(
+            type="text",
+            text=f"Error: {e}"
+        )]
+    loaded = time.perf_counter()
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(vertex_count)
+    mesh.vertices.foreach_set("co", vertices)
+    if indices is not None:
+        if np is not None:
+            starts = np.zeros(face_count, dtype=np.int32)
+            np.cumsum(sizes[:-1], out=starts[1:])
+        else:
+            starts = array.array('i', itertools.accumulate(itertools.chain((0,), sizes[:-1])))
+        mesh.loops.add(loop_count)
+        mesh.loops.foreach_set("vertex_index", indices)
+        mesh.polygons.add(face_count)
+        mesh.polygons.foreach_set("loop_start", starts)
+        try:
+            mesh.polygons.foreach_set("loop_total", sizes)
+        except (AttributeError, TypeError, RuntimeError):
+            pass  # Read-only since Blender 4.0: derived from loop_start
+    mesh.update(calc_edges=True)
+
+    extras = {}
+    try:
+        if "uvs" in arguments:
+            uvs = _as_format(_load_buffer(arguments["uvs"], "float32"), "f")
+            if len(uvs) == 2 * vertex_count and len(uvs) != 2 * loop_count:
+                if np is None:
+                    raise ValueError("per-vertex uvs need NumPy; pass one u, v per face corner")
+                uvs = uvs.reshape(-1, 2)[indices].ravel()
+                extras["uvs"] = "vertex"
+            elif len(uvs) == 2 * loop_count:
+                extras["uvs"] = "corner"
+            else:
+                raise ValueError(f"uvs needs {2 * vertex_count} (per vertex) or {2 * loop_count} (per corner) values")
+            mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", uvs)
+
+        if "normals" in arguments:
+            if np is None:
+                raise ValueError("custom normals need NumPy")
+            normals = _as_format(_load_buffer(arguments["normals"], "float32"), "f").reshape(-1, 3)
+            if hasattr(mesh, "use_auto_smooth"):
+                mesh.use_auto_smooth = True  # Needed for custom normals before Blender 4.1
+            if len(normals) == vertex_count:
+                mesh.normals_split_custom_set_from_vertices(normals)
+                extras["normals"] = "vertex"
+            elif len(normals) == loop_count:
+                mesh.normals_split_custom_set(normals)
+                extras["normals"] = "corner"
+            else:
+                raise ValueError(f"normals needs {vertex_count} (per vertex) or {loop_count} (per corner) vectors")
+    except (OSError, ValueError, TypeError) as e:
+        bpy.data.meshes.remove(mesh)
+        return [TextContent(
+            type="text",
+            text=f"Error: {e}"
+        )]
+
+    if arguments.get("validate", False) and mesh.validate():
+        extras["validate"] = "corrected invalid geometry"
+
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = arguments.get("location", [0, 0, 0])
+    collection.objects.link(obj)
+    _scene_changed([obj])
+
+    elapsed = time.perf_counter() - started
+    return [TextContent(
+        type="text",
+        text=json.dumps({
+            "name": obj.name,
+            "mesh": mesh.name,
+            "vertices": vertex_count,
+            "faces": face_count,
+            "loops": loop_count,
+            **extras,
+            "load_seconds": round(loaded - started, 4),
+            "seconds": round(elapsed, 4),
+            "vertices_per_second": round(vertex_count / elapsed) if elapsed > 0 else None,
+        })
+    )]
+
+
+# Upper bound on instances created by one create_instances call
+MAX_INSTANCES = 200000
+
+INSTANCE_DISTRIBUTIONS = ("transforms", "grid", "volume", "surface")
+
+
+def _euler_aligned_to(normal, spin: float = 0.0) -> tuple[float, float, float]:
+    """XYZ Euler rotation that spins spin radians about +Z, then turns +Z onto normal."""
+    nx, ny, nz = normal
+    a = -math.asin(max(-1.0, min(1.0, ny)))
+    b = math.atan2(nx, nz)
+    if not spin:
+        return a, b, 0.0
+
+    # Ry(b) @ Rx(a) @ Rz(spin), decomposed back into Blender's XYZ order (Rz @ Ry @ Rx)
+    ca, sa, cb, sb = math.cos(a), math.sin(a), math.cos(b), math.sin(b)
+    cs, ss = math.cos(spin), math.sin(spin)
+    m00 = cb * cs + sb * sa * ss
+    m10 = ca * ss
+    m11 = ca * cs
+    m12 = -sa
+    m20 = -sb * cs + cb * sa * ss
+    m21 = sb * ss + cb * sa * cs
+    m22 = cb * ca
+    if abs(m20) < 1.0 - 1e-9:
+        return math.atan2(m21, m22), math.asin(-m20), math.atan2(m10, m00)
+    return math.atan2(-m12, m11), math.copysign(math.pi / 2, -m20), 0.0
+
+
+def _grid_points(count: int, grid, spacing, origin) -> list[tuple[float, float, float]]:
+    """count points on a grid, filling x first, then y, then z."""
+    nx, ny, _ = grid
+    sx, sy, sz = spacing
+    ox, oy, oz = origin
+    return [(ox + (i % nx) * sx, oy + (i // nx % ny) * sy, oz + (i // (nx * ny)) * sz)
+            for i in range(count)]
+
+
+def _volume_points(count: int, low, high, rng: random.Random) -> list[tuple[float, float, float]]:
+    """count points uniformly distributed in the box low..high."""
+    span = [h - lo for lo, h in zip(low, high)]
+    return [(low[0] + rng.random() * span[0], low[1] + rng.random() * span[1], low[2] + rng.random() * span[2])
+            for _ in range(count)]
+
+
+def _surface_points(target, count: int, rng: random.Random):
+    """count points uniformly distributed (by area) over a mesh object's faces, in world space.
+
+    Returns (points, normals) as lists of triples. Triangles are read in bulk from
+    loop_triangles; the random draws come from rng either way, so a seed gives the same
+    layout with or without NumPy.
+    """
+    mesh = target.data
+    mesh.calc_loop_triangles()
+    tri_count = len(mesh.loop_triangles)
+    if not tri_count:
+        raise ValueError(f"Object '{target.name}' has no faces to scatter on")
+    co = _bulk_get_vectors(mesh.vertices, "co", len(mesh.vertices))
+    if np is not None:
+        tris = np.empty(tri_count * 3, dtype=np.int32)
+    else:
+        tris = array.array('i', bytes(tri_count * 12))
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    matrix = [list(row) for row in target.matrix_world][:3]
+    draws = [rng.random() for _ in range(3 * count)]
+
+    if np is not None:
+        m = np.array(matrix, dtype=np.float64)
+        world = co.reshape(-1, 3).astype(np.float64) @ m[:, :3].T + m[:, 3]
+        corners = world[tris.reshape(-1, 3)]
+        edge1 = corners[:, 1] - corners[:, 0]
+        edge2 = corners[:, 2] - corners[:, 0]
+        cross = np.cross(edge1, edge2)
+        areas = np.linalg.norm(cross, axis=1)
+        cumulative = np.cumsum(areas)
+        if cumulative[-1] <= 0.0:
+            raise ValueError(f"Object '{target.name}' has no surface area to scatter on")
+        d = np.array(draws).reshape(-1, 3)
+        picked = np.minimum(np.searchsorted(cumulative, d[:, 0] * cumulative[-1], side="right"), tri_count - 1)
+        u, v = d[:, 1:2], d[:, 2:3]
+        flip = (u + v) > 1.0
+        u, v = np.where(flip, 1.0 - u, u), np.where(flip, 1.0 - v, v)
+        points = corners[picked, 0] + u * edge1[picked] + v * edge2[picked]
+        normals = cross[picked] / np.maximum(areas[picked], 1e-30)[:, None]
+        return [tuple(p) for p in points.tolist()], [tuple(n) for n in normals.tolist()]
+
+    world = []
+    for i in range(0, len(co), 3):
+        x, y, z = co[i], co[i + 1], co[i + 2]
+        world.append([row[0] * x + row[1] * y + row[2] * z + row[3] for row in matrix])
+    faces = []
+    cumulative = []
+    total = 0.0
+    for t in range(tri_count):
+        p0, p1, p2 = world[tris[3 * t]], world[tris[3 * t + 1]], world[tris[3 * t + 2]]
+        e1 = [p1[k] - p0[k] for k in range(3)]
+        e2 = [p2[k] - p0[k] for k in range(3)]
+        n = (e1[1] * e2[2] - e1[2] * e2[1], e1[2] * e2[0] - e1[0] * e2[2], e1[0] * e2[1] - e1[1] * e2[0])
+        area = math.sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+        total += area
+        faces.append((p0, e1, e2, n, area))
+        cumulative.append(total)
+    if total <= 0.0:
+        raise ValueError(f"Object '{target.name}' has no surface area to scatter on")
+
+    points, normals = [], []
+    for i in range(count):
+        r, u, v = draws[3 * i:3 * i + 3]
+        p0, e1, e2, n, area = faces[min(bisect.bisect_right(cumulative, r * total), tri_count - 1)]
+        if u + v > 1.0:
+            u, v = 1.0 - u, 1.0 - v
+        points.append(tuple(p0[k] + u * e1[k] + v * e2[k] for k in range(3)))
+        normals.append(tuple(c / max(area, 1e-30) for c in n))
+    return points, normals
+
+
+@tools.register(
+    name="create_instances",
+    description="Scatter linked duplicates of an object (sharing its mesh data) or instances of a collection, "
+                "from explicit transforms or a grid, random-in-volume or on-surface distribution",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "source": {
+                "type": "string",
+                "description": "Object to make linked duplicates of"
+            },
+            "source_collection": {
+                "type": "string",
+                "description": "Collection to instance (as empties) instead of an object"
+            },
+            "name": {
+                "type": "string",
+                "description": "Base name for the new objects (defaults to the source name)"
+            },
+            "count": {
+                "type": "integer",
+                "description": "Number of instances (for transforms, defaults to the number of locations; "
+                               "for grid, to the grid size)",
+                "minimum": 1
+            },
+            "distribution": {
+                "type": "string",
+                "description": f"Placement: {', '.join(INSTANCE_DISTRIBUTIONS)}",
+                "default": "transforms"
+            },
+            "location": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "transforms: flat [x0, y0, z0, x1, y1, z1, ...] locations"
+            },
+            "rotation": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Flat Euler rotations in radians, or a single [x, y, z] for all"
+            },
+            "scale": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Flat scales, or a single [x, y, z] for all"
+            },
+            "grid": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "description": "grid: points along [x, y, z] (defaults to a square in the XY plane)"
+            },
+            "spacing": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "grid: distance between points along [x, y, z]",
+                "default": [2, 2, 2]
+            },
+            "origin": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "grid: location of the first point",
+                "default": [0, 0, 0]
+            },
+            "min": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "volume: box corner [x, y, z] with the smallest coordinates"
+            },
+            "max": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "volume: box corner [x, y, z] with the largest coordinates"
+            },
+            "target": {
+                "type": "string",
+                "description": "surface: mesh object to scatter on"
+            },
+            "align_to_normal": {
+                "type": "boolean",
+                "description": "surface: point each instance's +Z along the face normal",
+                "default": False
+            },
+            "random_rotation": {
+                "type": "boolean",
+                "description": "Spin each instance by a random angle about its +Z axis",
+                "default": False
+            },
+            "scale_range": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Random uniform scale [min, max] per instance"
+            },
+            "seed": {
+                "type": "integer",
+                "description": "Random seed; the seed used is returned so a layout can be reproduced"
+            },
+            "collection": {
+                "type": "string",
+                "description": "Collection to link the instances into (defaults to the scene collection)"
+            }
+        }
+    },
+    priority="heavy"
+)
+def tool_create_instances(arguments: Any) -> list[TextContent]:
+    started = time.perf_counter()
+
+    source_name = arguments.get("source")
+    source_collection_name = arguments.get("source_collection")
+    if bool(source_name) == bool(source_collection_name):
+        return [TextContent(
+            type="text",
+            text="Error: Give exactly one of 'source' or 'source_collection'"
+        )]
+    if source_name:
+        source = bpy.data.objects.get(source_name)
+        if source is None:
+            return [TextContent(
+                type="text",
+                text=f"Error: Object '{source_name}' not found"
+            )]
+    else:
+        source = bpy.data.collections.get(source_collection_name)
+        if source is None:
+            return [TextContent(
+                type="text",
+                text=f"Error: Collection '{source_collection_name}' not found"
+            )]
+
+    collection_name = arguments.get("collection")
+    collection = bpy.data.collections.get(collection_name) if collection_name else bpy.context.scene.collection
+    if collection is None:
+        return [TextContent(
+            type="text",
+            text=f"Error: Collection '{collection_name}' not found"
+        )]
+
+    if collection is source:
+        return [TextContent(
+            type="text",
+            text="Error: A collection cannot contain instances of itself"
+        )]
+
+    distribution = arguments.get("distribution", "transforms")
+    seed = arguments.get("seed")
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    rng = random.Random(seed)
+    normals = None
+
+    try:
+        if distribution == "transforms":
+            flat = arguments.get("location")
+            if not flat or len(flat) % 3:
+                raise ValueError("'location' needs 3 values per instance")
+            locations = [tuple(flat[i:i + 3]) for i in range(0, len(flat), 3)]
+            count = arguments.get("count", len(locations))
+            if count != len(locations):
+                raise ValueError(f"'location' has {len(locations)} entries but count is {count}")
+        elif distribution == "grid":
+            grid = arguments.get("grid")
+            if grid is None:
+                side = math.ceil(math.sqrt(arguments.get("count", 1)))
+                grid = [side, side, 1]
+            if len(grid) != 3 or min(grid) < 1:
+                raise ValueError("'grid' needs 3 positive counts")
+            count = arguments.get("count", grid[0] * grid[1] * grid[2])
+            if count > grid[0] * grid[1] * grid[2]:
+                raise ValueError(f"count {count} does not fit in a {grid[0]}x{grid[1]}x{grid[2]} grid")
+            locations = _grid_points(count, grid, arguments.get("spacing", [2, 2, 2]), arguments.get("origin", [0, 0, 0]))
+        elif distribution == "volume":
+            if "min" not in arguments or "max" not in arguments or "count" not in arguments:
+                raise ValueError("volume needs 'min', 'max' and 'count'")
+            count = arguments["count"]
+            locations = _volume_points(count, arguments["min"], arguments["max"], rng)
+        elif distribution == "surface":
+            target = bpy.data.objects.get(arguments.get("target", ""))
+            if target is None or target.type != 'MESH':
+                raise ValueError("surface needs 'target', the name of a mesh object")
+            if "count" not in arguments:
+                raise ValueError("surface needs 'count'")
+            count = arguments["count"]
+            locations, normals = _surface_points(target, count, rng)
+        else:
+            raise ValueError(f"Unknown distribution '{distribution}' (expected one of {', '.join(INSTANCE_DISTRIBUTIONS)})")
+
+        if not 1 <= count <= MAX_INSTANCES:
+            raise ValueError(f"count must be between 1 and {MAX_INSTANCES}")
+
+        rotation = arguments.get("rotation")
+        scale = arguments.get("scale")
+        for field_name, values in (("rotation", rotation), ("scale", scale)):
+            if values is not None and len(values) != 3 and len(values) != 3 * count:
+                raise ValueError(f"'{field_name}' needs 3 values per instance ({3 * count}) or a single [x, y, z]")
+        scale_range = arguments.get("scale_range")
+        if scale_range is not None and len(scale_range) != 2:
+            raise ValueError("'scale_range' needs [min, max]")
+    except (ValueError, TypeError) as e:
+        return [TextContent(
+            type="text",
+            text=f"Error: {e}"
+        )]
+
+    # Per-instance rotation and scale, drawn after the locations so they don't shift the layout
+    align = normals is not None and arguments.get("align_to_normal", False)
+    if rotation is None and (align or arguments.get("random_rotation", False)):
+        spins = [rng.random() * 2.0 * math.pi if arguments.get("random_rotation", False) else 0.0
+                 for _ in range(count)]
+        if align:
+            rotation = [c for normal, spin in zip(normals, spins) for c in _euler_aligned_to(normal, spin)]
+        else:
+            rotation = [c for spin in spins for c in (0.0, 0.0, spin)]
+    if scale is None and scale_range is not None:
+        low, high = scale_range
+        scale = [c for _ in range(count) for c in itertools.repeat(low + rng.random() * (high - low), 3)]
+    location = [c for point in locations for c in point]
+
+    meshes_before = len(bpy.data.meshes)
+    base_name = arguments.get("name")
+    created = []
+    try:
+        for _ in range(count):
+            if source_name:
+                obj = source.copy()  # Linked duplicate: shares source.data
+                if base_name:
+                    obj.name = base_name
+            else:
+                obj = bpy.data.objects.new(base_name or source.name, None)
+                obj.instance_type = 'COLLECTION'
+                obj.instance_collection = source
+            created.append(obj)
+            collection.objects.link(obj)
+    except Exception:
+        for obj in created:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        raise
+
+    # New objects are appended to the collection, so their transforms can be written in
+    # bulk as the last rows; fall back to per-object writes if that doesn't hold
+    source_objects = collection.objects
+    total = len(source_objects)
+    rows = range(total - count, total)
+    bulk = source_objects.keys()[total - count:] == [obj.name for obj in created]
+    for field_name, values in (("location", location), ("rotation", rotation), ("scale", scale)):
+        if values is None:
+            values = [0.0, 0.0, 0.0] if field_name == "rotation" else [1.0, 1.0, 1.0]
+        attr = TRANSFORM_ATTRS[field_name]
+        if bulk:
+            buffer = _bulk_get_vectors(source_objects, attr, total)
+            _put_vectors(buffer, rows, values)
+            source_objects.foreach_set(attr, buffer)
+        else:
+            broadcast = len(values) == 3
+            for i, obj in enumerate(created):
+                setattr(obj, attr, values[0:3] if broadcast else values[3 * i:3 * i + 3])
+
+    _scene_changed(created)
+
+    result = {
+        "created": count,
+        "first": created[0].name,
+        "last": created[-1].name,
+        "instance_of": source.data.name if source_name and source.data else source.name,
+        "new_meshes": len(bpy.data.meshes) - meshes_before,
+        "distribution": distribution,
+        "seed": seed,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+    return [TextContent(
+        type="text",
+        text=json.dumps(result)
+    )]
+
+
+@tools.register(
+    name="delete_object",
+    description="Delete an object from the scene by name",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "name": {
+                "type": "string",
+                "description": "Name of the object to delete"
+            }
+        },
+        "required": ["name"]
+    }
+)
+def tool_delete_object(arguments: Any) -> list[TextContent]:
+    obj_name = arguments["name"]
+    obj = bpy.data.objects.get(obj_name)
+
+    if obj is None:
+        return [TextContent(
+            type="text",
+            text=f"Error: Object '{obj_name}' not found"
+        )]
+
+    if obj.children:
+        # Children keep their parent-space transforms, so their world bounds move
+        spatial_index.invalidate()
+    if active_transaction is not None:
+        active_transaction.delete(obj)
+    else:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    spatial_index.remove(obj_name)
+    return [TextContent(
+        type="text",
+        text=f"Deleted object '{obj_name}'"
+    )]
+
+
+@tools.register(
+    name="list_objects",
+    description="List the objects in the current scene. With no arguments returns a plain name list; "
+                "otherwise returns JSON pages (cursor/limit) with optional filters and fields, "
+                "or only the changes since a revision",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "type": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Only these object types, e.g. [\"MESH\", \"LIGHT\"]"
+            },
+            "collection": {
+                "type": "string",
+                "description": "Only objects in this collection or its children"
+            },
+            "pattern": {
+                "type": "string",
+                "description": "Only names matching this glob, e.g. \"Tree.*\""
+            },
+            "visible": {
+                "type": "boolean",
+                "description": "Only visible (true) or hidden (false) objects"
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(OBJECT_FIELDS)},
+                "description": "Fields per object (default: name and type)"
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Objects per page (default 500, max 5000)",
+                "minimum": 1,
+                "maximum": 5000
+            },
+            "cursor": {
+                "type": "string",
+                "description": "next_cursor from the previous page"
+            },
+            "since_revision": {
+                "type": "integer",
+                "description": "Return only objects added, modified or removed after this revision"
+            }
+        }
+    },
+    priority="read"
+)
+def tool_list_objects(arguments: Any) -> list[TextContent]:
+    scene = bpy.context.scene
+    if not arguments:
+        objects = [obj.name for obj in scene.objects]
+        return [TextContent(
+            type="text",
+            text="Objects in scene:\n" + "\n".join(f"- {obj}" for obj in objects)
+        )]
+
+    types = set(arguments["type"]) if arguments.get("type") else None
+    pattern = arguments.get("pattern")
+    visible = arguments.get("visible")
+    fields = arguments.get("fields") or ["type"]
+    limit = arguments.get("limit", 500)
+    cursor = arguments.get("cursor")
+    since = arguments.get("since_revision")
+
+    members = None
+    if arguments.get("collection"):
+        collection = bpy.data.collections.get(arguments["collection"])
+        if collection is None:
+            return [TextContent(
+                type="text",
+                text=f"Error: Collection '{arguments['collection']}' not found"
+            )]
+        members = set(collection.all_objects.keys())
+
+    def matches(obj) -> bool:
+        return ((types is None or obj.type in types)
+                and (members is None or obj.name in members)
+                and (pattern is None or fnmatch.fnmatchcase(obj.name, pattern))
+                and (visible is None or obj.visible_get() == visible))
+
+    revisions = scene_revisions.setdefault(scene.name, SceneRevisions())
+    objects = scene.objects
+
+    if since is not None:
+        revision = revisions.scan(scene)
+        changes = revisions.changes_since(since)
+        if changes is None:
+            result = {"revision": revision, "full_resync": True}
+        else:
+            added, modified, removed = changes
+            result = {
+                "revision": revision,
+                "full_resync": False,
+                "added": [_object_fields(objects[name], fields) for name in added if matches(objects[name])],
+                "modified": [_object_fields(objects[name], fields) for name in modified if matches(objects[name])],
+                "removed": removed,
+            }
+        return [TextContent(type="text", text=json.dumps(result))]
+
+    # The first page records a revision to sync from later; further pages reuse it
+    revision = revisions.revision if cursor else revisions.scan(scene)
+
+    # Pages are in name order and the cursor is the last name sent, so objects added
+    # or removed between pages do not shift the rest of the listing
+    names = sorted(obj.name for obj in objects if matches(obj))
+    start = bisect.bisect_right(names, cursor) if cursor else 0
+    page = names[start:start + limit]
+    result = {
+        "revision": revision,
+        "total": len(names),
+        "objects": [_object_fields(objects[name], fields) for name in page],
+        "next_cursor": page[-1] if start + limit < len(names) else None,
+    }
+    return [TextContent(type="text", text=json.dumps(result))]
+
+
+@tools.register(
+    name="move_object",
+    description="Move an object to a new location",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "name": {
+                "type": "string",
+                "description": "Name of the object to move"
+            },
+            "location": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "New location [x, y, z]"
+            }
+        },
+        "required": ["name", "location"]
+    }
+)
+def tool_move_object(arguments: Any) -> list[TextContent]:
+    obj_name = arguments["name"]
+    location = arguments["location"]
+
+    obj = bpy.data.objects.get(obj_name)
+    if obj is None:
+        return [TextContent(
+            type="text",
+            text=f"Error: Object '{obj_name}' not found"
+        )]
+
+    obj.location = location
+    _scene_changed([obj])
+    return [TextContent(
+        type="text",
+        text=f"Moved object '{obj_name}' to location {location}"
+    )]
+
+
+@tools.register(
+    name="get_transforms",
+    description="Read location, rotation and scale of many objects at once as flat arrays",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Object names to read, in the order the arrays should follow"
+            },
+            "pattern": {
+                "type": "string",
+                "description": "Glob pattern on object names (e.g. 'Tree_*'), used when names is not given"
+            },
+            "collection": {
+                "type": "string",
+                "description": "Only consider objects in this collection (defaults to the current scene)"
+            },
+            "fields": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(TRANSFORM_ATTRS)},
+                "description": "Transform fields to return",
+                "default": list(TRANSFORM_ATTRS)
+            },
+            "precision": {
+                "type": "integer",
+                "description": "Number of decimal places in the returned values",
+                "default": 6
+            }
+        }
+    },
+    priority="read"
+)
+def tool_get_transforms(arguments: Any) -> list[TextContent]:
+    source = _resolve_transform_source(arguments.get("collection"))
+    selected, indices, missing = _select_transform_indices(
+        source, arguments.get("names"), arguments.get("pattern")
+    )
+    fields = arguments.get("fields", list(TRANSFORM_ATTRS))
+    precision = arguments.get("precision", 6)
+
+    count = len(source)
+    result = {"count": len(selected), "names": selected}
+    for field_name in fields:
+        buffer = _bulk_get_vectors(source, TRANSFORM_ATTRS[field_name], count)
+        result[field_name] = _take_vectors(buffer, indices, precision)
+    if missing:
+        result["missing"] = missing
+
+    return [TextContent(
+        type="text",
+        text=json.dumps(result)
+    )]
+
+
+@tools.register(
+    name="set_transforms",
+    description="Set location, rotation and scale of many objects at once from flat arrays",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "names": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Object names, in the same order as the value arrays"
+            },
+            "pattern": {
+                "type": "string",
+                "description": "Glob pattern on object names, used when names is not given"
+            },
+            "collection": {
+                "type": "string",
+                "description": "Only consider objects in this collection (defaults to the current scene)"
+            },
+            "location": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Flat [x0, y0, z0, x1, y1, z1, ...] locations, or a single [x, y, z] for all"
+            },
+            "rotation": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Flat Euler rotations in radians, or a single [x, y, z] for all"
+            },
+            "scale": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Flat scales, or a single [x, y, z] for all"
+            }
+        }
+    }
+)
+def tool_set_transforms(arguments: Any) -> list[TextContent]:
+    source = _resolve_transform_source(arguments.get("collection"))
+    selected, indices, missing = _select_transform_indices(
+        source, arguments.get("names"), arguments.get("pattern")
+    )
+
+    count = len(source)
+    updated_fields = []
+    for field_name, attr in TRANSFORM_ATTRS.items():
+        values = arguments.get(field_name)
+        if values is None:
+            continue
+        if len(values) != 3 and len(values) != 3 * len(selected):
+            return [TextContent(
+                type="text",
+                text=f"Error: '{field_name}' needs 3 values per object ({3 * len(selected)}) or a single [x, y, z]"
+            )]
+
+        if indices is None and len(values) == 3 * count and np is not None:
+            # Every object is being set in source order: no need to read first
+            buffer = np.asarray(values, dtype=np.float32)
+        else:
+            buffer = _bulk_get_vectors(source, attr, count)
+            _put_vectors(buffer, indices, values)
+        source.foreach_set(attr, buffer)
+        updated_fields.append(field_name)
+
+    _scene_changed(None if indices is None else [source[i] for i in indices])
+
+    message = f"Set {', '.join(updated_fields) or 'no fields'} on {len(selected)} objects"
+    if missing:
+        message += f"; not found: {', '.join(missing)}"
+    return [TextContent(
+        type="text",
+        text=message
+    )]
+
+
+# Keyframe interpolation modes insert_keyframes sets, with their values in Blender's enum
+KEYFRAME_INTERPOLATIONS = {"CONSTANT": 0, "LINEAR": 1, "BEZIER": 2}
+
+# Data paths whose F-curves Blender groups under "Object Transforms"
+_TRANSFORM_DATA_PATHS = ("location", "rotation_euler", "rotation_quaternion", "rotation_axis_angle",
+                         "scale", "delta_location", "delta_rotation_euler", "delta_scale")
+
+
+def _load_keyframe_array(spec, name: str):
+    """A JSON array of numbers or a create_mesh style buffer, as a flat float32 array."""
+    if isinstance(spec, dict):
+        return _as_format(_load_buffer(spec, "float32"), "f")
+    if isinstance(spec, list):
+        return np.asarray(spec, dtype=np.float32) if np is not None else array.array('f', spec)
+    raise ValueError(f"'{name}' must be an array of numbers or a buffer")
+
+
+def _ensure_fcurve(obj, data_path: str, index: int):
+    """The F-curve animating obj's data_path[index], creating the action and F-curve if needed."""
+    animation_data = obj.animation_data or obj.animation_data_create()
+    action = animation_data.action
+    if action is None:
+        action = bpy.data.actions.new(f"{obj.name}Action")
+        animation_data.action = action
+    group = "Object Transforms" if data_path in _TRANSFORM_DATA_PATHS else ""
+    if hasattr(action, "fcurve_ensure_for_datablock"):
+        # Layered actions (Blender 4.4+; the only kind since 5.0): also sets up the slot
+        return action.fcurve_ensure_for_datablock(obj, data_path, index=index, group_name=group)
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+    return fcurve
+
+
+def _fill_keyframes(fcurve, frames, values, interpolation: str):
+    """Replace fcurve's keyframes with (frame, value) pairs, written with foreach_set."""
+    count = len(frames)
+    mode = KEYFRAME_INTERPOLATIONS[interpolation]
+    if np is not None:
+        co = np.empty(2 * count, dtype=np.float32)
+        co[0::2] = frames
+        co[1::2] = values
+        modes = np.full(count, mode, dtype=np.int32)
+    else:
+        co = array.array('f', itertools.chain.from_iterable(zip(frames, values)))
+        modes = array.array('i', [mode]) * count
+
+    points = fcurve.keyframe_points
+    points.clear()
+    points.add(count)
+    points.foreach_set("co", co)
+    try:
+        points.foreach_set("interpolation", modes)
+    except (TypeError, RuntimeError):
+        for point in points:
+            point.interpolation = interpolation
+    # Sorts the keys and computes the automatic Bezier handles
+    fcurve.update()
+
+
+@tools.register(
+    name="insert_keyframes",
+    description="Insert keyframes in bulk: per-object arrays of frames and values for location, rotation, "
+                "scale or any animatable object property, written straight into F-curves",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "channels": {
+                "type": "array",
+                "description": "Properties to animate. Existing keyframes on each F-curve are replaced",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "objects": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Object names, sharing frames; values hold one block per object"
+                        },
+                        "object": {
+                            "type": "string",
+                            "description": "A single object name, instead of objects"
+                        },
+                        "data_path": {
+                            "type": "string",
+                            "description": "Property to animate: location, rotation, scale or any object "
+                                           "data path (e.g. rotation_quaternion, hide_render, '[\"prop\"]')",
+                            "default": "location"
+                        },
+                        "index": {
+                            "type": "integer",
+                            "description": "Animate only this element of an array property"
+                        },
+                        "frames": {
+                            "type": ["array", "object"],
+                            "items": {"type": "number"},
+                            "description": "Frame numbers, as an array or a buffer ({\"base64\": ...} or "
+                                           "{\"path\": ...} of a .npy/raw file, optional \"dtype\", \"offset\")"
+                        },
+                        "values": {
+                            "type": ["array", "object"],
+                            "items": {"type": "number"},
+                            "description": "Values ordered object, frame, component (e.g. x0, y0, z0, x1, ... "
+                                           "for location), as an array or a buffer; one object's block is "
+                                           "used for every object when that is all there is"
+                        },
+                        "interpolation": {
+                            "type": "string",
+                            "enum": list(KEYFRAME_INTERPOLATIONS),
+                            "description": "Overrides the call's interpolation for this channel"
+                        }
+                    },
+                    "required": ["frames", "values"]
+                }
+            },
+            "interpolation": {
+                "type": "string",
+                "enum": list(KEYFRAME_INTERPOLATIONS),
+                "default": "BEZIER"
+            }
+        },
+        "required": ["channels"]
+    },
+    priority="heavy"
+)
+def tool_insert_keyframes(arguments: Any) -> list[TextContent]:
+    started = time.perf_counter()
+    default_interpolation = arguments.get("interpolation", "BEZIER")
+
+    # Check every channel before touching any F-curve, so an error leaves nothing half done
+    writes, missing = [], []
+    for number, channel in enumerate(arguments["channels"], 1):
+        data_path = channel.get("data_path", "location")
+        data_path = TRANSFORM_ATTRS.get(data_path, data_path)
+        names = channel.get("objects") or ([channel["object"]] if "object" in channel else [])
+        try:
+            if not names:
+                raise ValueError("give objects or object")
+            frames = _load_keyframe_array(channel["frames"], "frames")
+            values = _load_keyframe_array(channel["values"], "values")
+            if not len(frames):
+                raise ValueError("frames is empty")
+        except (OSError, ValueError, TypeError) as e:
+            return [TextContent(type="text", text=f"Error: channel {number}: {e}")]
+
+        interpolation = channel.get("interpolation", default_interpolation)
+        for position, name in enumerate(names):
+            obj = bpy.data.objects.get(name)
+            if obj is None:
+                missing.append(name)
+                continue
+            try:
+                current = obj.path_resolve(data_path)
+            except ValueError:
+                return [TextContent(type="text", text=f"Error: '{name}' has no property '{data_path}'")]
+            width = len(current) if hasattr(current, "__len__") and not isinstance(current, str) else 1
+            indices = range(width)
+            if "index" in channel:
+                if not 0 <= channel["index"] < width:
+                    return [TextContent(type="text", text=f"Error: '{data_path}' has no element {channel['index']}")]
+                indices = [channel["index"]]
+
+            block = len(frames) * len(indices)
+            if len(values) == block:
+                offset = 0
+            elif len(values) == block * len(names):
+                offset = position * block
+            else:
+                return [TextContent(
+                    type="text",
+                    text=f"Error: channel {number}: values has {len(values)} numbers; '{data_path}' needs "
+                         f"{block} per object ({len(frames)} frames x {len(indices)}), {block * len(names)} in all"
+                )]
+            for k, index in enumerate(indices):
+                writes.append((obj, data_path, index, frames,
+                               values[offset + k:offset + block:len(indices)], interpolation))
+
+    animated = {}
+    keyframe_count = 0
+    for obj, data_path, index, frames, channel_values, interpolation in writes:
+        _fill_keyframes(_ensure_fcurve(obj, data_path, index), frames, channel_values, interpolation)
+        animated[obj.name] = obj
+        keyframe_count += len(frames)
+
+    _scene_changed(list(animated.values()))
+
+    elapsed = time.perf_counter() - started
+    result = {
+        "objects": len(animated),
+        "fcurves": len(writes),
+        "keyframes": keyframe_count,
+        "seconds": round(elapsed, 4),
+        "keyframes_per_second": round(keyframe_count / elapsed) if elapsed > 0 else None,
+    }
+    if missing:
+        result["not_found"] = missing
+    return [TextContent(
+        type="text",
+        text=json.dumps(result)
+    )]
+
+
+def _exact_ray_hit(obj, origin, direction) -> dict | None:
+    """Ray hit on obj's mesh surface via Object.ray_cast (object space), or None on a miss."""
+    matrix = obj.matrix_world
+    inverse = matrix.inverted()
+    world_origin = mathutils.Vector(origin)
+    local_origin = inverse @ world_origin
+    local_direction = inverse.to_3x3() @ mathutils.Vector(direction)
+    found, location, normal, _ = obj.ray_cast(local_origin, local_direction)
+    if not found:
+        return None
+    world_location = matrix @ location
+    world_normal = (inverse.transposed().to_3x3() @ normal).normalized()
+    return {
+        "name": obj.name,
+        "distance": round((world_location - world_origin).length, 6),
+        "location": [round(v, 6) for v in world_location],
+        "normal": [round(v, 6) for v in world_normal],
+        "exact": True,
+    }
+
+
+def _spatial_result(hits: list[tuple[str, float]], started: float, **extra) -> list[TextContent]:
+    result = {
+        "count": len(hits),
+        "objects": [{"name": name, "distance": round(distance, 6)} for name, distance in hits],
+        **extra,
+        "query_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    return [TextContent(type="text", text=json.dumps(result))]
+
+
+@tools.register(
+    name="find_nearest_objects",
+    description="Find the k objects whose world bounding boxes are closest to a point",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "point": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Point [x, y, z]"
+            },
+            "k": {
+                "type": "integer",
+                "description": "Number of objects (default 10)",
+                "minimum": 1
+            }
+        },
+        "required": ["point"]
+    },
+    priority="read"
+)
+def tool_find_nearest_objects(arguments: Any) -> list[TextContent]:
+    spatial_index.ensure(bpy.context.scene)
+    started = time.perf_counter()
+    hits = spatial_index.nearest(arguments["point"], arguments.get("k", 10))
+    return _spatial_result(hits, started)
+
+
+@tools.register(
+    name="find_objects_in_radius",
+    description="Find objects whose world bounding boxes come within a radius of a point, nearest first",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "point": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Center [x, y, z]"
+            },
+            "radius": {
+                "type": "number",
+                "description": "Search radius",
+                "minimum": 0
+            }
+        },
+        "required": ["point", "radius"]
+    },
+    priority="read"
+)
+def tool_find_objects_in_radius(arguments: Any) -> list[TextContent]:
+    spatial_index.ensure(bpy.context.scene)
+    started = time.perf_counter()
+    hits = spatial_index.within_radius(arguments["point"], arguments["radius"])
+    return _spatial_result(hits, started)
+
+
+@tools.register(
+    name="find_objects_in_box",
+    description="Find objects whose world bounding boxes overlap an axis-aligned box",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "min": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Box corner [x, y, z] with the smallest coordinates"
+            },
+            "max": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Box corner [x, y, z] with the largest coordinates"
+            }
+        },
+        "required": ["min", "max"]
+    },
+    priority="read"
+)
+def tool_find_objects_in_box(arguments: Any) -> list[TextContent]:
+    spatial_index.ensure(bpy.context.scene)
+    started = time.perf_counter()
+    names = spatial_index.overlapping(arguments["min"], arguments["max"])
+    result = {
+        "count": len(names),
+        "objects": names,
+        "query_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    return [TextContent(type="text", text=json.dumps(result))]
+
+
+@tools.register(
+    name="raycast_objects",
+    description="Cast a ray and return the first object hit (or every hit). Mesh hits are exact "
+                "when mathutils is available; other objects are hit at their bounding box",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "origin": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Ray origin [x, y, z]"
+            },
+            "direction": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "Ray direction [x, y, z]"
+            },
+            "max_distance": {
+                "type": "number",
+                "description": "Ignore hits further than this (default: unlimited)"
+            },
+            "all_hits": {
+                "type": "boolean",
+                "description": "Return every hit along the ray, nearest first",
+                "default": False
+            }
+        },
+        "required": ["origin", "direction"]
+    },
+    priority="read"
+)
+def tool_raycast_objects(arguments: Any) -> list[TextContent]:
+    origin = arguments["origin"]
+    length = math.sqrt(sum(v * v for v in arguments["direction"]))
+    if length == 0:
+        return [TextContent(
+            type="text",
+            text="Error: 'direction' must not be zero"
+        )]
+    direction = [v / length for v in arguments["direction"]]
+    max_distance = arguments.get("max_distance", math.inf)
+    all_hits = arguments.get("all_hits", False)
+
+    spatial_index.ensure(bpy.context.scene)
+    started = time.perf_counter()
+
+    objects = bpy.context.scene.objects
+    hits = []
+    candidates = 0
+    for name, entry in spatial_index.ray(origin, direction, max_distance):
+        candidates += 1
+        # Candidates come in box entry order: nothing further on can beat the best hit
+        if hits and not all_hits and entry > hits[0]["distance"]:
+            break
+        obj = objects.get(name)
+        if obj is None:
+            continue
+        if mathutils is not None and obj.type == 'MESH':
+            hit = _exact_ray_hit(obj, origin, direction)
+            if hit is None or hit["distance"] > max_distance:
+                continue
+        else:
+            hit = {
+                "name": name,
+                "distance": round(entry, 6),
+                "location": [round(o + d * entry, 6) for o, d in zip(origin, direction)],
+                "exact": False,
+            }
+        hits.append(hit)
+        hits.sort(key=lambda h: h["distance"])
+
+    result = {"candidates": candidates}
+    if all_hits:
+        result["hits"] = hits
+    else:
+        result["hit"] = hits[0] if hits else None
+    result["query_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return [TextContent(type="text", text=json.dumps(result))]
+
+
+@tools.register(
+    name="set_material",
+    description="Set or create a material for an object",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "object_name": {
+                "type": "string",
+                "description": "Name of the object"
+            },
+            "material_name": {
+                "type": "string",
+                "description": "Name for the material"
+            },
+            "color": {
+                "type": "array",
+                "items": {"type": "number"},
+                "description": "RGBA color [r, g, b, a] values between 0 and 1",
+                "default": [0.8, 0.8, 0.8, 1.0]
+            },
+            "inputs": {
+                "type": "object",
+                "description": "Other Principled BSDF inputs by name, e.g. {\"Roughness\": 0.2, \"Metallic\": 1.0}"
+            },
+            "dedup": {
+                "type": "boolean",
+                "description": "Reuse an existing material with identical parameters instead of "
+                               "creating material_name (default: BLENDER_MCP_MATERIAL_DEDUP)"
+            }
+        },
+        "required": ["object_name", "material_name"]
+    }
+)
+def tool_set_material(arguments: Any) -> list[TextContent]:
+    obj_name = arguments["object_name"]
+    mat_name = arguments["material_name"]
+    color = arguments.get("color", [0.8, 0.8, 0.8, 1.0])
+    inputs = arguments.get("inputs")
+
+    obj = bpy.data.objects.get(obj_name)
+    if obj is None:
+        return [TextContent(
+            type="text",
+            text=f"Error: Object '{obj_name}' not found"
+        )]
+
+    if arguments.get("dedup", MATERIAL_DEDUP_DEFAULT):
+        mat, reused = material_library.acquire(mat_name, color, inputs)
+        _assign_material(obj, mat)
+        verb = "Reused identical" if reused else "Created"
+        return [TextContent(
+            type="text",
+            text=f"{verb} material '{mat.name}' with color {color[:3]} on object '{obj_name}'"
+        )]
+
+    # Create or get material and set its color
+    mat = _get_or_create_material(mat_name, color, inputs)
+
+    # Assign material to object
+    _assign_material(obj, mat)
+
+    return [TextContent(
+        type="text",
+        text=f"Set material '{mat_name}' with color {color[:3]} on object '{obj_name}'"
+    )]
+
+
+@tools.register(
+    name="assign_materials",
+    description="Assign materials to many objects in one call. Identical parameter sets share one "
+                "material unless dedup is false",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "assignments": {
+                "type": "array",
+                "description": "One entry per object",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "object_name": {"type": "string"},
+                        "material_name": {
+                            "type": "string",
+                            "description": "Existing material to assign, or name for a new one"
+                        },
+                        "color": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "RGBA color [r, g, b, a]"
+                        },
+                        "inputs": {
+                            "type": "object",
+                            "description": "Other Principled BSDF inputs by name"
+                        }
+                    },
+                    "required": ["object_name"]
+                }
+            },
+            "dedup": {
+                "type": "boolean",
+                "description": "Share materials with identical parameters (default true)",
+                "default": True
+            }
+        },
+        "required": ["assignments"]
+    }
+)
+def tool_assign_materials(arguments: Any) -> list[TextContent]:
+    dedup = arguments.get("dedup", True)
+    results = []
+    created = reused = 0
+
+    for index, entry in enumerate(arguments["assignments"]):
+        obj_name = entry.get("object_name")
+        try:
+            obj = bpy.data.objects.get(obj_name)
+            if obj is None:
+                raise ValueError(f"Object '{obj_name}' not found")
+            if obj.data is None or not hasattr(obj.data, "materials"):
+                raise ValueError(f"Object '{obj_name}' cannot have materials")
+
+            color, inputs = entry.get("color"), entry.get("inputs")
+            mat_name = entry.get("material_name")
+            if color is None and not inputs:
+                # A plain reference to an existing material
+                mat = bpy.data.materials.get(mat_name or "")
+                if mat is None:
+                    raise ValueError(f"Material '{mat_name}' not found (give a color or inputs to create it)")
+            elif dedup:
+                mat, was_reused = material_library.acquire(mat_name or "Material", color, inputs)
+                reused += was_reused
+                created += not was_reused
+            else:
+                existed = mat_name in bpy.data.materials
+                mat = _get_or_create_material(mat_name or "Material", color, inputs)
+                created += not existed
+
+            _assign_material(obj, mat)
+            results.append({"index": index, "ok": True, "object": obj_name, "material": mat.name})
+        except Exception as e:
+            results.append({"index": index, "ok": False, "object": obj_name, "error": str(e)})
+
+    assigned = sum(1 for r in results if r["ok"])
+    return [TextContent(
+        type="text",
+        text=json.dumps({
+            "assigned": assigned,
+            "failed": len(results) - assigned,
+            "materials_created": created,
+            "materials_reused": reused,
+            "results": results,
+        })
+    )]
+
+
+def _material_signature(mat) -> str:
+    """Hash of everything that affects how mat shades, ignoring its name."""
+    h = hashlib.sha256()
+    _hash_material(h, mat, with_name=False)
+    return h.hexdigest()
+
+
+@tools.register(
+    name="merge_duplicate_materials",
+    description="Merge materials with identical settings and node trees into one, remap their users "
+                "and delete the copies. Reports how much was reclaimed",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "dry_run": {
+                "type": "boolean",
+                "description": "Only report what would be merged",
+                "default": False
+            }
+        }
+    },
+    priority="heavy"
+)
+def tool_merge_duplicate_materials(arguments: Any) -> list[TextContent]:
+    dry_run = arguments.get("dry_run", False)
+    materials = bpy.data.materials
+    before = len(materials)
+
+    groups: dict[str, list] = {}
+    for mat in materials:
+        if getattr(mat, "library", None) is not None:
+            continue  # linked from another file, cannot be removed here
+        groups.setdefault(_material_signature(mat), []).append(mat)
+
+    merged = {}
+    nodes_removed = 0
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        # Keep the most used copy; ties go to the shortest, then first, name ("Red" over "Red.001")
+        group.sort(key=lambda mat: (-mat.users, len(mat.name), mat.name))
+        keep, duplicates = group[0], group[1:]
+        merged[keep.name] = [mat.name for mat in duplicates]
+        for mat in duplicates:
+            if mat.use_nodes and mat.node_tree:
+                nodes_removed += len(mat.node_tree.nodes)
+            if not dry_run:
+                mat.user_remap(keep)
+                materials.remove(mat)
+
+    if not dry_run and merged:
+        material_library.invalidate()
+
+    removed = sum(len(names) for names in merged.values())
+    return [TextContent(
+        type="text",
+        text=json.dumps({
+            "dry_run": dry_run,
+            "materials_before": before,
+            "materials_after": before - removed,
+            "groups_merged": len(merged),
+            "reclaimed": {
+                "materials": removed,
+                "nodes": nodes_removed,
+            },
+            "merged": merged,
+        })
+    )]
+
+
+@tools.register(
+    name="render_scene",
+    description="Render the current scene to an image file in the background and return a job id, "
+                "or render a quick preview and return the image itself",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filepath": {
+                "type": "string",
+                "description": "Output file path for the render (optional for previews, which are returned inline)"
+            },
+            "resolution_x": {
+                "type": "integer",
+                "description": "Render resolution width",
+                "default": 1920
+            },
+            "resolution_y": {
+                "type": "integer",
+                "description": "Render resolution height",
+                "default": 1080
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "Wait for the render to finish instead of returning a job id immediately",
+                "default": False
+            },
+            "use_cache": {
+                "type": "boolean",
+                "description": "Reuse an earlier render when the scene has not changed",
+                "default": True
+            },
+            "preview": {
+                "type": ["boolean", "object"],
+                "description": "Render a reduced-quality preview and return it as an image (true for the defaults). "
+                               "The scene's render settings are left unchanged.",
+                "properties": {
+                    "scale": {
+                        "type": "integer",
+                        "description": "Resolution percentage",
+                        "default": PREVIEW_DEFAULTS["scale"]
+                    },
+                    "samples": {
+                        "type": "integer",
+                        "description": "Render samples (Cycles and EEVEE)",
+                        "default": PREVIEW_DEFAULTS["samples"]
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(PREVIEW_FORMATS),
+                        "default": PREVIEW_DEFAULTS["format"]
+                    },
+                    "quality": {
+                        "type": "integer",
+                        "description": "JPEG/WebP quality (0-100)",
+                        "default": PREVIEW_DEFAULTS["quality"]
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Largest image to return; bigger previews are rendered again smaller",
+                        "default": PREVIEW_DEFAULTS["max_bytes"]
+                    }
+                }
+            }
+        }
+    },
+    bpy_thread=False
+)
+async def tool_render_scene(arguments: Any) -> list[TextContent | ImageContent]:
+    filepath = arguments.get("filepath")
+    res_x = arguments.get("resolution_x", 1920)
+    res_y = arguments.get("resolution_y", 1080)
+
+    preview = arguments.get("preview")
+    if preview:
+        preview = {**PREVIEW_DEFAULTS, **(preview if isinstance(preview, dict) else {})}
+        if preview["format"] not in PREVIEW_FORMATS:
+            return [TextContent(type="text", text=f"Error: preview format must be one of {', '.join(PREVIEW_FORMATS)}")]
+        preview["scale"] = min(100, max(1, preview["scale"]))
+        preview["samples"] = max(1, preview["samples"])
+        preview["quality"] = min(100, max(0, preview["quality"]))
+        return await _render_scene_preview(filepath, res_x, res_y, preview)
+    if not filepath:
+        return [TextContent(type="text", text="Error: filepath is required unless preview is set")]
+
+    job = render_jobs.submit(filepath, res_x, res_y, arguments.get("use_cache", True))
+    if not arguments.get("wait", False):
+        return [TextContent(
+            type="text",
+            text=f"Queued render job '{job.job_id}' for {filepath} at {res_x}x{res_y}"
+        )]
+
+    await job.done.wait()
+    if job.status != "done":
+        return [TextContent(
+            type="text",
+            text=f"Error: Render job '{job.job_id}' {job.status}" + (f": {job.error}" if job.error else "")
+        )]
+    return [TextContent(
+        type="text",
+        text=f"Rendered scene to {filepath} at {res_x}x{res_y}" + (" (from render cache)" if job.cached else "")
+    )]
+
+
+async def _render_scene_preview(filepath: str | None, res_x: int, res_y: int,
+                                preview: dict) -> list[TextContent | ImageContent]:
+    """Queue a preview render, wait for it and return the image inline."""
+    job = render_jobs.submit(filepath or "", res_x, res_y, preview=preview)
+    await job.done.wait()
+    if job.status != "done":
+        return [TextContent(
+            type="text",
+            text=f"Error: Render job '{job.job_id}' {job.status}" + (f": {job.error}" if job.error else "")
+        )]
+
+    image = job.image
+    if len(image) > preview["max_bytes"]:
+        return [TextContent(
+            type="text",
+            text=f"Error: Preview is {len(image)} bytes at {job.preview['scale']}%, over max_bytes "
+                 f"({preview['max_bytes']}); lower the resolution or use JPEG"
+        )]
+    saved, warning = "", None
+    if job.output:
+        try:
+            await asyncio.to_thread(_write_preview, job.output, image)
+            saved = f", saved to {job.output}"
+        except OSError as e:
+            warning = TextContent(type="text", text=f"Warning: Could not save the preview to {job.output}: {e}")
+
+    scale = job.preview["scale"]
+    width, height = max(1, res_x * scale // 100), max(1, res_y * scale // 100)
+    mime_type = _image_mime_type(image) or PREVIEW_FORMATS[preview["format"]]
+    return [
+        TextContent(
+            type="text",
+            text=f"Preview at {width}x{height} ({scale}%), {len(image)} bytes {mime_type}{saved}"
+        ),
+        ImageContent(type="image", data=base64.b64encode(image).decode("ascii"), mimeType=mime_type),
+        *([warning] if warning else []),
+    ]
+
+
+def _write_preview(path: str, image: bytes):
+    """Save a preview image, creating its directory."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(image)
+
+
+@tools.register(
+    name="render_animation",
+    description="Render a frame range in background Blender processes, several frames at once, and return a job id",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "output_path": {
+                "type": "string",
+                "description": "Output path for the frames; '#' marks the frame number, otherwise it is appended"
+            },
+            "frame_start": {
+                "type": "integer",
+                "description": "First frame (default: the scene's)"
+            },
+            "frame_end": {
+                "type": "integer",
+                "description": "Last frame, inclusive (default: the scene's)"
+            },
+            "frame_step": {
+                "type": "integer",
+                "description": "Render every nth frame (default: the scene's)"
+            },
+            "resolution_x": {
+                "type": "integer",
+                "description": "Render resolution width (default: the scene's)"
+            },
+            "resolution_y": {
+                "type": "integer",
+                "description": "Render resolution height (default: the scene's)"
+            },
+            "workers": {
+                "type": "integer",
+                "description": "Blender processes rendering at once (default: BLENDER_MCP_RENDER_WORKERS, "
+                               "or up to 4 by CPU count)"
+            },
+            "frames_per_shard": {
+                "type": "integer",
+                "description": "Frames each worker process renders before exiting "
+                               "(default: an even split over about 4 shards per worker)"
+            },
+            "retries": {
+                "type": "integer",
+                "description": "Times the unfinished frames of a failed shard are rendered again",
+                "default": 2
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "Wait for every frame to finish instead of returning a job id immediately",
+                "default": False
+            }
+        },
+        "required": ["output_path"]
+    },
+    bpy_thread=False
+)
+async def tool_render_animation(arguments: Any) -> list[TextContent]:
+    workers = arguments.get("workers") or int(os.environ.get("BLENDER_MCP_RENDER_WORKERS", "0")) \
+        or min(4, os.cpu_count() or 1)
+    frames_per_shard = arguments.get("frames_per_shard")
+    if workers < 1 or (frames_per_shard is not None and frames_per_shard < 1):
+        return [TextContent(type="text", text="Error: workers and frames_per_shard must be at least 1")]
+    # Each worker is a whole Blender process
+    workers = min(workers, os.cpu_count() or 1)
+
+    job = render_jobs.submit_animation(
+        arguments["output_path"], arguments.get("resolution_x"), arguments.get("resolution_y"),
+        frame_start=arguments.get("frame_start"), frame_end=arguments.get("frame_end"),
+        frame_step=arguments.get("frame_step"), workers=workers, frames_per_shard=frames_per_shard or 0,
+        retries=max(0, arguments.get("retries", 2))
+    )
+    if not arguments.get("wait", False):
+        state = f"Queued animation job '{job.job_id}' ({job.message})" if job.message else \
+            f"Started animation job '{job.job_id}'"
+        return [TextContent(
+            type="text",
+            text=f"{state} on {workers} workers; poll it with get_render_job"
+        )]
+
+    await job.done.wait()
+    if job.status != "done":
+        return [TextContent(
+            type="text",
+            text=f"Error: Animation job '{job.job_id}' {job.status}" + (f": {job.error}" if job.error else "")
+        )]
+    return [TextContent(
+        type="text",
+        text=json.dumps(job.to_dict())
+    )]
+
+
+@tools.register(
+    name="get_render_cache_stats",
+    description="Report render cache hits, misses, size and limits",
+    input_schema={
+        "type": "object",
+        "properties": {}
+    },
+    bpy_thread=False
+)
+async def tool_get_render_cache_stats(arguments: Any) -> list[TextContent]:
+    return [TextContent(
+        type="text",
+        text=json.dumps(render_cache.stats())
+    )]
+
+
+@tools.register(
+    name="configure_render_cache",
+    description="Change render cache limits, enable or disable it, or clear it",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "max_mb": {
+                "type": "number",
+                "description": "Maximum total size of cached renders in megabytes"
+            },
+            "max_entries": {
+                "type": "integer",
+                "description": "Maximum number of cached renders"
+            },
+            "enabled": {
+                "type": "boolean",
+                "description": "Enable or disable the render cache"
+            },
+            "clear": {
+                "type": "boolean",
+                "description": "Remove every cached render",
+                "default": False
+            }
+        }
+    },
+    bpy_thread=False
+)
+async def tool_configure_render_cache(arguments: Any) -> list[TextContent]:
+    max_mb = arguments.get("max_mb")
+    render_cache.configure(
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else None,
+        max_entries=arguments.get("max_entries"),
+        enabled=arguments.get("enabled"),
+        clear=arguments.get("clear", False)
+    )
+    return [TextContent(
+        type="text",
+        text=json.dumps(render_cache.stats())
+    )]
+
+
+@tools.register(
+    name="get_render_job",
+    description="Get the status and progress of a render job started by render_scene or render_animation",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "job_id": {
+                "type": "string",
+                "description": "Job id returned by render_scene or render_animation"
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "Wait until the job has finished",
+                "default": False
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Maximum number of seconds to wait",
+                "default": 60
+            }
+        },
+        "required": ["job_id"]
+    },
+    bpy_thread=False
+)
+async def tool_get_render_job(arguments: Any) -> list[TextContent]:
+    job = render_jobs.get(arguments["job_id"])
+    if arguments.get("wait", False):
+        try:
+            await asyncio.wait_for(job.done.wait(), arguments.get("timeout", 60))
+        except asyncio.TimeoutError:
+            pass
+    return [TextContent(
+        type="text",
+        text=json.dumps(job.to_dict())
+    )]
+
+
+@tools.register(
+    name="list_render_jobs",
+    description="List queued, running and recently finished render jobs",
+    input_schema={
+        "type": "object",
+        "properties": {}
+    },
+    bpy_thread=False
+)
+async def tool_list_render_jobs(arguments: Any) -> list[TextContent]:
+    return [TextContent(
+        type="text",
+        text=json.dumps([job.to_dict() for job in render_jobs.list()])
+    )]
+
+
+@tools.register(
+    name="cancel_render_job",
+    description="Cancel a queued render job, discard the result of a running one, "
+                "or stop the workers of a running animation job",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "job_id": {
+                "type": "string",
+                "description": "Job id returned by render_scene or render_animation"
+            }
+        },
+        "required": ["job_id"]
+    },
+    bpy_thread=False
+)
+async def tool_cancel_render_job(arguments: Any) -> list[TextContent]:
+    job = render_jobs.cancel(arguments["job_id"])
+    return [TextContent(
+        type="text",
+        text=json.dumps(job.to_dict())
+    )]
+
+
+# Tools the batch tool can run as steps
+BATCH_TOOLS = (
+    "create_cube", "create_sphere", "create_objects_batch", "create_mesh", "create_instances",
+    "move_object", "set_transforms", "set_material", "assign_materials", "delete_object",
+)
+
+
+@tools.register(
+    name="batch",
+    description="Run several create/move/material/delete tool calls in one pass on the server, with a "
+                "single scene update and undo step. Optionally roll everything back on the first failure",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "steps": {
+                "type": "array",
+                "description": "Tool calls to run in order",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {
+                            "type": "string",
+                            "description": f"Tool name: {', '.join(BATCH_TOOLS)}"
+                        },
+                        "arguments": {
+                            "type": "object",
+                            "description": "Arguments for the tool, as for a direct call"
+                        }
+                    },
+                    "required": ["tool"]
+                }
+            },
+            "rollback_on_error": {
+                "type": "boolean",
+                "description": "Stop at the first failing step and undo every step before it",
+                "default": False
+            },
+            "undo_message": {
+                "type": "string",
+                "description": "Name of the undo step",
+                "default": "MCP batch"
+            }
+        },
+        "required": ["steps"]
+    },
+    priority="heavy"
+)
+def tool_batch(arguments: Any) -> list[TextContent]:
+    global active_transaction
+    steps = arguments["steps"]
+    rollback = arguments.get("rollback_on_error", False)
+
+    unsupported = sorted({step.get("tool") for step in steps if step.get("tool") not in BATCH_TOOLS}, key=str)
+    if unsupported:
+        return [TextContent(
+            type="text",
+            text=f"Error: Not allowed in a batch: {', '.join(map(str, unsupported))} "
+                 f"(expected {', '.join(BATCH_TOOLS)})"
+        )]
+
+    started = time.perf_counter()
+    transaction = Transaction(rollback)
+    active_transaction = transaction
+    results = []
+    failed = None
+    try:
+        for index, step in enumerate(steps):
+            tool_name, step_arguments = step["tool"], step.get("arguments") or {}
+            transaction.record(tool_name, step_arguments)
+            result = tools.call_inline(tool_name, step_arguments)
+            ok = not _is_error_result(result)
+            text = "\n".join(c.text for c in result if isinstance(c, TextContent))
+            results.append({
+                "index": index,
+                "tool": tool_name,
+                "ok": ok,
+                # Tools with JSON output are embedded as objects rather than strings
+                "result": json.loads(text) if text.startswith("{") else text,
+            })
+            if not ok and rollback:
+                failed = index
+                break
+    finally:
+        active_transaction = None
+        if failed is not None:
+            transaction.rollback()
+        else:
+            transaction.commit()
+
+    if failed is None:
+        try:
+            bpy.ops.ed.undo_push(message=arguments.get("undo_message", "MCP batch"))
+        except RuntimeError:
+            pass  # No undo stack in background mode
+
+    succeeded = sum(1 for r in results if r["ok"])
+    summary = {
+        "steps": len(steps),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "skipped": len(steps) - len(results),
+        "rolled_back": failed is not None,
+        "seconds": round(time.perf_counter() - started, 4),
+        "results": results,
+    }
+    return [TextContent(
+        type="text",
+        text=json.dumps(summary)
+    )]
+
+
+@tools.register(
+    name="save_blend_file",
+    description="Save the current Blender file. Saves are coalesced with other saves of the same file, and skipped when nothing changed",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "filepath": {
+                "type": "string",
+                "description": "Path where to save the .blend file"
+            },
+            "compress": {
+                "type": "boolean",
+                "description": "Write a compressed .blend (smaller, slower to save; default: the autosave setting)"
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "Wait for the save to finish (default). With false the reply comes once the save is queued",
+                "default": True
+            }
+        },
+        "required": ["filepath"]
+    },
+    bpy_thread=False
+)
+async def tool_save_blend_file(arguments: Any) -> list[TextContent]:
+    filepath = arguments["filepath"]
+    future = autosaver.request(filepath, arguments.get("compress"))
+    if not arguments.get("wait", True):
+        text = f"Queued save to {filepath} (within {autosaver.window:g} s; see get_autosave_stats)"
+        if autosaver.last_error is not None:
+            text += (f". The last save, to {autosaver.last_error['filepath'] or 'the open file'}, "
+                     f"failed: {autosaver.last_error['error']}")
+        return [TextContent(type="text", text=text)]
+
+    result = await future
+    if result["status"] == "failed":
+        return [TextContent(type="text", text=f"Error: Saving {filepath} failed: {result['error']}")]
+    if result["status"] == "skipped":
+        return [TextContent(type="text", text=f"Skipped saving {filepath}: {result['reason']}")]
+    return [TextContent(
+        type="text",
+        text=f"Saved Blender file to {result['filepath']} ({result['bytes']} bytes"
+             + (", compressed" if result["compressed"] else "") + f", {result['seconds']:.3f} s)"
+    )]
+
+
+@tools.register(
+    name="get_autosave_stats",
+    description="Report save requests, coalesced and skipped saves, save durations and bytes written",
+    input_schema={
+        "type": "object",
+        "properties": {}
+    },
+    bpy_thread=False
+)
+async def tool_get_autosave_stats(arguments: Any) -> list[TextContent]:
+    return [TextContent(
+        type="text",
+        text=json.dumps(autosaver.stats())
+    )]
+
+
+@tools.register(
+    name="configure_autosave",
+    description="Change the save coalescing window, compression, snapshot count or periodic autosave interval",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "window": {
+                "type": "number",
+                "description": "Minimum seconds between saves; requests in between share the next save"
+            },
+            "compress": {
+                "type": "boolean",
+                "description": "Write compressed .blend files by default"
+            },
+            "snapshots": {
+                "type": "integer",
+                "description": "Numbered copies of each saved file to keep in <name>_snapshots (0 disables)"
+            },
+            "interval": {
+                "type": "number",
+                "description": "Save the open file every this many seconds when it changed (0 disables)"
+            },
+            "flush": {
+                "type": "boolean",
+                "description": "Run queued saves now",
+                "default": False
+            }
+        }
+    },
+    bpy_thread=False
+)
+async def tool_configure_autosave(arguments: Any) -> list[TextContent]:
+    autosaver.configure(
+        window=arguments.get("window"),
+        compress=arguments.get("compress"),
+        snapshots=arguments.get("snapshots"),
+        interval=arguments.get("interval")
+    )
+    if arguments.get("flush", False):
+        await autosaver.flush()
+    return [TextContent(
+        type="text",
+        text=json.dumps(autosaver.stats())
+    )]
+
+
+@tools.register(
+    name="execute_python",
+    description="Execute arbitrary Python code in Blender's context. Set `result` to return a value; "
+                "pass a session name to keep definitions and data between calls. Printed output is "
+                "returned and streamed as notifications while the code runs",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "code": {
+                "type": "string",
+                "description": "Python code to execute"
+            },
+            "session": {
+                "type": "string",
+                "description": "Run in this named, persistent namespace (created on first use)"
+            },
+            "profile": {
+                "type": "boolean",
+                "description": "Run the code under cProfile and add its hotspots as a second, JSON result",
+                "default": False
+            },
+            "profile_top": {
+                "type": "integer",
+                "description": "Number of functions to report, by own time (default 20)",
+                "minimum": 1
+            },
+            "time_limit": {
+                "type": "number",
+                "description": "Stop the code after this many seconds (default: BLENDER_MCP_SCRIPT_TIME_LIMIT, "
+                               "0 for none). Takes effect between Python statements, not inside a render "
+                               "or operator call"
+            },
+            "stream_output": {
+                "type": "boolean",
+                "description": "Send printed output as progress notifications (when the request has a "
+                               "progressToken) or log messages while the code runs",
+                "default": True
+            }
+        },
+        "required": ["code"]
+    },
+    bpy_thread=False
+)
+async def tool_execute_python(arguments: Any) -> list[TextContent]:
+    time_limit = arguments.get("time_limit", SCRIPT_TIME_LIMIT)
+    run = ScriptRun(time_limit)
+    execute = _execute_script
+    if tracer.enabled:
+        execute = tracer.wrap(execute, "execute_python", tracer.current_request())
+
+    running_scripts[run.script_id] = run
+    try:
+        future = asyncio.wrap_future(bpy_executor.submit(run.run, lambda: execute(run, arguments), priority="heavy"))
+        try:
+            result = await _watch_script(run, future, arguments.get("stream_output", True))
+        except asyncio.CancelledError:
+            # The client cancelled the request: stop the script rather than leave it holding the bpy thread
+            run.interrupt("the request was cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Error executing execute_python: {e}", exc_info=True)
+            return [TextContent(type="text", text=f"Error executing execute_python: {e}"),
+                    *_script_output_content(run)]
+    finally:
+        running_scripts.pop(run.script_id, None)
+
+    if run.stop_reason:
+        return [TextContent(type="text", text=f"Error: Script {run.script_id} stopped: {run.stop_reason}"),
+                *_script_output_content(run)]
+    return [*result, *_script_output_content(run)]
+
+
+def _execute_script(run: ScriptRun, arguments: Any) -> list[TextContent]:
+    """execute_python's work on the bpy thread, inside run.run()."""
+    _capture_script_output()
+    with tracer.span("compile", "python"):
+        code = code_cache.compile(arguments["code"])
+    session_name = arguments.get("session")
+
+    if session_name:
+        session = python_sessions.get(session_name)
+        if session is None:
+            session = python_sessions[session_name] = PythonSession(session_name, {"bpy": bpy})
+        session.calls += 1
+        session.last_used = time.time()
+        namespace = session.namespace
+        # A result from an earlier call must not be reported again
+        namespace.pop("result", None)
+    else:
+        # Create a namespace with bpy available
+        namespace = {"bpy": bpy}
+
+    # Execute the code; it may change the scene in any way, so the indexes are rebuilt on next use
+    spatial_index.invalidate()
+    material_library.invalidate()
+    profiler = None
+    if arguments.get("profile", False):
+        import cProfile
+        profiler = cProfile.Profile()
+    with tracer.span("exec", "python", session=session_name):
+        if profiler is None:
+            exec(code, namespace)
+        else:
+            profiler.enable()
+            try:
+                exec(code, namespace)
+            finally:
+                profiler.disable()
+
+    # Get any output
+    result = namespace.get("result", "Code executed successfully")
+
+    content = [TextContent(
+        type="text",
+        text=str(result)
+    )]
+    if profiler is not None:
+        content.append(TextContent(
+            type="text",
+            text=json.dumps(_profile_hotspots(profiler, arguments.get("profile_top", 20)))
+        ))
+    return content
+
+
+async def _watch_script(run: ScriptRun, future: asyncio.Future, stream: bool):
+    """Wait for a script, streaming its output and enforcing its time limit."""
+    try:
+        context = app.request_context
+    except LookupError:
+        context = None
+    last_interrupt = 0.0
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=SCRIPT_STREAM_INTERVAL)
+        if stream and context is not None:
+            text = run.take_unsent()
+            if text:
+                await _send_script_output(context, run, text)
+        if done:
+            return future.result()
+        now = time.perf_counter()
+        if run.time_limit and run.started_at is not None and now - run.started_at > run.time_limit:
+            # Interrupt again every second, in case the script catches BaseException
+            if now - last_interrupt >= 1.0:
+                run.interrupt(f"time limit of {run.time_limit:g} s reached")
+                last_interrupt = now
+
+
+async def _send_script_output(context, run: ScriptRun, text: str):
+    """Send output as a progress notification when the request asked for progress, else as a log message."""
+    token = context.meta.progressToken if context.meta is not None else None
+    elapsed = time.perf_counter() - run.started_at if run.started_at is not None else 0.0
+    try:
+        if token is not None:
+            await context.session.send_progress_notification(
+                token, progress=round(elapsed, 3), message=text, related_request_id=context.request_id
+            )
+        elif _log_level_enabled("info"):
+            await context.session.send_log_message(
+                level="info", data={"script_id": run.script_id, "output": text},
+                logger="execute_python", related_request_id=context.request_id
+            )
+    except Exception as e:
+        # The client may already be gone; the output is still returned with the result
+        logger.warning(f"Could not stream output of {run.script_id}: {e}")
+
+
+def _script_output_content(run: ScriptRun) -> list[TextContent]:
+    """The script's printed output as an extra result item, if it printed anything."""
+    text = str(run.output)
+    if not text:
+        return []
+    header = f"Output of {run.script_id}"
+    if run.output.dropped:
+        header += f" (first {run.output.dropped} characters dropped)"
+    return [TextContent(type="text", text=f"{header}:\n{text}")]
+
+
+@tools.register(
+    name="cancel_python",
+    description="Stop a running or queued execute_python call",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "script_id": {
+                "type": "string",
+                "description": "Id of the call, as shown in its output notifications (default: every running call)"
+            }
+        }
+    },
+    bpy_thread=False
+)
+async def tool_cancel_python(arguments: Any) -> list[TextContent]:
+    script_id = arguments.get("script_id")
+    if script_id is None:
+        runs = [run for run in running_scripts.values() if run.state == "running"]
+    elif script_id in running_scripts:
+        runs = [running_scripts[script_id]]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"Error: No running execute_python call '{script_id}'"
+        )]
+
+    stopped = [run.script_id for run in runs if run.interrupt("cancelled by cancel_python")]
+    return [TextContent(
+        type="text",
+        text=json.dumps({"cancelled": stopped})
+    )]
+
+
+def _profile_hotspots(profiler, top: int) -> dict:
+    """The functions of a cProfile run that took the most time themselves."""
+    import pstats
+    stats = pstats.Stats(profiler)
+    functions = []
+    for (filename, line, function), (primitive_calls, calls, own, cumulative, _) in stats.stats.items():
+        if function == "<method 'disable' of '_lsprof.Profiler' objects>":
+            continue
+        location = f"{os.path.basename(filename)}:{line}" if filename != "~" else "built-in"
+        functions.append({
+            "function": f"{location}({function})",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "own_ms": round(own * 1000.0, 3),
+            "cumulative_ms": round(cumulative * 1000.0, 3),
+        })
+    functions.sort(key=lambda row: row["own_ms"], reverse=True)
+    return {
+        "total_ms": round(stats.total_tt * 1000.0, 3),
+        "function_calls": stats.total_calls,
+        "hotspots": functions[:top],
+    }
+
+
+@tools.register(
+    name="list_python_sessions",
+    description="List persistent execute_python sessions with their size, and the compiled-code cache hit rate",
+    input_schema={
+        "type": "object",
+        "properties": {}
+    },
+    priority="read"
+)
+def tool_list_python_sessions(arguments: Any) -> list[TextContent]:
+    return [TextContent(
+        type="text",
+        text=json.dumps({
+            "sessions": [session.to_dict() for session in python_sessions.values()],
+            "code_cache": code_cache.stats(),
+        })
+    )]
+
+
+@tools.register(
+    name="clear_python_session",
+    description="Delete a persistent execute_python session, or all of them when no name is given",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "session": {
+                "type": "string",
+                "description": "Session to delete (default: all sessions)"
+            }
+        }
+    }
+)
+def tool_clear_python_session(arguments: Any) -> list[TextContent]:
+    session_name = arguments.get("session")
+    if session_name is None:
+        cleared = list(python_sessions)
+        python_sessions.clear()
+    elif session_name in python_sessions:
+        cleared = [session_name]
+        del python_sessions[session_name]
+    else:
+        return [TextContent(
+            type="text",
+            text=f"Error: Python session '{session_name}' not found"
+        )]
+
+    return [TextContent(
+        type="text",
+        text=f"Cleared {len(cleared)} Python session(s): {', '.join(cleared) or 'none'}"
+    )]
+
+
+@tools.register(
+    name="configure_tracing",
+    description="Start or stop recording a Chrome trace of tool calls and their phases, or write it to a file",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "enabled": {
+                "type": "boolean",
+                "description": "Start (true) or stop (false) recording"
+            },
+            "output_path": {
+                "type": "string",
+                "description": "Write the events recorded so far to this JSON file (chrome://tracing, Perfetto)"
+            },
+            "clear": {
+                "type": "boolean",
+                "description": "Discard the events recorded so far (after writing them, if output_path is given)",
+                "default": False
+            }
+        }
+    },
+    bpy_thread=False
+)
+async def tool_configure_tracing(arguments: Any) -> list[TextContent]:
+    enabled = arguments.get("enabled")
+    if enabled is True:
+        tracer.start()
+    elif enabled is False:
+        tracer.stop()
+
+    stats = {}
+    output_path = arguments.get("output_path")
+    if output_path:
+        stats["written"] = tracer.export(output_path)
+        stats["output_path"] = output_path
+    if arguments.get("clear", False):
+        tracer.clear()
+    stats.update(tracer.stats())
+
+    return [TextContent(
+        type="text",
+        text=json.dumps(stats)
+    )]
+
+
+@tools.register(
+    name="get_server_stats",
+    description="Report per-tool call counts, error counts and p50/p95/p99 latency",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "output_path": {
+                "type": "string",
+                "description": "Also write the statistics as JSON to this file"
+            }
+        }
+    },
+    bpy_thread=False
+)
+async def tool_get_server_stats(arguments: Any) -> list[TextContent]:
+    stats = tools.stats()
+    stats["render_cache"] = render_cache.stats()
+    stats["autosave"] = autosaver.stats()
+    stats["bpy_queue"] = bpy_executor.stats()
+    stats["read_snapshot"] = read_snapshot.stats()
+    stats["startup_ms"] = startup.stats()
+    stats["tracing"] = tracer.stats()
+    stats["code_cache"] = code_cache.stats()
+    stats["spatial_index"] = spatial_index.stats()
+    stats["material_library"] = material_library.stats()
+
+    output_path = arguments.get("output_path")
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+
+    return [TextContent(
+        type="text",
+        text=json.dumps(stats)
+    )]
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available Blender tools."""
+    return tools.list_tools()
+
+
+# MCP log levels, least severe first, and the level each client asked for with logging/setLevel
+LOG_LEVELS = ("debug", "info", "notice", "warning", "error", "critical", "alert", "emergency")
+_log_levels: dict[str, str] = {}
+
+
+def _log_level_enabled(level: str) -> bool:
+    minimum = _log_levels.get(current_client.get(), "debug")
+    return LOG_LEVELS.index(level) >= LOG_LEVELS.index(minimum)
+
+
+@app.set_logging_level()
+async def set_logging_level(level: str) -> None:
+    """Handle logging/setLevel: the least severe log messages this client wants."""
+    _log_levels[current_client.get()] = level
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle tool calls for Blender operations."""
+
+    if not BLENDER_AVAILABLE:
+        return [TextContent(
+            type="text",
+            text="Error: Blender Python API (bpy) is not available. This server must be run from within Blender."
+        )]
+
+    return await tools.call(name, arguments)
+
+
+# Per-user directory (mode 0700) for the default unix socket and TCP token files; the
+# wrapper uses the same one, so `blender_mcp_wrapper.py --connect` finds both
+RUNTIME_DIR = os.path.join(os.path.expanduser("~"), ".blender_mcp")
+
+# Default address for --transport socket. asyncio has no unix sockets on Windows, so
+# there it listens on localhost TCP, where clients must present a token.
+if sys.platform == "win32":
+    DEFAULT_LISTEN_ADDRESS = "127.0.0.1:8766"
+else:
+    DEFAULT_LISTEN_ADDRESS = "unix:" + os.path.join(RUNTIME_DIR, "server.sock")
+
+# Any local user can connect to a localhost port and a session can run arbitrary Python,
+# so on TCP a client's first line must be AUTH_PREFIX and the token, within AUTH_TIMEOUT
+# seconds. Unix sockets are created accessible to their owner only.
+AUTH_PREFIX = b"AUTH "
+AUTH_TIMEOUT = 5.0
+
+# Longest JSON-RPC line accepted from a socket client (base64 payloads can be large)
+SOCKET_LINE_LIMIT = 256 * 1024 * 1024
+
+_client_ids = itertools.count(1)
+
+
+def parse_args(argv=None):
+    """Server options. Under Blender they go after '--', e.g.
+    blender --background --python blender_mcp_server.py -- --transport socket
+    """
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(prog="blender_mcp_server.py", allow_abbrev=False)
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "socket"],
+        default=os.environ.get("BLENDER_MCP_TRANSPORT", "stdio"),
+        help="stdio serves one client; socket lets several clients share this Blender instance"
+    )
+    parser.add_argument(
+        "--listen",
+        default=os.environ.get("BLENDER_MCP_LISTEN", DEFAULT_LISTEN_ADDRESS),
+        help="Socket address: host:port, tcp:host:port or unix:/path (TCP clients need a token, "
+             "see BLENDER_MCP_TOKEN)"
+    )
+    parser.add_argument(
+        "--startup-timing",
+        action="store_true",
+        default=startup.enabled,
+        help="Log how long each startup phase took once the first request is answered "
+             "(BLENDER_MCP_STARTUP_TIMING=1)"
+    )
+    # Blender's own arguments (--background, --python ...) are left alone
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def _parse_address(text: str) -> tuple[str, Any]:
+    """Return ("unix", path) or ("tcp", (host, port)) for a --listen address."""
+    if text.startswith("unix:"):
+        return "unix", text[len("unix:"):]
+    if text.startswith("tcp:"):
+        text = text[len("tcp:"):]
+    host, _, port = text.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def _token_file(port: int) -> str:
+    """Where a TCP listener on port keeps the token it generated."""
+    return os.path.join(RUNTIME_DIR, f"{port}.token")
+
+
+def _listener_token(port: int) -> str:
+    """The token TCP clients must send: BLENDER_MCP_TOKEN, or a new random one written to
+    _token_file(port), readable only by this user."""
+    token = os.environ.get("BLENDER_MCP_TOKEN")
+    if token:
+        return token
+    token = secrets.token_urlsafe(32)
+    os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+    path = _token_file(port)
+    if os.path.exists(path):
+        os.unlink(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    logger.info(f"Socket clients authenticate with the token in {path}")
+    return token
+
+
+async def _authenticate(reader: asyncio.StreamReader, token: str) -> bool:
+    """Whether a TCP client's first line carries the listener's token."""
+    try:
+        line = await asyncio.wait_for(reader.readline(), AUTH_TIMEOUT)
+    except (asyncio.TimeoutError, ValueError, ConnectionError):
+        return False
+    return hmac.compare_digest(line.rstrip(b"\r\n"), AUTH_PREFIX + token.encode())
+
+
+class _TracedReadStream:
+    """Read stream wrapper noting when each request arrives, while the tracer is enabled."""
+
+    def __init__(self, stream, client: str):
+        self._stream = stream
+        self._client = client
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self._stream.__anext__()
+        if tracer.enabled and isinstance(message, SessionMessage):
+            root = message.message.root
+            if isinstance(root, JSONRPCRequest):
+                tracer.request_read(self._client, root.id, root.method)
+        return message
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    async def __aenter__(self):
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._stream.__aexit__(*exc_info)
+
+
+class _ReplyStream:
+    """Write stream wrapper noting when replies are sent.
+
+    The first reply (the initialize result) ends the startup timing. While the tracer is
+    enabled, each response closes its request's span.
+    """
+
+    def __init__(self, stream, client: str):
+        self._stream = stream
+        self._client = client
+
+    async def send(self, message):
+        await self._stream.send(message)
+        if tracer.enabled:
+            root = message.message.root
+            if isinstance(root, (JSONRPCResponse, JSONRPCError)):
+                tracer.response_sent(self._client, root.id)
+        if not startup.answered.is_set():
+            startup.mark("initialize answered")
+            startup.answered.set()
+            if startup.enabled:
+                startup.report()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    async def __aenter__(self):
+        await self._stream.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._stream.__aexit__(*exc_info)
+
+
+async def _serve_socket_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                               token: str | None = None):
+    """Run one MCP session over a socket connection (newline-delimited JSON-RPC, as on stdio).
+
+    With a token (TCP), the connection is dropped unless its first line authenticates.
+    """
+    if token is not None and not await _authenticate(reader, token):
+        logger.warning("Rejected a socket client without a valid token")
+        writer.close()
+        return
+    client = f"client-{next(_client_ids)}"
+    # Each connection runs in its own task, so this only tags this client's bpy work
+    current_client.set(client)
+    logger.info(f"{client} connected")
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader():
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError) as e:
+                    logger.warning(f"{client}: dropping connection: {e}")
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    message = JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def socket_writer():
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                data = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                try:
+                    writer.write(data.encode("utf-8") + b"\n")
+                    await writer.drain()
+                except ConnectionError:
+                    # Client went away mid-response; end the whole session
+                    task_group.cancel_scope.cancel()
+                    return
+
+    try:
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(socket_reader)
+            task_group.start_soon(socket_writer)
+            await app.run(_TracedReadStream(read_stream, client), _ReplyStream(write_stream, client),
+                          app.create_initialization_options())
+    except Exception as e:
+        logger.error(f"{client}: session error: {e}", exc_info=True)
+    finally:
+        writer.close()
+        logger.info(f"{client} disconnected")
+
+
+async def serve_socket(address: str):
+    """Accept MCP clients on address until cancelled; they all share this Blender instance."""
+    kind, addr = _parse_address(address)
+    if kind == "unix":
+        directory = os.path.dirname(addr)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(addr):
+            os.unlink(addr)
+        # Owner-only from the moment it exists, rather than chmod after bind
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            sock.bind(addr)
+        finally:
+            os.umask(umask)
+        server = await asyncio.start_unix_server(_serve_socket_client, sock=sock, limit=SOCKET_LINE_LIMIT)
+    else:
+        host, port = addr
+        token = _listener_token(port)
+        server = await asyncio.start_server(
+            lambda reader, writer: _serve_socket_client(reader, writer, token),
+            host, port, limit=SOCKET_LINE_LIMIT)
+
+    logger.info(f"Listening for MCP clients on {address}")
+    startup.mark("listening")
+    async with server:
+        await server.serve_forever()
+
+
+async def main(transport: str = "stdio", address: str = DEFAULT_LISTEN_ADDRESS):
+    """Main entry point for the server."""
+    # Ensure stdout is clean for MCP JSON-RPC communication
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    logger.info("Starting Blender MCP Server...")
+
+    if not BLENDER_AVAILABLE:
+        logger.warning("Blender Python API not available - limited functionality")
+
+    # Run the MCP server
+    autosaver.start()
+    try:
+        if transport == "socket":
+            await serve_socket(address)
+        else:
+            async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+                startup.mark("listening")
+                await app.run(
+                    _TracedReadStream(read_stream, current_client.get()),
+                    _ReplyStream(write_stream, current_client.get()),
+                    app.create_initialization_options()
+                )
+    except Exception as e:
+        logger.error(f"MCP server error: {e}", exc_info=True)
+        raise
+    finally:
+        # Saves clients were told are queued still happen; the bpy thread runs until main returns
+        await autosaver.flush()
+        stats_file = os.environ.get("BLENDER_MCP_STATS_FILE")
+        if stats_file:
+            tools.write_stats(stats_file)
+            logger.info(f"Wrote tool statistics to {stats_file}")
+        trace_file = os.environ.get("BLENDER_MCP_TRACE")
+        if trace_file:
+            count = tracer.export(trace_file)
+            logger.info(f"Wrote {count} trace events to {trace_file}")
+
+
+def _run_server_thread(stop_event: threading.Event, outcome: dict, args: argparse.Namespace):
+    """Run the asyncio MCP server, then tell the bpy thread to stop."""
+    try:
+        asyncio.run(main(args.transport, args.listen))
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        outcome["exit_code"] = 1
+    finally:
+        stop_event.set()
+
+
+if __name__ == "__main__":
+    startup.mark("module loaded")
+    # Final check: ensure no buffered output in stdout
+    sys.stdout.flush()
+    args = parse_args()
+    startup.enabled = args.startup_timing
+
+    # The MCP loop runs on a worker thread so that long bpy work (renders, saves)
+    # never blocks JSON-RPC; this thread keeps ownership of bpy.
+    stop_event = threading.Event()
+    outcome = {"exit_code": 0}
+    server_thread = threading.Thread(
+        target=_run_server_thread,
+        args=(stop_event, outcome, args),
+        name="mcp-server",
+        daemon=True
+    )
+    server_thread.start()
+
+    try:
+        # A socket server has no client to answer yet, so there is nothing to wait for
+        _finish_startup(wait=STARTUP_DEFER_SECONDS if args.transport == "stdio" else 0)
+        bpy_executor.serve_forever(stop_event)
+    except KeyboardInterrupt:
+        logger.info("Shutting down Blender MCP Server...")
+
+    if outcome["exit_code"]:
+        sys.exit(outcome["exit_code"])
+else:
+    # Imported as a module (tests, embedding): nothing to hand the handshake to
+    _finish_startup(wait=0)
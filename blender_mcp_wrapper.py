@@ -7,8 +7,57 @@ This wrapper launches Blender with the MCP server and filters stdout to prevent
 import sys
 import subprocess
 import os
+import queue
+import hmac
+import secrets
+import shlex
+import signal
+import socket
 import threading
-import select
+import time
+import argparse
+
+# Read size for the fast forwarding path. Large reads keep the syscall count low for
+# big JSON-RPC frames (base64 images, large object lists).
+FAST_READ_SIZE = 256 * 1024
+
+# Per-user directory (mode 0700) for default unix sockets and TCP token files
+RUNTIME_DIR = os.path.join(os.path.expanduser("~"), ".blender_mcp")
+
+# Where a warm pool (--pool) listens and --connect looks for it. Windows has no unix
+# sockets, so it listens on localhost TCP and clients must present a token (see AUTH_PREFIX).
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_POOL_ADDRESS = "unix:" + os.path.join(RUNTIME_DIR, "pool.sock")
+else:
+    DEFAULT_POOL_ADDRESS = "127.0.0.1:8765"
+
+# First line a client sends on a TCP connection, followed by the listener's token. Any local
+# user can reach a localhost port and a session can run arbitrary Python, so TCP listeners
+# drop connections that do not start with it. Unix sockets are only accessible to their owner.
+AUTH_PREFIX = b"AUTH "
+
+# Seconds a TCP client has to send its token line, and its longest accepted length
+AUTH_TIMEOUT = 5.0
+AUTH_LINE_LIMIT = 1024
+
+# Seconds a pooled client waits for a child when every warm one is taken
+SESSION_WAIT = 120
+
+# Bytes that may precede the opening '{' of a JSON-RPC frame
+_WHITESPACE = b' \t\r'
+
+# Blender's startup messages, filtered out of stdout
+SKIP_PATTERNS = [
+    'Blender',
+    'Read blend:',
+    'Saved session',
+    'Info:',
+    'Warning:',
+    'found bundled python:',
+    'Color management',
+    'Read new prefs:',
+    'Switching to fully guarded memory allocator'
+]
 
 def filter_output(pipe, target_stream):
     """Filter Blender's output and only forward valid JSON-RPC lines."""
@@ -34,21 +83,8 @@ def filter_output(pipe, target_stream):
                 target_stream.buffer.flush()
                 continue
 
-            # Skip Blender's startup messages
-            skip_patterns = [
-                'Blender',
-                'Read blend:',
-                'Saved session',
-                'Info:',
-                'Warning:',
-                'found bundled python:',
-                'Color management',
-                'Read new prefs:',
-                'Switching to fully guarded memory allocator'
-            ]
-
             # Check if this line should be skipped
-            should_skip = any(pattern in decoded for pattern in skip_patterns)
+            should_skip = any(pattern in decoded for pattern in SKIP_PATTERNS)
 
             if should_skip:
                 # Log what we're filtering
@@ -64,18 +100,175 @@ def filter_output(pipe, target_stream):
             sys.stderr.write(f"[Wrapper] Error filtering output: {e}\n")
             sys.stderr.flush()
 
+class RateLimitedLog:
+    """Writes diagnostic lines to stderr, at most max_lines per interval seconds.
+
+    Lines over the limit are counted and reported as a single summary line once the
+    next interval starts, so a chatty child cannot flood stderr or slow forwarding.
+    """
+
+    def __init__(self, max_lines=20, interval=1.0, max_chars=200):
+        self.max_lines = max_lines
+        self.interval = interval
+        self.max_chars = max_chars
+        self._window_start = time.monotonic()
+        self._written = 0
+        self._suppressed = 0
+
+    def flush(self):
+        """Report lines suppressed in the current interval."""
+        if self._suppressed:
+            sys.stderr.write(f"[Wrapper] ({self._suppressed} more lines filtered)\n")
+            sys.stderr.flush()
+            self._suppressed = 0
+
+    def log(self, prefix, data):
+        now = time.monotonic()
+        if now - self._window_start >= self.interval:
+            self.flush()
+            self._window_start = now
+            self._written = 0
+
+        if self._written >= self.max_lines:
+            self._suppressed += 1
+            return
+
+        self._written += 1
+        text = bytes(data[:self.max_chars]).decode('utf-8', errors='replace').rstrip()
+        sys.stderr.write(f"[Wrapper] {prefix}: {text}\n")
+        sys.stderr.flush()
+
+def _write_all(fd, data):
+    """os.write until every byte of data (bytes or memoryview) is written."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+class FrameFilter:
+    """Splits raw child stdout into JSON-RPC frames and other output, without decoding.
+
+    A line whose first non-blank byte is '{' is a JSON-RPC frame. Frame bytes are handed
+    back as memoryview slices of the chunk they arrived in, as soon as they arrive, so
+    even multi-megabyte frames are never buffered whole or copied line by line;
+    contiguous frames in one chunk come back as a single slice. Everything else is
+    dropped and reported through a rate-limited log.
+    """
+
+    def __init__(self, log=None):
+        self.log = log if log is not None else RateLimitedLog()
+        # None at the start of a line, True inside a JSON frame, False inside other output
+        self._forwarding = None
+        self._discarded = bytearray()  # start of the current non-JSON line, kept for the log
+
+    def feed(self, chunk):
+        """Return the slices of chunk (bytes) that belong to JSON-RPC frames."""
+        view = memoryview(chunk)
+        size = len(chunk)
+        pos = 0
+        spans = []
+        # Pending run [out_start, out_end) of frame bytes
+        out_start = out_end = None
+
+        while pos < size:
+            if self._forwarding is None:
+                # Leading blanks are dropped; an empty line is skipped entirely
+                while pos < size and chunk[pos] in _WHITESPACE:
+                    pos += 1
+                if pos == size:
+                    break
+                if chunk[pos] == 0x0A:
+                    pos += 1
+                    continue
+                self._forwarding = chunk[pos] == 0x7B  # '{'
+
+            newline = chunk.find(b'\n', pos)
+            end = size if newline < 0 else newline + 1
+
+            if self._forwarding:
+                if out_start is not None and out_end != pos:
+                    spans.append(view[out_start:out_end])
+                    out_start = None
+                if out_start is None:
+                    out_start = pos
+                out_end = end
+            elif len(self._discarded) < self.log.max_chars:
+                self._discarded += view[pos:min(end, pos + self.log.max_chars - len(self._discarded))]
+
+            pos = end
+            if newline >= 0:
+                if not self._forwarding:
+                    self.log.log("Filtered", self._discarded)
+                    self._discarded = bytearray()
+                self._forwarding = None
+
+        if out_start is not None:
+            spans.append(view[out_start:out_end])
+        return spans
+
+    def finish(self):
+        """Report any trailing non-JSON output."""
+        if self._discarded:
+            self.log.log("Filtered", self._discarded)
+            self._discarded = bytearray()
+        self.log.flush()
+
+def forward_output_fast(pipe, target_stream, log=None):
+    """Forward JSON-RPC frames from pipe to target_stream on raw bytes (see FrameFilter)."""
+    frames = FrameFilter(log)
+    read_fd = pipe.fileno()
+    write_fd = target_stream.fileno()
+
+    while True:
+        try:
+            chunk = os.read(read_fd, FAST_READ_SIZE)
+        except OSError:
+            break
+        if not chunk:
+            break
+        for span in frames.feed(chunk):
+            _write_all(write_fd, span)
+
+    frames.finish()
+
+class LinePrefixer:
+    """Prefixes every line of a byte stream, across chunk boundaries."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._at_line_start = True
+
+    def feed(self, chunk):
+        if not chunk:
+            return b''
+        lines = chunk.split(b'\n')
+        body = (b'\n' + self.prefix).join(lines)
+        if self._at_line_start:
+            body = self.prefix + body
+        # A chunk ending in a newline leaves a dangling prefix for the next line
+        self._at_line_start = chunk.endswith(b'\n')
+        if self._at_line_start:
+            body = body[:-len(self.prefix)]
+        return body
+
 def forward_stdin(process):
-    """Forward stdin to the Blender process."""
+    """Forward stdin to the Blender process.
+
+    Reads whatever is available (up to FAST_READ_SIZE) straight from the file
+    descriptor, so a short JSON-RPC request is forwarded immediately and a large one
+    takes few syscalls; BufferedReader.read(n) would wait for n bytes or EOF.
+    """
+    stdin_fd = sys.stdin.fileno()
+    child_fd = process.stdin.fileno()
     try:
         while True:
             # Read from stdin
-            data = sys.stdin.buffer.read(1024)
+            data = os.read(stdin_fd, FAST_READ_SIZE)
             if not data:
                 break
 
             # Write to process
-            process.stdin.write(data)
-            process.stdin.flush()
+            _write_all(child_fd, data)
     except (BrokenPipeError, IOError, OSError) as e:
         sys.stderr.write(f"[Wrapper] stdin closed: {e}\n")
         sys.stderr.flush()
@@ -85,33 +278,578 @@ def forward_stdin(process):
         except:
             pass
 
-def main():
-    """Launch Blender with the MCP server."""
-    # Get the directory of this script
+def run_event_loop(process, log=None):
+    """Forward stdin, stdout and stderr for process from a single selectors loop.
+
+    Replaces the three forwarding threads; stdout is framed by FrameFilter. Child stdin is non-blocking: when the child
+    is slow to read, pending data is kept and stdin is not read again until it drains,
+    so memory stays bounded. Returns when the child's stdout and stderr are closed.
+    Pipes cannot be used with selectors on Windows, where the threaded mode is used.
+    """
+    import selectors
+
+    frames = FrameFilter(log)
+    stderr_prefix = LinePrefixer(b'[Blender] ')
+    stdin_fd = sys.stdin.fileno()
+    stdout_fd = sys.stdout.fileno()
+    stderr_fd = sys.stderr.fileno()
+    child_in = process.stdin.fileno()
+    child_out = process.stdout.fileno()
+    child_err = process.stderr.fileno()
+    os.set_blocking(child_in, False)
+
+    selector = selectors.DefaultSelector()
+    selector.register(child_out, selectors.EVENT_READ, 'stdout')
+    selector.register(child_err, selectors.EVENT_READ, 'stderr')
+
+    pending = memoryview(b'')  # stdin data not yet accepted by the child
+    stdin_open = True
+    try:
+        selector.register(stdin_fd, selectors.EVENT_READ, 'stdin')
+    except PermissionError:
+        # stdin is a regular file or /dev/null, which epoll refuses: it is always ready
+        pending = memoryview(sys.stdin.buffer.read())
+        stdin_open = False
+        if pending:
+            selector.register(child_in, selectors.EVENT_WRITE, 'child_in')
+        else:
+            process.stdin.close()
+
+    def close_child_stdin():
+        try:
+            selector.unregister(child_in)
+        except (KeyError, ValueError):
+            pass
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+    def child_output_open():
+        registered = selector.get_map()
+        return child_out in registered or child_err in registered
+
+    while child_output_open():
+        for key, _ in selector.select():
+            source = key.data
+
+            if source == 'stdin':
+                data = os.read(stdin_fd, FAST_READ_SIZE)
+                if not data:
+                    stdin_open = False
+                    selector.unregister(stdin_fd)
+                    if not pending:
+                        close_child_stdin()
+                    continue
+                pending = memoryview(data)
+                # Stop reading stdin until the child has taken this chunk
+                selector.unregister(stdin_fd)
+                selector.register(child_in, selectors.EVENT_WRITE, 'child_in')
+
+            elif source == 'child_in':
+                try:
+                    written = os.write(child_in, pending)
+                except BlockingIOError:
+                    continue
+                except (BrokenPipeError, OSError) as e:
+                    sys.stderr.write(f"[Wrapper] stdin closed: {e}\n")
+                    pending = memoryview(b'')
+                    stdin_open = False
+                    close_child_stdin()
+                    try:
+                        selector.unregister(stdin_fd)
+                    except (KeyError, ValueError):
+                        pass
+                    continue
+                pending = pending[written:]
+                if not pending:
+                    selector.unregister(child_in)
+                    if stdin_open:
+                        selector.register(stdin_fd, selectors.EVENT_READ, 'stdin')
+                    else:
+                        close_child_stdin()
+
+            elif source == 'stdout':
+                chunk = os.read(child_out, FAST_READ_SIZE)
+                if not chunk:
+                    selector.unregister(child_out)
+                    frames.finish()
+                    continue
+                for span in frames.feed(chunk):
+                    _write_all(stdout_fd, span)
+
+            elif source == 'stderr':
+                chunk = os.read(child_err, FAST_READ_SIZE)
+                if not chunk:
+                    selector.unregister(child_err)
+                    continue
+                _write_all(stderr_fd, stderr_prefix.feed(chunk))
+
+    selector.close()
+
+def run_threads(process, fast=False):
+    """Forward stdin, stdout and stderr for process with one thread each.
+
+    Returns the child's exit code once it has exited and its stdout is drained.
+    """
+    # Create thread to handle stdin forwarding
+    stdin_thread = threading.Thread(
+        target=forward_stdin,
+        args=(process,),
+        daemon=True
+    )
+    stdin_thread.start()
+
+    # Create thread to handle stdout filtering
+    stdout_thread = threading.Thread(
+        target=forward_output_fast if fast else filter_output,
+        args=(process.stdout, sys.stdout),
+        daemon=True
+    )
+    stdout_thread.start()
+
+    # Forward stderr to our stderr
+    def forward_stderr():
+        for line in iter(process.stderr.readline, b''):
+            if line:
+                sys.stderr.buffer.write(b'[Blender] ' + line)
+                sys.stderr.buffer.flush()
+
+    stderr_thread = threading.Thread(
+        target=forward_stderr,
+        daemon=True
+    )
+    stderr_thread.start()
+
+    # Wait for process to complete, then let the forwarder drain what is left
+    returncode = process.wait()
+    stdout_thread.join(timeout=5)
+    return returncode
+
+class WarmPool:
+    """Keeps `size` child processes started ahead of time and hands one to each client.
+
+    Blender's startup, the site path scan and the bpy/mcp imports all happen while a
+    child waits in the pool, so a new session only pays for a socket connect. A child
+    serves a single session: release() terminates it, and acquire() has already started
+    its replacement. Recycling rather than resetting keeps one client's scene, cached
+    code and sessions from ever leaking into the next.
+    """
+
+    def __init__(self, command, size):
+        self.command = command
+        self.size = max(1, size)
+        self._ready = queue.Queue()
+        self._children = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        with self._lock:
+            if self._closed:
+                return
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.PIPE,
+                bufsize=0
+            )
+            self._children.add(process)
+
+        # Idle children still write startup output; keep stderr drained so they never block on it
+        threading.Thread(target=self._forward_stderr, args=(process,), daemon=True).start()
+        sys.stderr.write(f"[Wrapper] Warm child {process.pid} started\n")
+        sys.stderr.flush()
+        self._ready.put(process)
+
+    def _respawn(self):
+        try:
+            self._spawn()
+        except OSError as e:
+            sys.stderr.write(f"[Wrapper] Could not start a warm child: {e}\n")
+            sys.stderr.flush()
+
+    def _forward_stderr(self, process):
+        prefixer = LinePrefixer(f"[Blender {process.pid}] ".encode())
+        stderr_fd = sys.stderr.fileno()
+        while True:
+            try:
+                chunk = os.read(process.stderr.fileno(), FAST_READ_SIZE)
+            except OSError:
+                break
+            if not chunk:
+                break
+            _write_all(stderr_fd, prefixer.feed(chunk))
+
+    def acquire(self, timeout=None):
+        """Take a live warm child and start its replacement."""
+        while True:
+            process = self._ready.get(timeout=timeout)
+            # Start the replacement right away, so the pool is back at size before the next client
+            threading.Thread(target=self._respawn, daemon=True).start()
+            if process.poll() is None:
+                return process
+            sys.stderr.write(f"[Wrapper] Warm child {process.pid} exited with code {process.returncode}, skipping\n")
+            sys.stderr.flush()
+            self._discard(process)
+
+    def release(self, process, grace=5.0):
+        """Retire a child after its session: close its stdin, then terminate it if it lingers."""
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                process.wait(timeout=grace)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self._discard(process)
+
+    def _discard(self, process):
+        with self._lock:
+            self._children.discard(process)
+
+    def close(self):
+        """Stop spawning and terminate every child, idle or in use."""
+        with self._lock:
+            self._closed = True
+            children = list(self._children)
+            self._children.clear()
+        for process in children:
+            if process.poll() is None:
+                process.terminate()
+        for process in children:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def parse_address(text):
+    """Return ("unix", path) or ("tcp", (host, port)) for 'unix:/path', 'tcp:host:port' or 'host:port'."""
+    if text.startswith("unix:"):
+        return "unix", text[len("unix:"):]
+    if text.startswith("tcp:"):
+        text = text[len("tcp:"):]
+    host, _, port = text.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+def _socket_family(kind):
+    if kind == "tcp":
+        return socket.AF_INET
+    family = getattr(socket, "AF_UNIX", None)
+    if family is None:
+        raise OSError("unix sockets are not supported on this platform, use a host:port address")
+    return family
+
+def token_file(port):
+    """Where a TCP listener on port keeps the token it generated."""
+    return os.path.join(RUNTIME_DIR, f"{port}.token")
+
+def listener_token(port):
+    """The token clients of a TCP listener on port must send: BLENDER_MCP_TOKEN, or a new random
+    one written to token_file(port), readable only by this user."""
+    token = os.environ.get("BLENDER_MCP_TOKEN")
+    if token:
+        return token
+    token = secrets.token_urlsafe(32)
+    os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+    path = token_file(port)
+    if os.path.exists(path):
+        os.unlink(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+def client_token(port):
+    """The token to present to a TCP listener on port: BLENDER_MCP_TOKEN or its token file."""
+    token = os.environ.get("BLENDER_MCP_TOKEN")
+    if token:
+        return token
+    try:
+        with open(token_file(port)) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+def listen(address):
+    """Bind and listen on address. Returns (socket, token), token being None for unix sockets."""
+    kind, addr = parse_address(address)
+    server = socket.socket(_socket_family(kind), socket.SOCK_STREAM)
+    if kind == "unix":
+        directory = os.path.dirname(addr)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(addr):
+            os.unlink(addr)
+        # Create the socket file owner-only from the start, not chmod it after bind
+        umask = os.umask(0o177)
+        try:
+            server.bind(addr)
+        finally:
+            os.umask(umask)
+        token = None
+    else:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(addr)
+        token = listener_token(addr[1])
+    server.listen()
+    return server, token
+
+def connect(address, timeout=2.0):
+    """Connect to a pool or shared server, presenting the token on TCP."""
+    kind, addr = parse_address(address)
+    client = socket.socket(_socket_family(kind), socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(addr)
+        if kind == "tcp":
+            client.sendall(AUTH_PREFIX + client_token(addr[1]).encode() + b"\n")
+    except OSError:
+        client.close()
+        raise
+    client.settimeout(None)
+    return client
+
+def authenticate(conn, token):
+    """Read a TCP client's token line. Returns the bytes received after it, or None to reject."""
+    conn.settimeout(AUTH_TIMEOUT)
+    data = b""
+    try:
+        while b"\n" not in data and len(data) <= AUTH_LINE_LIMIT:
+            chunk = conn.recv(AUTH_LINE_LIMIT)
+            if not chunk:
+                return None
+            data += chunk
+    except OSError:
+        return None
+    conn.settimeout(None)
+    line, _, rest = data.partition(b"\n")
+    expected = AUTH_PREFIX + token.encode()
+    if not hmac.compare_digest(line.rstrip(b"\r"), expected):
+        return None
+    return rest
+
+def serve_session(pool, conn, token=None):
+    """Connect one client socket to a warm child until either side closes."""
+    pending = b""
+    if token is not None:
+        pending = authenticate(conn, token)
+        if pending is None:
+            sys.stderr.write("[Wrapper] Rejected a client without a valid token\n")
+            sys.stderr.flush()
+            conn.close()
+            return
+    try:
+        process = pool.acquire(timeout=SESSION_WAIT)
+    except queue.Empty:
+        sys.stderr.write(f"[Wrapper] No warm child became ready within {SESSION_WAIT}s, dropping client\n")
+        sys.stderr.flush()
+        conn.close()
+        return
+    sys.stderr.write(f"[Wrapper] Client connected, using warm child {process.pid}\n")
+    sys.stderr.flush()
+
+    def forward_requests():
+        child_fd = process.stdin.fileno()
+        try:
+            if pending:
+                _write_all(child_fd, pending)
+            while True:
+                data = conn.recv(FAST_READ_SIZE)
+                if not data:
+                    break
+                _write_all(child_fd, data)
+        except OSError:
+            pass
+        finally:
+            # EOF on stdin is how the MCP server learns its session is over
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    requests = threading.Thread(target=forward_requests, daemon=True)
+    requests.start()
+
+    frames = FrameFilter()
+    try:
+        while True:
+            chunk = os.read(process.stdout.fileno(), FAST_READ_SIZE)
+            if not chunk:
+                break
+            for span in frames.feed(chunk):
+                conn.sendall(span)
+    except OSError:
+        pass
+    finally:
+        frames.finish()
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        conn.close()
+        pool.release(process)
+        sys.stderr.write(f"[Wrapper] Session on child {process.pid} ended, exit code {process.returncode}\n")
+        sys.stderr.flush()
+
+def serve_pool(command, size, address):
+    """Run the warm pool: accept clients on address and give each its own warm child."""
+    pool = WarmPool(command, size)
+    kind, addr = parse_address(address)
+    server, token = listen(address)
+    # Terminating the pool must not orphan its children
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    pool.start()
+    sys.stderr.write(f"[Wrapper] Warm pool of {pool.size} listening on {address}\n")
+    if token is not None and not os.environ.get("BLENDER_MCP_TOKEN"):
+        sys.stderr.write(f"[Wrapper] Clients authenticate with the token in {token_file(addr[1])}\n")
+    sys.stderr.flush()
+    try:
+        while True:
+            conn, _ = server.accept()
+            threading.Thread(target=serve_session, args=(pool, conn, token), daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        pool.close()
+        if kind == "unix" and os.path.exists(addr):
+            os.unlink(addr)
+
+def run_bridge(conn):
+    """Relay our stdin/stdout to a pooled session on conn until the pool closes it."""
+    def forward_requests():
+        stdin_fd = sys.stdin.fileno()
+        try:
+            while True:
+                data = os.read(stdin_fd, FAST_READ_SIZE)
+                if not data:
+                    break
+                conn.sendall(data)
+            conn.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    threading.Thread(target=forward_requests, daemon=True).start()
+
+    stdout_fd = sys.stdout.fileno()
+    while True:
+        try:
+            data = conn.recv(FAST_READ_SIZE)
+        except OSError:
+            break
+        if not data:
+            break
+        _write_all(stdout_fd, data)
+    conn.close()
+
+def default_blender_exe():
+    """Blender executable path - adjust if needed, or pass --blender."""
+    if sys.platform == "win32":
+        return r"C:\Program Files\Blender Foundation\Blender 5.0\blender.exe"
+    return "blender"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Launch Blender with the MCP server and filter its stdout.")
+    parser.add_argument(
+        '--blender',
+        default=os.environ.get('BLENDER_MCP_BLENDER_EXE', default_blender_exe()),
+        help="Path to the Blender executable"
+    )
+    parser.add_argument(
+        '--child-cmd',
+        default=os.environ.get('BLENDER_MCP_CHILD_CMD'),
+        help="Run this command instead of Blender (e.g. a stand-in server for benchmarks)"
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        default=os.environ.get('BLENDER_MCP_WRAPPER_FAST') == '1',
+        help="Forward stdout on raw bytes with rate-limited diagnostics (see forward_output_fast)"
+    )
+    parser.add_argument(
+        '--event-loop',
+        action='store_true',
+        default=os.environ.get('BLENDER_MCP_WRAPPER_EVENT_LOOP') == '1',
+        help="Forward all streams from one selectors loop instead of three threads (not on Windows)"
+    )
+    parser.add_argument(
+        '--pool',
+        type=int,
+        metavar='N',
+        default=int(os.environ.get('BLENDER_MCP_POOL_SIZE', '0')),
+        help="Keep N server processes warm and serve clients on --pool-address (see WarmPool)"
+    )
+    parser.add_argument(
+        '--connect',
+        action='store_true',
+        default=os.environ.get('BLENDER_MCP_POOL_CONNECT') == '1',
+        help="Attach to a warm pool on --pool-address; launches a process directly if none is running"
+    )
+    parser.add_argument(
+        '--pool-address',
+        default=os.environ.get('BLENDER_MCP_POOL_ADDRESS', DEFAULT_POOL_ADDRESS),
+        help="host:port, tcp:host:port or unix:/path of the warm pool (TCP clients need its token, "
+             "see BLENDER_MCP_TOKEN)"
+    )
+    return parser.parse_args(argv)
+
+def build_command(args):
+    """Return the child command line: the stand-in command, or Blender with the MCP server."""
+    if args.child_cmd:
+        return shlex.split(args.child_cmd, posix=(sys.platform != "win32"))
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
     mcp_server_script = os.path.join(script_dir, 'blender_mcp_server.py')
+    return [args.blender, '--background', '--python', mcp_server_script]
 
-    # Blender executable path - adjust if needed
-    if sys.platform == "win32":
-        blender_exe = r"C:\Program Files\Blender Foundation\Blender 5.0\blender.exe"
-    else:
-        blender_exe = "blender"
+def main(argv=None):
+    """Launch Blender with the MCP server."""
+    args = parse_args(argv)
+    command = build_command(args)
+    blender_exe = command[0]
+
+    if args.connect:
+        try:
+            conn = connect(args.pool_address)
+        except OSError as e:
+            sys.stderr.write(f"[Wrapper] No warm pool at {args.pool_address} ({e}), starting a process directly\n")
+            sys.stderr.flush()
+        else:
+            run_bridge(conn)
+            sys.exit(0)
 
     # Check if Blender exists
-    if not os.path.exists(blender_exe) and sys.platform == "win32":
+    if not args.child_cmd and not os.path.exists(blender_exe) and sys.platform == "win32":
         sys.stderr.write(f"Error: Blender not found at {blender_exe}\n")
-        sys.stderr.write("Please update the blender_exe path in this wrapper script.\n")
+        sys.stderr.write("Please update the blender_exe path in this wrapper script or pass --blender.\n")
         sys.stderr.flush()
         sys.exit(1)
 
-    sys.stderr.write(f"[Wrapper] Starting Blender from {blender_exe}\n")
-    sys.stderr.write(f"[Wrapper] MCP server script: {mcp_server_script}\n")
+    if args.pool > 0:
+        sys.stderr.write(f"[Wrapper] Starting warm pool: {' '.join(command)}\n")
+        sys.stderr.flush()
+        serve_pool(command, args.pool, args.pool_address)
+        sys.exit(0)
+
+    sys.stderr.write(f"[Wrapper] Starting: {' '.join(command)}\n")
     sys.stderr.flush()
 
     # Launch Blender
     try:
         process = subprocess.Popen(
-            [blender_exe, '--background', '--python', mcp_server_script],
+            command,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             stdin=subprocess.PIPE,
@@ -121,37 +859,14 @@ def main():
         sys.stderr.write("[Wrapper] Blender process started\n")
         sys.stderr.flush()
 
-        # Create thread to handle stdin forwarding
-        stdin_thread = threading.Thread(
-            target=forward_stdin,
-            args=(process,),
-            daemon=True
-        )
-        stdin_thread.start()
-
-        # Create thread to handle stdout filtering
-        stdout_thread = threading.Thread(
-            target=filter_output,
-            args=(process.stdout, sys.stdout),
-            daemon=True
-        )
-        stdout_thread.start()
-
-        # Forward stderr to our stderr
-        def forward_stderr():
-            for line in iter(process.stderr.readline, b''):
-                if line:
-                    sys.stderr.buffer.write(b'[Blender] ' + line)
-                    sys.stderr.buffer.flush()
-
-        stderr_thread = threading.Thread(
-            target=forward_stderr,
-            daemon=True
-        )
-        stderr_thread.start()
-
-        # Wait for process to complete
-        returncode = process.wait()
+        if args.event_loop and sys.platform != "win32":
+            run_event_loop(process)
+            returncode = process.wait()
+        else:
+            if args.event_loop:
+                sys.stderr.write("[Wrapper] --event-loop is not supported on Windows, using threads\n")
+                sys.stderr.flush()
+            returncode = run_threads(process, args.fast)
 
         sys.stderr.write(f"[Wrapper] Blender exited with code {returncode}\n")
         sys.stderr.flush()
@@ -45,7 +45,7 @@ echo.
 
 REM MCP 패키지 설치
 echo [3/3] MCP 패키지 설치 중...
-"%BLENDER_PYTHON%" -m pip install mcp
+"%BLENDER_PYTHON%" -m pip install --upgrade "mcp>=1.9.0"
 if errorlevel 1 (
     echo.
     echo ERROR: MCP 패키지 설치에 실패했습니다.
@@ -51,6 +51,16 @@ try:
 except ImportError as e:
     print(f"✗ MCP 서버 모듈 로드 실패: {e}")
     sys.exit(1)
+try:
+    import inspect
+    from mcp.server.session import ServerSession
+    from mcp.shared.message import SessionMessage
+    if "message" not in inspect.signature(ServerSession.send_progress_notification).parameters:
+        raise ImportError("send_progress_notification has no message parameter")
+except ImportError as e:
+    print(f"✗ MCP 패키지가 너무 오래되었습니다 (1.9.0 이상 필요): {e}")
+    print("  install_mcp.bat을 다시 실행하여 MCP 패키지를 업그레이드하세요.")
+    sys.exit(1)
 print()
 
 # 최종 결과
@@ -0,0 +1,99 @@
+"""
+Shared fixtures. Everything runs against the bpy stand-in in benchmarks/standin, so no
+Blender is needed:
+
+    python -m pytest tests
+
+`server` starts blender_mcp_server.py over stdio, as an MCP client would, and `mcp_server`
+imports it in-process for tests of its classes.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+BENCH_DIR = os.path.join(REPO_DIR, "benchmarks")
+sys.path[:0] = [os.path.join(BENCH_DIR, "standin"), BENCH_DIR, REPO_DIR]
+
+from bench_server import SERVER, STANDIN_DIR, Client  # noqa: E402
+
+# sys.stdout as replaced by the in-process server import, kept open for the session
+_server_stdout = []
+
+
+class ServerSession:
+    """An initialized stdio session with blender_mcp_server.py."""
+
+    def __init__(self, env: dict, args=()):
+        self.client = Client([sys.executable, SERVER, *args], env)
+        self.client.call("initialize", {"protocolVersion": "2024-11-05", "capabilities": {},
+                                        "clientInfo": {"name": "tests", "version": "1"}})
+        self.client.send("notifications/initialized", notify=True)
+
+    def send(self, name: str, arguments: dict | None = None):
+        """Start a tools/call without waiting; returns the bench client's waiter."""
+        return self.client.send("tools/call", {"name": name, "arguments": arguments or {}})
+
+    @staticmethod
+    def texts(waiter, timeout: float = 30) -> list[str]:
+        assert waiter[0].wait(timeout), "no reply"
+        reply = waiter[1]
+        assert reply is not None, "server closed"
+        assert "error" not in reply, reply["error"]
+        return [item.get("text", "") for item in reply["result"]["content"]]
+
+    def call(self, name: str, arguments: dict | None = None) -> list[str]:
+        """Text items of a tool call's result."""
+        return self.texts(self.send(name, arguments))
+
+    def json(self, name: str, arguments: dict | None = None):
+        """A tool call's result parsed as JSON; fails on an "Error: ..." reply."""
+        text = self.call(name, arguments)[0]
+        assert not text.startswith("Error"), text
+        return json.loads(text)
+
+    def close(self):
+        self.client.close()
+
+
+@pytest.fixture
+def start_server(tmp_path):
+    """Factory: start_server(args=(), **env) -> ServerSession, closed after the test."""
+    sessions = []
+
+    def start(args=(), **env) -> ServerSession:
+        environ = dict(os.environ, BLENDER_MCP_STANDIN_RENDER_SECONDS="0.01",
+                       BLENDER_MCP_RENDER_CACHE_DIR=str(tmp_path / "render_cache"))
+        environ.update(env)
+        environ["PYTHONPATH"] = os.pathsep.join(filter(None, [STANDIN_DIR, os.environ.get("PYTHONPATH")]))
+        session = ServerSession(environ, args)
+        sessions.append(session)
+        return session
+
+    yield start
+    for session in sessions:
+        session.close()
+
+
+@pytest.fixture
+def server(start_server) -> ServerSession:
+    return start_server()
+
+
+@pytest.fixture(scope="session")
+def mcp_server():
+    """blender_mcp_server imported in-process, with the stand-in as bpy."""
+    # On import the server points fd 1 back at the real stdout and replaces sys.stdout
+    # with a new file object for it. Let it do that to the real stream rather than
+    # pytest's capture, and keep that file object alive so fd 1 is not closed with it.
+    captured, sys.stdout = sys.stdout, sys.__stdout__
+    try:
+        import blender_mcp_server
+    finally:
+        _server_stdout.append(sys.stdout)
+        sys.stdout = captured
+    return blender_mcp_server
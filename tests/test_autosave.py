@@ -0,0 +1,50 @@
+"""save_blend_file through the autosave queue: waiting, skipping and coalescing."""
+
+import time
+
+
+def test_save_waits_by_default(server, tmp_path):
+    path = tmp_path / "scene.blend"
+    server.call("create_cube", {"name": "Box"})
+    text = server.call("save_blend_file", {"filepath": str(path)})[0]
+    assert text.startswith(f"Saved Blender file to {path}"), text
+    assert path.exists()
+
+    text = server.call("save_blend_file", {"filepath": str(path)})[0]
+    assert text == f"Skipped saving {path}: no changes since the last save"
+
+
+def test_lone_save_starts_at_once(server, tmp_path):
+    server.call("configure_autosave", {"window": 5})
+    server.call("create_cube", {})
+    started = time.monotonic()
+    assert server.call("save_blend_file", {"filepath": str(tmp_path / "scene.blend")})[0].startswith("Saved")
+    assert time.monotonic() - started < 2
+
+
+def test_saves_in_a_burst_are_coalesced(server, tmp_path):
+    path = str(tmp_path / "scene.blend")
+    server.call("configure_autosave", {"window": 60})
+    server.call("create_cube", {})
+    assert server.call("save_blend_file", {"filepath": path})[0].startswith("Saved")
+    # Within the window of that save: queued together for one save at the end of it
+    server.call("create_cube", {})
+    for _ in range(3):
+        assert server.call("save_blend_file", {"filepath": path, "wait": False})[0].startswith("Queued save")
+    stats = server.json("get_autosave_stats")
+    assert (stats["pending"], stats["saves"]) == (1, 1)
+    server.call("configure_autosave", {"flush": True})
+    stats = server.json("get_autosave_stats")
+    assert (stats["requests"], stats["coalesced"], stats["saves"]) == (4, 2, 2)
+    assert stats["last_save"]["filepath"] == path
+
+
+def test_queued_save_reports_the_last_failure(server, tmp_path):
+    missing = str(tmp_path / "missing" / "scene.blend")
+    assert server.call("save_blend_file", {"filepath": missing})[0].startswith(f"Error: Saving {missing} failed")
+    assert server.json("get_autosave_stats")["last_error"]["filepath"] == missing
+
+    text = server.call("save_blend_file", {"filepath": str(tmp_path / "scene.blend"), "wait": False})[0]
+    assert f"The last save, to {missing}, failed" in text
+    server.call("configure_autosave", {"flush": True})
+    assert server.json("get_autosave_stats")["last_error"] is None
@@ -0,0 +1,69 @@
+"""batch: one pass over several tool calls, with optional rollback."""
+
+
+def _scene(server):
+    listing = server.json("list_objects", {"fields": ["location"]})
+    return {obj["name"]: obj["location"] for obj in listing["objects"]}
+
+
+def _materials(server, name):
+    """Material names in the object's slots (object-linked, as batch cubes share their mesh)."""
+    return server.json("execute_python", {"code": (
+        "import json\n"
+        f"slots = bpy.data.objects[{name!r}].material_slots\n"
+        "result = json.dumps([slot.material.name if slot.material else None for slot in slots])")})
+
+
+def _setup(server):
+    server.call("create_objects_batch", {"objects": [
+        {"type": "cube", "name": "Keep", "location": [1, 0, 0]},
+        {"type": "cube", "name": "Doomed", "location": [2, 0, 0]}]})
+    server.call("set_material", {"object_name": "Keep", "material_name": "Red", "color": [1, 0, 0, 1]})
+    return _scene(server)
+
+
+def test_rollback_restores_scene(server):
+    before = _setup(server)
+    summary = server.json("batch", {"rollback_on_error": True, "steps": [
+        {"tool": "create_cube", "arguments": {"name": "Added", "location": [5, 5, 5]}},
+        {"tool": "move_object", "arguments": {"name": "Keep", "location": [9, 9, 9]}},
+        {"tool": "set_material", "arguments": {"object_name": "Keep", "material_name": "Blue",
+                                               "color": [0, 0, 1, 1]}},
+        {"tool": "delete_object", "arguments": {"name": "Doomed"}},
+        {"tool": "move_object", "arguments": {"name": "Missing", "location": [0, 0, 0]}},
+        {"tool": "create_cube", "arguments": {"name": "Never"}},
+    ]})
+    assert summary["rolled_back"] is True
+    assert (summary["succeeded"], summary["failed"], summary["skipped"]) == (4, 1, 1)
+    assert _scene(server) == before
+    assert _materials(server, "Keep") == ["Red"]
+    assert server.json("execute_python", {
+        "code": "import json; result = json.dumps(sorted(bpy.data.materials.keys()))"}) == ["Red"]
+
+
+def test_failed_step_without_rollback_keeps_the_rest(server):
+    _setup(server)
+    summary = server.json("batch", {"steps": [
+        {"tool": "move_object", "arguments": {"name": "Missing", "location": [0, 0, 0]}},
+        {"tool": "move_object", "arguments": {"name": "Keep", "location": [3, 3, 3]}},
+        {"tool": "delete_object", "arguments": {"name": "Doomed"}},
+    ]})
+    assert summary["rolled_back"] is False
+    assert (summary["succeeded"], summary["failed"]) == (2, 1)
+    assert _scene(server) == {"Keep": [3.0, 3.0, 3.0]}
+
+
+def test_deleted_name_reused_in_batch_is_rolled_back(server):
+    _setup(server)
+    summary = server.json("batch", {"rollback_on_error": True, "steps": [
+        {"tool": "delete_object", "arguments": {"name": "Doomed"}},
+        {"tool": "create_cube", "arguments": {"name": "Doomed", "location": [7, 7, 7]}},
+        {"tool": "set_material", "arguments": {"object_name": "Missing", "material_name": "Red"}},
+    ]})
+    assert summary["rolled_back"] is True
+    assert _scene(server)["Doomed"] == [2.0, 0.0, 0.0]
+
+
+def test_disallowed_tool(server):
+    text = server.call("batch", {"steps": [{"tool": "execute_python", "arguments": {"code": ""}}]})[0]
+    assert text.startswith("Error: Not allowed in a batch: execute_python")
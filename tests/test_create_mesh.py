@@ -0,0 +1,91 @@
+"""create_mesh: decoding and checking binary buffers before any mesh is built."""
+
+import array
+import base64
+
+import pytest
+
+
+def _buffer(values, typecode="f", **spec) -> dict:
+    return {"base64": base64.b64encode(array.array(typecode, values).tobytes()).decode(), **spec}
+
+
+# A unit square in z=0, as one quad or as two triangles
+SQUARE = [0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0]
+QUAD = [0, 1, 2, 3]
+TRIANGLES = [0, 1, 2, 0, 2, 3]
+
+
+def _mesh_counts(server) -> str:
+    return server.call("execute_python", {"code": "result = (len(bpy.data.meshes), len(bpy.data.objects))"})[0]
+
+
+def _polygons(server, name) -> list:
+    return server.json("execute_python", {"code": (
+        f"mesh = bpy.data.objects[{name!r}].data\n"
+        "import json\n"
+        "result = json.dumps([[mesh.loops[i].vertex_index for i in range(p.loop_start, p.loop_start + p.loop_total)]"
+        " for p in mesh.polygons])")})
+
+
+def test_quad_mesh(server):
+    reply = server.json("create_mesh", {"name": "Quad", "vertices": _buffer(SQUARE), "faces": _buffer(QUAD, "i"),
+                                        "face_size": 4, "uvs": _buffer([0, 0, 1, 0, 1, 1, 0, 1])})
+    assert (reply["vertices"], reply["faces"], reply["loops"], reply["uvs"]) == (4, 1, 4, "corner")
+    assert _polygons(server, "Quad") == [QUAD]
+    assert server.call("execute_python", {"code": "result = bpy.data.objects['Quad'].type"}) == ["MESH"]
+
+
+def test_triangle_mesh_from_files(server, tmp_path):
+    """Vertices from a raw float64 file past a header, faces as uint16."""
+    raw = tmp_path / "vertices.bin"
+    raw.write_bytes(b"HEADER" + array.array("d", SQUARE).tobytes())
+    reply = server.json("create_mesh", {"name": "Tris",
+                                        "vertices": {"path": str(raw), "dtype": "float64", "offset": 6},
+                                        "faces": _buffer(TRIANGLES, "H", dtype="uint16")})
+    assert (reply["vertices"], reply["faces"], reply["loops"]) == (4, 2, 6)
+    assert _polygons(server, "Tris") == [[0, 1, 2], [0, 2, 3]]
+
+
+def test_mixed_face_sizes(server):
+    vertices = SQUARE + [2, 0, 0, 2, 1, 0]
+    reply = server.json("create_mesh", {"name": "Mixed", "vertices": _buffer(vertices),
+                                        "faces": _buffer(QUAD + [1, 4, 5, 2], "i"),
+                                        "face_sizes": _buffer([4, 4], "i")})
+    assert (reply["faces"], reply["loops"]) == (2, 8)
+
+
+@pytest.mark.parametrize("arguments, error", [
+    ({"vertices": {"base64": _buffer(SQUARE)["base64"][:-4]}}, "not a whole number of float32 values"),
+    ({"vertices": _buffer(SQUARE[:-1])}, "not a multiple of 3"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer([0, 1, 4], "i")}, "outside 0..3"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer([0, -1, 2], "i")}, "outside 0..3"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer(TRIANGLES[:-1], "i")}, "not a multiple of face_size 3"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer(TRIANGLES, "i"), "face_sizes": _buffer([3, 4], "i")},
+     "face_sizes add up to 7"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer(QUAD, "i"), "face_sizes": _buffer([2, 2], "i")},
+     "at least 3 vertices"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer([], "i")}, "faces is empty"),
+    ({"vertices": _buffer(SQUARE, dtype="float16")}, "float16"),
+    ({"vertices": {"base64": "not base64!"}}, ""),
+    ({"vertices": {"dtype": "float32"}}, "'base64' or 'path'"),
+    # Checked once the mesh exists, which then has to be removed again
+    ({"vertices": _buffer(SQUARE), "faces": _buffer(QUAD, "i"), "face_size": 4, "uvs": _buffer([0, 0, 1])},
+     "uvs needs 8 (per vertex) or 8 (per corner) values"),
+    ({"vertices": _buffer(SQUARE), "faces": _buffer(TRIANGLES, "i"), "normals": _buffer([0, 0, 1] * 5)},
+     "normals needs 4 (per vertex) or 6 (per corner) vectors"),
+])
+def test_bad_buffers_build_nothing(server, arguments, error):
+    before = _mesh_counts(server)
+    text = server.call("create_mesh", {"name": "Bad", **arguments})[0]
+    assert text.startswith("Error: ") and error in text, text
+    assert _mesh_counts(server) == before
+
+
+def test_truncated_file(server, tmp_path):
+    path = tmp_path / "vertices.bin"
+    path.write_bytes(array.array("f", SQUARE).tobytes()[:-2])
+    text = server.call("create_mesh", {"vertices": {"path": str(path)}})[0]
+    assert text == "Error: buffer has 46 bytes, not a whole number of float32 values"
+    text = server.call("create_mesh", {"vertices": {"path": str(path), "offset": 64}})[0]
+    assert text == "Error: offset 64 is outside the buffer's 46 bytes"
@@ -0,0 +1,37 @@
+"""`wrapper --event-loop` end to end, with benchmarks/stub_mcp_child.py standing in for Blender."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from bench_wrapper import STUB_CHILD, WRAPPER, command_line
+import blender_mcp_wrapper as wrapper
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="--event-loop needs selectable pipes")
+
+
+def _run(child, stdin=b""):
+    result = subprocess.run([sys.executable, WRAPPER, "--event-loop", "--child-cmd", command_line(child)],
+                            input=stdin, capture_output=True, timeout=60)
+    assert result.returncode == 0, result.stderr.decode()
+    return result.stdout, result.stderr
+
+
+def test_requests_and_replies():
+    """Requests, one larger than a read, reach the child; only its JSON replies come back."""
+    sizes = [10, 3 * wrapper.FAST_READ_SIZE, 10, 1000]
+    requests = [b'{"jsonrpc":"2.0","id":%d,"params":"%s"}\n' % (i, b"x" * size) for i, size in enumerate(sizes)]
+    stdout, stderr = _run([sys.executable, STUB_CHILD, "--echo"], b"".join(requests))
+    replies = [json.loads(line) for line in stdout.splitlines()]
+    assert replies == [{"jsonrpc": "2.0", "id": i, "result": {"bytes": len(request)}}
+                       for i, request in enumerate(requests)]
+    assert b"[Wrapper] Filtered: Blender 5.0.1" in stderr
+
+
+def test_frames_among_startup_noise():
+    stdout, _ = _run([sys.executable, STUB_CHILD, "--frames", "300", "--frame-size", "100000", "--noise-every", "7"])
+    lines = stdout.splitlines()
+    assert len(lines) == 300
+    assert all(json.loads(line)["method"] == "notifications/message" for line in lines)
@@ -0,0 +1,98 @@
+"""execute_python: persistent sessions, time limits and cancel_python."""
+
+import json
+import threading
+import time
+
+SPIN = "print('spinning')\nwhile True: pass"
+
+
+def _generation(server):
+    return server.json("get_server_stats")["bpy_queue"]["generation"]
+
+
+def test_listing_sessions_is_a_read(server):
+    server.call("execute_python", {"code": "x = 1", "session": "work"})
+    generation = _generation(server)
+    listing = server.json("list_python_sessions")
+    assert [session["name"] for session in listing["sessions"]] == ["work"]
+    assert server.json("list_python_sessions") == listing
+    assert _generation(server) == generation
+
+    # A later run still shows up, as it moves the generation on
+    server.call("execute_python", {"code": "y = 2", "session": "work"})
+    assert server.json("list_python_sessions")["sessions"][0]["calls"] == 2
+
+
+def test_output_is_returned_with_the_result(server):
+    assert server.call("execute_python", {"code": "print('hello')\nresult = 6 * 7"}) == [
+        "42", "Output of python-1:\nhello\n"]
+
+
+def test_time_limit_stops_the_script(server):
+    texts = server.call("execute_python", {"code": SPIN, "time_limit": 0.2})
+    assert texts == ["Error: Script python-1 stopped: time limit of 0.2 s reached",
+                     "Output of python-1:\nspinning\n"]
+    # The bpy thread is free again
+    assert server.call("execute_python", {"code": "result = 1"}) == ["1"]
+
+
+def _cancel(server, script_id=None, timeout=10.0) -> list[str]:
+    """cancel_python, retried until the call is known to the server (and, without an id, running)."""
+    arguments = {"script_id": script_id} if script_id else {}
+    deadline = time.monotonic() + timeout
+    while True:
+        text = server.call("cancel_python", arguments)[0]
+        if not text.startswith("Error") and json.loads(text)["cancelled"]:
+            return json.loads(text)["cancelled"]
+        assert time.monotonic() < deadline, text
+        time.sleep(0.02)
+
+
+def test_cancel_running_script(server):
+    running = server.send("execute_python", {"code": SPIN, "time_limit": 0})
+    assert _cancel(server) == ["python-1"]
+    assert server.texts(running) == ["Error: Script python-1 stopped: cancelled by cancel_python",
+                                     "Output of python-1:\nspinning\n"]
+    assert server.call("cancel_python", {"script_id": "python-1"})[0].startswith("Error: No running")
+
+
+def test_cancel_queued_script(server, tmp_path):
+    started = tmp_path / "started"
+    running = server.send("execute_python", {"code": f"open({str(started)!r}, 'w').close()\n{SPIN}",
+                                             "time_limit": 0})
+    deadline = time.monotonic() + 10
+    while not started.exists():
+        assert time.monotonic() < deadline, "the first script never started"
+        time.sleep(0.02)
+
+    # The bpy thread is busy with python-1, so python-2 waits in the queue
+    queued = server.send("execute_python", {"code": "print('ran')"})
+    assert _cancel(server, "python-2") == ["python-2"]
+    assert _cancel(server) == ["python-1"]
+    assert server.texts(queued) == ["Error: Script python-2 stopped: cancelled by cancel_python"]
+    assert server.texts(running)[0] == "Error: Script python-1 stopped: cancelled by cancel_python"
+
+
+def test_script_that_finishes_is_not_reported_as_stopped(server):
+    running = server.send("execute_python", {"code": (
+        "try:\n"
+        "    " + SPIN.replace("\n", "\n    ") + "\n"
+        "except BaseException:\n"
+        "    result = 'carried on'"), "time_limit": 0})
+    _cancel(server)
+    assert server.texts(running)[0] == "carried on"
+
+
+def test_interrupt_that_is_not_delivered(mcp_server):
+    """An interrupt aimed at a thread that is gone sets no stop_reason."""
+    finished = threading.Thread(target=lambda: None)
+    finished.start()
+    finished.join()
+    run = mcp_server.ScriptRun(0)
+    run.state, run._thread_id = "running", finished.ident
+    assert run.interrupt("cancelled") is False
+    run._finish(False)
+    assert run.stop_reason is None
+    # A finished run cannot be interrupted at all
+    assert run.interrupt("cancelled") is False
@@ -0,0 +1,90 @@
+"""The wrapper's FrameFilter and LinePrefixer, fed the same output split at every byte offset."""
+
+import pytest
+
+import blender_mcp_wrapper as wrapper
+
+FRAME = b'{"jsonrpc":"2.0","id":1,"result":{}}\n'
+NOTIFICATION = b'{"jsonrpc":"2.0","method":"notifications/message","params":{"data":"a\\nb"}}\n'
+LONG_NOISE = b"Info: " + b"x" * 300 + b"\n"
+
+# Child stdout, and what the filter should forward and report from it
+OUTPUT = (b"Blender 5.0.1 (hash 1234567890ab)\n"
+          + FRAME
+          + b"\n  \t\r\n\r\n"
+          + b" \t" + NOTIFICATION
+          + b"Read blend: \"/tmp/scene.blend\"\n"
+          + FRAME + FRAME
+          + b"  Warning: not JSON {\n"
+          + LONG_NOISE
+          + b"\t" + FRAME
+          + b"Saved session")
+FORWARDED = FRAME + NOTIFICATION + FRAME + FRAME + FRAME
+FILTERED = [b"Blender 5.0.1 (hash 1234567890ab)", b"Read blend: \"/tmp/scene.blend\"",
+            b"Warning: not JSON {", LONG_NOISE[:200], b"Saved session"]
+
+
+class RecordingLog:
+    """Stands in for RateLimitedLog, keeping every reported line."""
+
+    max_chars = 200
+
+    def __init__(self):
+        self.lines = []
+
+    def log(self, prefix, data):
+        assert prefix == "Filtered"
+        self.lines.append(bytes(data).rstrip(b"\r\n"))
+
+    def flush(self):
+        pass
+
+
+def _filter(chunks):
+    log = RecordingLog()
+    frames = wrapper.FrameFilter(log)
+    forwarded = b"".join(bytes(span) for chunk in chunks for span in frames.feed(chunk))
+    frames.finish()
+    return forwarded, log.lines
+
+
+def test_whole_output():
+    assert _filter([OUTPUT]) == (FORWARDED, FILTERED)
+
+
+def test_split_at_every_offset():
+    for offset in range(len(OUTPUT) + 1):
+        assert _filter([OUTPUT[:offset], OUTPUT[offset:]]) == (FORWARDED, FILTERED), offset
+
+
+def test_one_byte_at_a_time():
+    assert _filter([OUTPUT[i:i + 1] for i in range(len(OUTPUT))]) == (FORWARDED, FILTERED)
+
+
+def test_contiguous_frames_are_one_slice():
+    frames = wrapper.FrameFilter(RecordingLog())
+    spans = frames.feed(b"Blender\n" + FRAME + NOTIFICATION + b"Info: x\n" + FRAME)
+    assert [bytes(span) for span in spans] == [FRAME + NOTIFICATION, FRAME]
+    assert all(isinstance(span, memoryview) for span in spans)
+
+
+def test_frame_continues_in_the_next_chunk():
+    """A frame's tail is forwarded even when it starts like other output."""
+    frames = wrapper.FrameFilter(RecordingLog())
+    assert [bytes(span) for span in frames.feed(b'{"id":1,')] == [b'{"id":1,']
+    assert [bytes(span) for span in frames.feed(b'"text":"Blender"}\n')] == [b'"text":"Blender"}\n']
+
+
+PREFIX = b"[Blender] "
+STDERR = b"Traceback:\n  File \"x.py\"\n\nError\r\nno newline"
+PREFIXED = (b"[Blender] Traceback:\n[Blender]   File \"x.py\"\n[Blender] \n[Blender] Error\r\n"
+            b"[Blender] no newline")
+
+
+@pytest.mark.parametrize("stream, expected", [(STDERR, PREFIXED), (STDERR + b"\n", PREFIXED + b"\n")])
+def test_line_prefixer_split_at_every_offset(stream, expected):
+    for offset in range(len(stream) + 1):
+        prefixer = wrapper.LinePrefixer(PREFIX)
+        assert prefixer.feed(stream[:offset]) + prefixer.feed(stream[offset:]) == expected, offset
+    prefixer = wrapper.LinePrefixer(PREFIX)
+    assert b"".join(prefixer.feed(stream[i:i + 1]) for i in range(len(stream))) == expected
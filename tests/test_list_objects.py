@@ -0,0 +1,91 @@
+"""list_objects pages, fields and the since_revision change feed."""
+
+import bpy
+
+
+def _names(objects):
+    return [obj["name"] for obj in objects]
+
+
+def _seed(server, count):
+    server.call("create_objects_batch", {"objects": [
+        {"type": "cube", "name": f"Obj.{i:02d}", "location": [i, 0, 0]} for i in range(count)]})
+
+
+def test_pages_follow_cursor(server):
+    _seed(server, 5)
+    first = server.json("list_objects", {"limit": 2})
+    assert _names(first["objects"]) == ["Obj.00", "Obj.01"]
+    assert first["total"] == 5
+    # Adding an object that sorts before the cursor does not shift later pages
+    server.call("create_objects_batch", {"objects": [{"type": "cube", "name": "Obj.00a"}]})
+    second = server.json("list_objects", {"limit": 2, "cursor": first["next_cursor"]})
+    assert _names(second["objects"]) == ["Obj.02", "Obj.03"]
+    assert second["revision"] == first["revision"]
+    last = server.json("list_objects", {"limit": 2, "cursor": second["next_cursor"]})
+    assert _names(last["objects"]) == ["Obj.04"]
+    assert last["next_cursor"] is None
+
+
+def test_fields_projection(server):
+    _seed(server, 2)
+    default = server.json("list_objects", {"pattern": "Obj.01"})["objects"]
+    assert default == [{"name": "Obj.01", "type": "MESH"}]
+    projected = server.json("list_objects", {"pattern": "Obj.01", "fields": ["location", "scale"]})["objects"]
+    assert projected == [{"name": "Obj.01", "location": [1.0, 0.0, 0.0], "scale": [1.0, 1.0, 1.0]}]
+
+
+def test_filters(server):
+    _seed(server, 3)
+    server.call("execute_python", {"code": "bpy.data.objects['Obj.02'].hide_viewport = True"})
+    assert _names(server.json("list_objects", {"visible": False})["objects"]) == ["Obj.02"]
+    assert server.json("list_objects", {"type": ["LIGHT"]})["total"] == 0
+    error = server.call("list_objects", {"collection": "Missing"})[0]
+    assert error.startswith("Error")
+
+
+def test_revision_delta_after_move_and_delete(server):
+    _seed(server, 3)
+    revision = server.json("list_objects", {"limit": 1})["revision"]
+
+    unchanged = server.json("list_objects", {"since_revision": revision})
+    assert unchanged == {"revision": revision, "full_resync": False, "added": [], "modified": [], "removed": []}
+
+    server.call("move_object", {"name": "Obj.01", "location": [5, 5, 5]})
+    server.call("delete_object", {"name": "Obj.02"})
+    server.call("create_objects_batch", {"objects": [{"type": "cube", "name": "Obj.new"}]})
+    delta = server.json("list_objects", {"since_revision": revision, "fields": ["location"]})
+    assert delta["revision"] > revision
+    assert delta["full_resync"] is False
+    assert delta["added"] == [{"name": "Obj.new", "location": [0.0, 0.0, 0.0]}]
+    assert delta["modified"] == [{"name": "Obj.01", "location": [5.0, 5.0, 5.0]}]
+    assert delta["removed"] == ["Obj.02"]
+
+    # Syncing from the new revision sees nothing further
+    again = server.json("list_objects", {"since_revision": delta["revision"]})
+    assert (again["added"], again["modified"], again["removed"]) == ([], [], [])
+
+
+def test_unknown_revision_needs_full_resync(server):
+    _seed(server, 1)
+    revision = server.json("list_objects", {"limit": 1})["revision"]
+    # A revision from another server run (ahead of this one) cannot be diffed against
+    stale = server.json("list_objects", {"since_revision": revision + 100})
+    assert stale == {"revision": revision, "full_resync": True}
+
+
+def test_dropped_tombstones_need_full_resync(mcp_server):
+    scene = bpy.data.scenes.new("Tombstones")
+    objects = [bpy.data.objects.new(f"Tomb.{i}", None) for i in range(4)]
+    for obj in objects:
+        scene.collection.objects.link(obj)
+    revisions = mcp_server.SceneRevisions(max_tombstones=2)
+    start = revisions.scan(scene)
+
+    for obj in objects[:3]:
+        scene.collection.objects.unlink(obj)
+        revisions.scan(scene)
+    # The first removal's tombstone was dropped, so start can no longer be diffed against
+    assert revisions.changes_since(start) is None
+    added, modified, removed = revisions.changes_since(start + 1)
+    assert (added, modified, removed) == ([], [], ["Tomb.1", "Tomb.2"])
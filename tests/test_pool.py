@@ -0,0 +1,147 @@
+"""The wrapper's warm pool, with benchmarks/stub_mcp_child.py standing in for Blender."""
+
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from bench_wrapper import STUB_CHILD, WRAPPER, command_line
+import blender_mcp_wrapper as wrapper
+
+ECHO_CHILD = [sys.executable, STUB_CHILD, "--echo"]
+REQUEST = b'{"jsonrpc":"2.0","id":7,"method":"ping"}\n'
+
+
+@pytest.fixture
+def pool():
+    pool = wrapper.WarmPool(ECHO_CHILD, 2)
+    pool.start()
+    yield pool
+    pool.close()
+
+
+def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_acquire_hands_out_live_children_and_refills(pool):
+    first = pool.acquire(timeout=10)
+    second = pool.acquire(timeout=10)
+    assert first is not second
+    assert first.poll() is None and second.poll() is None
+    # Each acquire started a replacement: two in use plus two warm
+    _wait_for(lambda: pool._ready.qsize() == 2)
+    assert len(pool._children) == 4
+
+
+def test_release_retires_the_child(pool):
+    process = pool.acquire(timeout=10)
+    process.stdin.write(REQUEST)
+    line = process.stdout.readline()
+    while not line.startswith(b"{"):  # the stand-in's Blender banner
+        line = process.stdout.readline()
+    assert json.loads(line)["id"] == 7
+    pool.release(process, grace=5)
+    assert process.poll() is not None
+    assert process not in pool._children
+
+
+def test_acquire_skips_dead_children(pool):
+    _wait_for(lambda: pool._ready.qsize() == 2)
+    dead = pool._ready.queue[0]
+    dead.kill()
+    dead.wait()
+    process = pool.acquire(timeout=10)
+    assert process is not dead and process.poll() is None
+    assert dead not in pool._children
+
+
+def test_close_terminates_every_child(pool):
+    in_use = pool.acquire(timeout=10)
+    _wait_for(lambda: pool._ready.qsize() == 2)
+    children = list(pool._children)
+    pool.close()
+    assert in_use.poll() is not None
+    assert all(child.poll() is not None for child in children)
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def pool_process(tmp_path):
+    """Factory: a --pool 1 wrapper on address, with HOME (and so its token files) in tmp_path."""
+    processes = []
+    env = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path))
+    env.pop("BLENDER_MCP_TOKEN", None)
+
+    def start(address):
+        process = subprocess.Popen([sys.executable, WRAPPER, "--pool", "1", "--pool-address", address,
+                                    "--child-cmd", command_line(ECHO_CHILD)],
+                                   env=env, stderr=subprocess.DEVNULL)
+        processes.append(process)
+        return env
+
+    yield start
+    for process in processes:
+        process.terminate()
+        process.wait()
+
+
+def _session(env, address):
+    """Send one request through `wrapper --connect` and return the reply line."""
+    client = subprocess.Popen([sys.executable, WRAPPER, "--connect", "--pool-address", address,
+                               "--child-cmd", "false"],
+                              env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output, _ = client.communicate(REQUEST, timeout=30)
+    return json.loads(output.splitlines()[0])
+
+
+def test_tcp_pool_requires_the_token(pool_process, tmp_path):
+    port = _free_port()
+    address = f"127.0.0.1:{port}"
+    env = pool_process(address)
+    token_file = tmp_path / ".blender_mcp" / f"{port}.token"
+    _wait_for(token_file.exists)
+    if sys.platform != "win32":
+        assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
+
+    # The token line is consumed by the pool and never reaches the child
+    reply = _session(env, address)
+    assert reply == {"jsonrpc": "2.0", "id": 7, "result": {"bytes": len(REQUEST)}}
+
+    # A client without the token is dropped before it gets a child
+    with socket.create_connection(("127.0.0.1", port)) as raw:
+        raw.sendall(REQUEST)
+        raw.settimeout(10)
+        assert raw.recv(1024) == b""
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no unix sockets")
+def test_unix_pool_is_owner_only(pool_process, tmp_path):
+    address = "unix:" + str(tmp_path / "run" / "pool.sock")
+    env = pool_process(address)
+    path = tmp_path / "run" / "pool.sock"
+    _wait_for(path.exists)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert _session(env, address)["id"] == 7
+
+
+def test_tcp_address_needs_no_unix_support(monkeypatch):
+    monkeypatch.delattr(socket, "AF_UNIX", raising=False)
+    assert wrapper.parse_address("tcp:localhost:9") == ("tcp", ("localhost", 9))
+    with pytest.raises(OSError):
+        wrapper.connect("127.0.0.1:9", timeout=0.5)
+    with pytest.raises(OSError, match="unix sockets are not supported"):
+        wrapper.connect("unix:/nonexistent.sock")
@@ -0,0 +1,107 @@
+"""render_animation with benchmarks/standin/render_worker.py standing in for command-line Blender."""
+
+import os
+import shlex
+import sys
+import time
+
+import pytest
+
+from bench_server import STANDIN_DIR
+
+WORKER = shlex.join([sys.executable, os.path.join(STANDIN_DIR, "render_worker.py")])
+
+
+@pytest.fixture
+def animation_server(start_server):
+    def start(**env):
+        return start_server(BLENDER_MCP_RENDER_WORKER_CMD=WORKER, **env)
+    return start
+
+
+def _start(server, output, **arguments):
+    text = server.call("render_animation", {"output_path": str(output), "resolution_x": 16,
+                                            "resolution_y": 16, **arguments})[0]
+    assert not text.startswith("Error"), text
+    return text, text.split("'")[1]
+
+
+def _wait(server, job_id, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = server.json("get_render_job", {"job_id": job_id})
+        if job["status"] not in ("queued", "running"):
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.05)
+
+
+def test_failed_shard_is_retried(animation_server, tmp_path):
+    server = animation_server(BLENDER_MCP_STANDIN_CRASH_FRAMES="3,7")
+    _, job_id = _start(server, tmp_path / "frame_####", frame_start=1, frame_end=8,
+                       workers=2, frames_per_shard=2)
+    job = _wait(server, job_id)
+    assert job["status"] == "done", job
+    assert job["frames"] == {"total": 8, "done": 8, "first": 1, "last": 8}
+    assert job["shards"] == 4 and job["retried_shards"] == 2
+    assert sorted(os.listdir(tmp_path)) == [f"frame_{frame:04d}.png" for frame in range(1, 9)]
+
+
+def test_shard_fails_when_retries_run_out(animation_server, tmp_path):
+    server = animation_server(BLENDER_MCP_STANDIN_CRASH_FRAMES="3")
+    _, job_id = _start(server, tmp_path / "frame_", frame_start=1, frame_end=6,
+                       workers=1, frames_per_shard=3, retries=0)
+    job = _wait(server, job_id)
+    assert job["status"] == "failed"
+    # The worker died at frame 3, so the rest of its shard was never rendered either
+    assert job["frames"]["failed"] == [3]
+    assert job["frames"]["done"] == 5
+    assert "stand-in crash at frame 3" in job["error"]
+
+
+def test_animation_jobs_wait_for_a_slot(animation_server, tmp_path):
+    server = animation_server(BLENDER_MCP_ANIMATION_JOBS="1", BLENDER_MCP_RENDER_QUEUE_SIZE="1",
+                              BLENDER_MCP_STANDIN_RENDER_SECONDS="0.2")
+    first_text, first = _start(server, tmp_path / "a_", frame_start=1, frame_end=4, workers=2)
+    second_text, second = _start(server, tmp_path / "b_", frame_start=1, frame_end=2, workers=2)
+    assert first_text.startswith("Started") and second_text.startswith("Queued")
+
+    # One job waiting already fills a queue of one
+    error = server.call("render_animation", {"output_path": str(tmp_path / "c_"),
+                                             "frame_start": 1, "frame_end": 1})[0]
+    assert "queue is full" in error
+
+    assert server.json("get_render_job", {"job_id": second})["status"] == "queued"
+    assert _wait(server, first)["status"] == "done"
+    assert _wait(server, second)["status"] == "done"
+
+
+def test_cancel_queued_animation(animation_server, tmp_path):
+    server = animation_server(BLENDER_MCP_ANIMATION_JOBS="1", BLENDER_MCP_STANDIN_RENDER_SECONDS="0.2")
+    _, first = _start(server, tmp_path / "a_", frame_start=1, frame_end=3, workers=1)
+    _, second = _start(server, tmp_path / "b_", frame_start=1, frame_end=3, workers=1)
+    server.call("cancel_render_job", {"job_id": second})
+    assert _wait(server, first)["status"] == "done"
+    assert _wait(server, second)["status"] == "cancelled"
+    assert not any(name.startswith("b_") for name in os.listdir(tmp_path))
+
+
+def test_unreadable_worker_output_is_a_failed_attempt(animation_server, tmp_path):
+    server = animation_server(BLENDER_MCP_STANDIN_LONG_LINE_FRAMES="2")
+    _, job_id = _start(server, tmp_path / "frame_", frame_start=1, frame_end=6,
+                       workers=2, frames_per_shard=2)
+    job = _wait(server, job_id)
+    assert job["status"] == "done", job
+    assert job["retried_shards"] == 1
+    assert len(os.listdir(tmp_path)) == 6
+
+
+def test_unreadable_worker_output_without_retries_fails_the_job(animation_server, tmp_path):
+    server = animation_server(BLENDER_MCP_STANDIN_LONG_LINE_FRAMES="2")
+    _, job_id = _start(server, tmp_path / "frame_", frame_start=1, frame_end=6,
+                       workers=2, frames_per_shard=2, retries=0)
+    job = _wait(server, job_id)
+    assert job["status"] == "failed"
+    assert job["frames"]["done"] == 5 and job["frames"]["failed"] == [2]
+    # The other worker went on to render the remaining shards
+    assert sorted(os.listdir(tmp_path)) == [f"frame_{frame:04d}.png" for frame in (1, 3, 4, 5, 6)]
@@ -0,0 +1,89 @@
+"""render_scene's render cache writes hits where Blender would have written the render."""
+
+import os
+
+
+def _render(server, filepath) -> bool:
+    """Render and wait; True when the render cache served it."""
+    text = server.call("render_scene", {"filepath": filepath, "resolution_x": 32, "resolution_y": 32,
+                                        "wait": True})[0]
+    assert text.startswith("Rendered scene"), text
+    return text.endswith("(from render cache)")
+
+
+def test_hit_writes_the_same_file_as_a_miss(server, tmp_path):
+    server.call("create_cube", {"location": [0, 0, 0]})
+    server.call("save_blend_file", {"filepath": str(tmp_path / "scene.blend"), "wait": True})
+    output = tmp_path / "still.png"
+
+    assert not _render(server, "//still")
+    assert output.exists()
+    written = output.read_bytes()
+    output.unlink()
+
+    assert _render(server, "//still")
+    assert output.read_bytes() == written
+    assert not (tmp_path / "still").exists()
+    assert server.json("get_render_cache_stats")["hits"] == 1
+
+
+def test_scene_change_misses(server, tmp_path):
+    server.call("create_cube", {"name": "Box"})
+    assert not _render(server, str(tmp_path / "a.png"))
+    server.call("move_object", {"name": "Box", "location": [1, 0, 0]})
+    assert not _render(server, str(tmp_path / "b.png"))
+    assert _render(server, str(tmp_path / "c.png"))
+    assert os.path.exists(tmp_path / "c.png")
+
+
+def _edit(server, code):
+    text = server.call("execute_python", {"code": code})[0]
+    assert not text.startswith("Error"), text
+
+
+def test_modifier_change_misses(server, tmp_path):
+    server.call("create_cube", {"name": "Box"})
+    _edit(server, "bpy.data.objects['Box'].modifiers.new('Subdivision', 'SUBSURF')")
+    assert not _render(server, str(tmp_path / "a.png"))
+    assert _render(server, str(tmp_path / "b.png"))
+
+    _edit(server, "bpy.data.objects['Box'].modifiers['Subdivision'].render_levels = 3")
+    assert not _render(server, str(tmp_path / "c.png"))
+    # Viewport-only settings do not change the render
+    _edit(server, "bpy.data.objects['Box'].modifiers['Subdivision'].show_viewport = False")
+    assert _render(server, str(tmp_path / "d.png"))
+
+
+def test_modifier_target_hidden_from_render_is_hashed(server, tmp_path):
+    server.call("create_cube", {"name": "Box"})
+    server.call("create_cube", {"name": "Cutter"})
+    _edit(server, "cutter = bpy.data.objects['Cutter']\n"
+                  "cutter.hide_render = True\n"
+                  "bpy.data.objects['Box'].modifiers.new('Cut', 'BOOLEAN').object = cutter")
+    assert not _render(server, str(tmp_path / "a.png"))
+    server.call("move_object", {"name": "Cutter", "location": [0.5, 0, 0]})
+    assert not _render(server, str(tmp_path / "b.png"))
+
+
+def test_geometry_beyond_vertex_positions_misses(server, tmp_path):
+    server.call("create_cube", {"name": "Box"})
+    assert not _render(server, str(tmp_path / "a.png"))
+    # Same vertices and face sizes, different corner order
+    _edit(server, "loops = bpy.data.objects['Box'].data.loops\n"
+                  "loops[0].vertex_index, loops[1].vertex_index = loops[1].vertex_index, loops[0].vertex_index")
+    assert not _render(server, str(tmp_path / "b.png"))
+    _edit(server, "bpy.data.objects['Box'].data.uv_layers.new()")
+    assert not _render(server, str(tmp_path / "c.png"))
+    _edit(server, "bpy.data.objects['Box'].data.uv_layers[0].data[0].uv = (0.5, 0.5)")
+    assert not _render(server, str(tmp_path / "d.png"))
+    _edit(server, "bpy.data.objects['Box'].data.polygons[0].use_smooth = True")
+    assert not _render(server, str(tmp_path / "e.png"))
+
+
+def test_colour_management_change_misses(server, tmp_path):
+    server.call("create_cube", {})
+    assert not _render(server, str(tmp_path / "a.png"))
+    _edit(server, "bpy.context.scene.view_settings.exposure = 1.0")
+    assert not _render(server, str(tmp_path / "b.png"))
+    _edit(server, "bpy.context.scene.display_settings.display_device = 'Display P3'")
+    assert not _render(server, str(tmp_path / "c.png"))
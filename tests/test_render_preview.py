@@ -0,0 +1,28 @@
+"""render_scene previews: the inline image, and the copy saved to filepath."""
+
+import base64
+
+
+def _preview(server, filepath) -> list[dict]:
+    """Content items of a preview render."""
+    waiter = server.send("render_scene", {"filepath": filepath, "resolution_x": 64, "resolution_y": 64,
+                                          "preview": True})
+    assert waiter[0].wait(30), "no reply"
+    return waiter[1]["result"]["content"]
+
+
+def test_relative_path_is_saved_next_to_the_blend(server, tmp_path):
+    server.call("create_cube", {})
+    server.call("save_blend_file", {"filepath": str(tmp_path / "scene.blend")})
+    text, image = _preview(server, "//previews/still")
+    output = tmp_path / "previews" / "still.jpg"
+    assert text["text"].endswith(f", saved to {output}")
+    assert output.read_bytes() == base64.b64decode(image["data"])
+
+
+def test_write_error_is_a_warning(server, tmp_path):
+    (tmp_path / "taken").write_text("")
+    content = _preview(server, str(tmp_path / "taken" / "still.jpg"))
+    assert [item["type"] for item in content] == ["text", "image", "text"]
+    assert content[0]["text"].startswith("Preview at 16x16")
+    assert content[2]["text"].startswith(f"Warning: Could not save the preview to {tmp_path / 'taken' / 'still.jpg'}")
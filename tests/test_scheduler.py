@@ -0,0 +1,114 @@
+"""BpyExecutor priority classes and the ReadSnapshot cache."""
+
+import contextvars
+import threading
+
+import pytest
+
+
+class Queue:
+    """A fresh BpyExecutor whose calls record, in order, the label they were queued with."""
+
+    def __init__(self, module):
+        self.module = module
+        self.executor = module.BpyExecutor()
+        self.order = []
+        self._futures = []
+
+    def submit(self, label, priority, client="stdio"):
+        context = contextvars.copy_context()
+        context.run(self.module.current_client.set, client)
+        self._futures.append(context.run(self.executor.submit, self.order.append, label, priority=priority))
+
+    def drain(self) -> list:
+        """Serve everything queued so far on a stand-in bpy thread."""
+        stop = threading.Event()
+        thread = threading.Thread(target=self.executor.serve_forever, args=(stop, 0.01))
+        thread.start()
+        try:
+            for future in self._futures:
+                future.result(timeout=5)
+        finally:
+            stop.set()
+            thread.join()
+        return self.order
+
+
+@pytest.fixture
+def queue(mcp_server):
+    return Queue(mcp_server)
+
+
+def test_more_urgent_class_first(queue):
+    queue.submit("heavy", "heavy", "a")
+    queue.submit("write", "write", "b")
+    queue.submit("read", "read", "c")
+    assert queue.drain() == ["read", "write", "heavy"]
+    assert queue.executor.generation == 2
+    assert queue.executor.stats()["served_by_priority"] == {"read": 1, "write": 1, "heavy": 1}
+
+
+def test_starved_class_gets_a_turn(queue):
+    queue.submit("heavy", "heavy", "a")
+    for i in range(20):
+        queue.submit(f"read {i}", "read", "b")
+    assert queue.drain().index("heavy") == queue.executor.STARVATION_LIMIT
+
+
+def test_clients_take_turns_within_a_class(queue):
+    for i in range(3):
+        queue.submit(f"a{i}", "read", "a")
+    for i in range(2):
+        queue.submit(f"b{i}", "read", "b")
+    assert queue.drain() == ["a0", "b0", "a1", "b1", "a2"]
+
+
+def test_writes_of_a_client_keep_their_order(queue):
+    queue.submit("save", "heavy", "a")
+    queue.submit("move", "write", "a")
+    queue.submit("other", "write", "b")
+    # a's write may not overtake a's heavy call; b's write is unaffected
+    assert queue.drain() == ["other", "save", "move"]
+
+
+def test_read_snapshot_invalidated_by_writes(mcp_server, queue):
+    snapshot = mcp_server.ReadSnapshot(queue.executor)
+    calls = []
+
+    def handler(arguments):
+        calls.append(arguments)
+        return [mcp_server.TextContent(type="text", text=f"result {len(calls)}")]
+
+    key = snapshot.key("list_objects", {})
+    assert snapshot.lookup(key) is None
+    snapshot.compute(key, handler, {})
+    assert snapshot.lookup(key)[0].text == "result 1"
+
+    # A read leaves the generation alone, a write makes the entry stale
+    queue.submit("read", "read")
+    queue.drain()
+    assert snapshot.lookup(key)[0].text == "result 1"
+    queue.submit("write", "write")
+    queue.drain()
+    assert snapshot.lookup(key) is None
+
+    # Before heavy work the stale entry is recomputed and served again
+    snapshot.refresh()
+    assert snapshot.lookup(key)[0].text == "result 2"
+    assert snapshot.stats()["refreshes"] == 1
+
+
+def test_read_snapshot_skips_errors(mcp_server, queue):
+    snapshot = mcp_server.ReadSnapshot(queue.executor)
+    key = snapshot.key("list_objects", {"collection": "Missing"})
+    snapshot.compute(key, lambda arguments: [mcp_server.TextContent(type="text", text="Error: missing")], {})
+    assert snapshot.lookup(key) is None
+
+
+def test_reads_see_completed_writes(server):
+    server.call("create_objects_batch", {"objects": [{"type": "cube", "name": "Snap"}]})
+    assert server.json("list_objects", {"fields": ["location"]})["objects"][0]["location"] == [0.0, 0.0, 0.0]
+    assert server.json("list_objects", {"fields": ["location"]})["objects"][0]["location"] == [0.0, 0.0, 0.0]
+    server.call("move_object", {"name": "Snap", "location": [1, 2, 3]})
+    assert server.json("list_objects", {"fields": ["location"]})["objects"][0]["location"] == [1.0, 2.0, 3.0]
+    assert server.json("get_server_stats")["read_snapshot"]["hits"] >= 1
@@ -0,0 +1,126 @@
+"""--transport socket: several clients sharing one server, and who may connect."""
+
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from bench_server import SERVER, STANDIN_DIR
+import blender_mcp_wrapper as wrapper
+
+INITIALIZE = {"jsonrpc": "2.0", "id": 0, "method": "initialize",
+              "params": {"protocolVersion": "2024-11-05", "capabilities": {},
+                         "clientInfo": {"name": "tests", "version": "1"}}}
+
+
+@pytest.fixture
+def socket_server(tmp_path):
+    """Factory: start the server listening on address, with HOME (and so its token files) in tmp_path."""
+    processes = []
+
+    def start(address, **env):
+        environ = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path), **env)
+        environ["PYTHONPATH"] = os.pathsep.join(filter(None, [STANDIN_DIR, os.environ.get("PYTHONPATH")]))
+        processes.append(subprocess.Popen([sys.executable, SERVER, "--transport", "socket", "--listen", address],
+                                          env=environ, stdin=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+
+    yield start
+    for process in processes:
+        process.terminate()
+        process.wait()
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _connect(address, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return wrapper.connect(address)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+class Session:
+    """An initialized MCP session over a socket."""
+
+    def __init__(self, address):
+        self.conn = _connect(address)
+        self.reader = self.conn.makefile("rb")
+        self.next_id = 0
+        assert self.request("initialize", INITIALIZE["params"])["serverInfo"]["name"] == "blender-mcp"
+        self.conn.sendall(b'{"jsonrpc":"2.0","method":"notifications/initialized"}\n')
+
+    def request(self, method, params) -> dict:
+        self.next_id += 1
+        message = {"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params}
+        self.conn.sendall(json.dumps(message).encode() + b"\n")
+        while True:
+            line = self.reader.readline()
+            assert line, "connection closed"
+            reply = json.loads(line)
+            if reply.get("id") == self.next_id:
+                return reply["result"]
+
+    def call(self, name, arguments) -> str:
+        return self.request("tools/call", {"name": name, "arguments": arguments})["content"][0]["text"]
+
+    def close(self):
+        self.reader.close()
+        self.conn.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no unix sockets in asyncio on Windows")
+def test_unix_socket_is_owner_only_and_shared(socket_server, tmp_path):
+    path = tmp_path / "run" / "server.sock"
+    socket_server(f"unix:{path}")
+    first = Session(f"unix:{path}")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    second = Session(f"unix:{path}")
+    first.call("create_cube", {"name": "Shared"})
+    assert "Shared" in second.call("list_objects", {})
+    first.close()
+    second.close()
+
+
+def test_tcp_requires_the_token(socket_server, monkeypatch):
+    port = _free_port()
+    address = f"127.0.0.1:{port}"
+    socket_server(address, BLENDER_MCP_TOKEN="s3cret")
+
+    monkeypatch.setenv("BLENDER_MCP_TOKEN", "s3cret")
+    session = Session(address)
+    assert session.call("list_objects", {}).startswith("Objects in scene")
+    session.close()
+
+    monkeypatch.setenv("BLENDER_MCP_TOKEN", "wrong")
+    with wrapper.connect(address) as rejected:
+        rejected.sendall(json.dumps(INITIALIZE).encode() + b"\n")
+        rejected.settimeout(10)
+        assert rejected.recv(1024) == b""
+
+    with socket.create_connection(("127.0.0.1", port)) as unauthenticated:
+        unauthenticated.sendall(json.dumps(INITIALIZE).encode() + b"\n")
+        unauthenticated.settimeout(10)
+        assert unauthenticated.recv(1024) == b""
+
+
+def test_tcp_token_file(socket_server, tmp_path):
+    port = _free_port()
+    socket_server(f"127.0.0.1:{port}")
+    _connect(f"127.0.0.1:{port}").close()
+    token_file = tmp_path / ".blender_mcp" / f"{port}.token"
+    assert len(token_file.read_text()) >= 32
+    if sys.platform != "win32":
+        assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
@@ -0,0 +1,162 @@
+"""SpatialIndex queries checked against a brute-force scan over random boxes, with and without NumPy."""
+
+import math
+import random
+
+import pytest
+
+
+@pytest.fixture(params=["python", "numpy"])
+def make_index(request, mcp_server, monkeypatch):
+    """Factory: a SpatialIndex loaded with {name: (min, max)}."""
+    monkeypatch.setattr(mcp_server, "np", pytest.importorskip("numpy") if request.param == "numpy" else None)
+
+    def make(boxes):
+        index = mcp_server.SpatialIndex()
+        index._load(list(boxes), list(boxes.values()))
+        index.dirty = False
+        return index
+    return make
+
+
+def _random_box(rng, spread):
+    center = [rng.uniform(-spread, spread) for _ in range(3)]
+    half = [rng.choice((0.05, 0.5, 1.0, 3.0)) * rng.uniform(0.2, 1.0) for _ in range(3)]
+    return [c - h for c, h in zip(center, half)], [c + h for c, h in zip(center, half)]
+
+
+def _random_boxes(seed, count=300, spread=50.0):
+    rng = random.Random(seed)
+    boxes = {f"Obj.{i:03d}": _random_box(rng, spread) for i in range(count)}
+    # Big enough to skip the grid and go in the always-checked list
+    boxes["Ground"] = ([-100.0, -100.0, -1.0], [100.0, 100.0, 0.0])
+    # Straddles the cells around the origin
+    boxes["Origin"] = ([-0.01, -0.01, -0.01], [0.01, 0.01, 0.01])
+    return rng, boxes
+
+
+def _distance(box, point):
+    lo, hi = box
+    return math.sqrt(sum(max(lo[k] - point[k], point[k] - hi[k], 0.0) ** 2 for k in range(3)))
+
+
+def _entry(box, origin, direction):
+    """Ray parameter where the ray enters box (0 when it starts inside), or None."""
+    near, far = 0.0, math.inf
+    for k in range(3):
+        lo, hi = box[0][k], box[1][k]
+        if direction[k] == 0.0:
+            if not lo <= origin[k] <= hi:
+                return None
+            continue
+        t1, t2 = sorted(((lo - origin[k]) / direction[k], (hi - origin[k]) / direction[k]))
+        near, far = max(near, t1), min(far, t2)
+        if near > far:
+            return None
+    return near
+
+
+def _normalized(vector):
+    length = math.sqrt(sum(v * v for v in vector))
+    return [v / length for v in vector]
+
+
+def _query_points(rng, spread):
+    inside = [[rng.uniform(-spread, spread) for _ in range(3)] for _ in range(10)]
+    outside = [[rng.choice((-1, 1)) * rng.uniform(3, 6) * spread for _ in range(3)] for _ in range(5)]
+    return inside + outside + [[0.0, 0.0, 0.0]]
+
+
+def _rays(rng, spread):
+    """Rays from inside the grid, from far outside it towards it, and along the axes."""
+    rays = []
+    for _ in range(10):
+        origin = [rng.uniform(-spread, spread) for _ in range(3)]
+        rays.append((origin, _normalized([rng.gauss(0, 1) for _ in range(3)])))
+    for _ in range(10):
+        origin = [rng.choice((-1, 1)) * rng.uniform(4, 8) * spread for _ in range(3)]
+        target = [rng.uniform(-spread, spread) for _ in range(3)]
+        rays.append((origin, _normalized([t - o for t, o in zip(target, origin)])))
+    for axis in range(3):
+        origin = [rng.uniform(-spread / 2, spread / 2) for _ in range(3)]
+        origin[axis] = -5 * spread
+        direction = [0.0, 0.0, 0.0]
+        direction[axis] = 1.0
+        rays.append((origin, direction))
+    # Parallel to the grid, outside it in a zero-direction axis
+    rays.append(([-5 * spread, 0.0, 5 * spread], [1.0, 0.0, 0.0]))
+    return rays
+
+
+def _check_queries(index, boxes, rng, spread):
+    for point in _query_points(rng, spread):
+        distances = {name: _distance(box, point) for name, box in boxes.items()}
+        expected = sorted(distances.values())
+        for k in (1, 7, 40, len(boxes)):
+            hits = index.nearest(point, k)
+            assert [d for _, d in hits] == pytest.approx(expected[:k])
+            assert all(d == pytest.approx(distances[name]) for name, d in hits)
+
+        for radius in (0.5, 5.0, 30.0, 500.0):
+            hits = index.within_radius(point, radius)
+            assert {name for name, _ in hits} == {name for name, d in distances.items() if d <= radius}
+            assert [d for _, d in hits] == sorted(d for _, d in hits)
+
+        for half in (0.5, 8.0, 400.0):
+            box_min, box_max = [c - half for c in point], [c + half for c in point]
+            expected_names = sorted(name for name, (lo, hi) in boxes.items()
+                                    if all(lo[k] <= box_max[k] and hi[k] >= box_min[k] for k in range(3)))
+            assert index.overlapping(box_min, box_max) == expected_names
+
+    for origin, direction in _rays(rng, spread):
+        for max_distance in (math.inf, 3 * spread):
+            entries = {name: _entry(box, origin, direction) for name, box in boxes.items()}
+            expected = sorted((t, name) for name, t in entries.items() if t is not None and t <= max_distance)
+            hits = list(index.ray(origin, direction, max_distance))
+            assert {name for name, _ in hits} == {name for _, name in expected}
+            assert [t for _, t in hits] == pytest.approx([t for t, _ in expected])
+
+
+def test_queries_match_brute_force(make_index):
+    rng, boxes = _random_boxes(1)
+    index = make_index(boxes)
+    assert index.stats()["large_objects"] >= 1
+    _check_queries(index, boxes, rng, 50.0)
+
+
+def test_queries_after_moves_and_removals(make_index):
+    rng, boxes = _random_boxes(2)
+    index = make_index(boxes)
+    names = sorted(boxes)
+    # Moves, some far outside the cells used so far
+    for name in rng.sample(names, 40):
+        boxes[name] = _random_box(rng, rng.choice((50.0, 400.0)))
+        index._store(name, *boxes[name])
+    for name in rng.sample(sorted(boxes), 30):
+        del boxes[name]
+        index.remove(name)
+    for i in range(10):
+        boxes[f"New.{i}"] = _random_box(rng, 50.0)
+        index._store(f"New.{i}", *boxes[f"New.{i}"])
+    assert len(index) == len(boxes)
+    _check_queries(index, boxes, rng, 50.0)
+
+
+def test_sparse_scene(make_index):
+    """A few objects far apart: nearest falls back to scanning every box."""
+    rng = random.Random(3)
+    boxes = {f"Far.{i}": _random_box(rng, 1e4) for i in range(12)}
+    _check_queries(make_index(boxes), boxes, rng, 1e4)
+
+
+def test_tools_follow_moves(server):
+    server.call("create_objects_batch", {"objects": [
+        {"type": "cube", "name": name, "location": [x, 0, 0]} for name, x in (("A", 0), ("B", 10), ("C", 20))]})
+    nearest = server.json("find_nearest_objects", {"point": [9, 0, 0], "k": 1})["objects"]
+    assert nearest == [{"name": "B", "distance": 0.0}]
+    server.call("move_object", {"name": "C", "location": [9, 0, 0]})
+    assert server.json("find_objects_in_radius", {"point": [9, 0, 0], "radius": 0.5})["count"] == 2
+    hit = server.json("raycast_objects", {"origin": [-10, 0, 0], "direction": [1, 0, 0]})["hit"]
+    assert hit["name"] == "A" and hit["distance"] == pytest.approx(9.0)
+    server.call("delete_object", {"name": "A"})
+    assert server.json("find_objects_in_box", {"min": [-5, -5, -5], "max": [30, 5, 5]})["objects"] == ["B", "C"]
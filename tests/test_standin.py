@@ -0,0 +1,33 @@
+"""The bpy stand-in behaves like Blender where the server relies on it."""
+
+import array
+
+import bpy
+import pytest
+
+
+def test_foreach_get_flattens_matrices():
+    obj = bpy.data.objects.new("Flat", None)
+    obj.location = (1.0, 2.0, 3.0)
+    bpy.context.scene.collection.objects.link(obj)
+    objects = bpy.context.scene.objects
+    buffer = array.array("f", bytes(4 * 16 * len(objects)))
+    objects.foreach_get("matrix_world", buffer)
+    row = list(objects).index(obj) * 16
+    assert list(buffer[row + 3:row + 12:4]) == [1.0, 2.0, 3.0]
+
+
+def test_foreach_get_size_mismatch():
+    bpy.context.scene.collection.objects.link(bpy.data.objects.new("Sized", None))
+    objects = bpy.context.scene.objects
+    with pytest.raises(RuntimeError):
+        objects.foreach_get("matrix_world", array.array("f", bytes(4 * 3)))
+
+
+def test_list_objects_with_arguments(server):
+    server.call("create_objects_batch", {"objects": [
+        {"type": "cube", "name": f"Cube.{i}", "location": [i, 0, 0]} for i in range(3)]})
+    listing = server.json("list_objects", {"fields": ["location", "dimensions"], "limit": 2})
+    assert listing["total"] == 3
+    assert [obj["name"] for obj in listing["objects"]] == ["Cube.0", "Cube.1"]
+    assert listing["objects"][1]["location"] == [1.0, 0.0, 0.0]